@@ -0,0 +1,30 @@
+import asyncio
+from tradebot.exchange.bybit import BybitPublicConnector, BybitAccountType, BybitExchangeManager
+from tradebot.shm import DecodePool, SharedMarketTable, MarketDataPublisher
+
+# Owns the Bybit sockets and publishes the latest BookL1 / Trade of every linear symbol
+# into shared memory, strategies read it with `SharedMarketData(["bybit_linear"])`.
+SYMBOLS = ["BTC/USDT:USDT", "ETH/USDT:USDT"]
+
+
+async def main():
+    exchange = BybitExchangeManager({"exchange_id": "bybit"})
+    pool = DecodePool(workers=2)
+    public_conn = BybitPublicConnector(BybitAccountType.LINEAR, exchange, decode_pool=pool)
+    table = SharedMarketTable.create("bybit", exchange.linear, name="bybit_linear")
+    publisher = MarketDataPublisher([table])
+    try:
+        await pool.start()
+        for symbol in SYMBOLS:
+            await public_conn.subscribe_bookl1(symbol)
+            await public_conn.subscribe_trade(symbol)
+        while True:
+            await asyncio.sleep(1)
+    except asyncio.CancelledError:
+        await public_conn.disconnect()
+        await pool.close()
+        publisher.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
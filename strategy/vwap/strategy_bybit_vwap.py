@@ -4,17 +4,18 @@ import time
 import os
 import ccxt
 import collections
-import zmq.asyncio
-import orjson
-from typing import Dict, Tuple
+import numpy as np
+from typing import Dict
 from collections import defaultdict
 from tradebot.constants import CONFIG
 from tradebot.types import Order, BookL1
 from tradebot.constants import OrderSide, OrderType, OrderStatus
 from tradebot.core import Strategy
+from tradebot.execution import Rebalancer
 from tradebot.exchange.bybit.types import BybitMarket
 from decimal import Decimal
-from tradebot.entity import EventSystem
+from tradebot.entity import EventSystem, PositionLedger
+from tradebot.signal import SignalReceiver, InstrumentMap, bybit_linear_symbol
 from tradebot.exchange.bybit import (
     BybitPublicConnector,
     BybitPrivateConnector,
@@ -30,46 +31,32 @@ BYBIT_API_SECRET = CONFIG["bybit"]["SECRET"]
 
 class BybitSignal:
     def __init__(self, market: Dict[str, BybitMarket] = None):
-        context = zmq.asyncio.Context()
-        self.socket = context.socket(zmq.SUB)
-        self.socket.connect("ipc:///tmp/zmq_data")
-        self.socket.setsockopt(zmq.SUBSCRIBE, b"")
-        self.market = market
-        self.mutiplier = Decimal(str(0.6))
-        self.valid_symbols = market.keys()
         self.strategy = None
         self.first_subscribed = True
+        self.receiver = SignalReceiver(
+            "ipc:///tmp/zmq_data",
+            InstrumentMap(market, bybit_linear_symbol, Decimal(str(0.6))),
+            handler=self.on_positions,
+            subscribe=self.subscribe,
+        )
 
     def set_strategy(self, strategy: Strategy):
         self.strategy = strategy
 
-    async def receive(self):
-        while True:
-            pos = {}
-            response = await self.socket.recv()
-            data = orjson.loads(response)
-
-            for d in data:
-                symbol: str = d["instrumentID"]
-                symbol = symbol.replace("USDT.BBP", "/USDT:USDT")
-
-                if symbol in self.valid_symbols:
-                    if self.first_subscribed:
-                        await self.strategy.subscribe_bookl1(
-                            BybitAccountType.LINEAR, symbol
-                        )
-                    pos[symbol] = (
-                        Decimal(str(d["position"]))
-                        * Decimal(str(self.market[symbol].precision.amount))
-                        * self.mutiplier
-                    )
-            if self.first_subscribed:
-                self.first_subscribed = False
-                await self.strategy.wait_for_market_data()
-                await self.strategy.run()
+    async def subscribe(self, symbol: str):
+        await self.strategy.subscribe_bookl1(BybitAccountType.LINEAR, symbol)
+
+    async def on_positions(self, pos: Dict[str, Decimal]):
+        if self.first_subscribed:
+            self.first_subscribed = False
+            await self.strategy.wait_for_market_data()
+            await self.strategy.run()
 
-            if self.strategy.ready:
-                await EventSystem.aemit("signal", pos)
+        if self.strategy.ready:
+            await EventSystem.aemit("signal", pos)
+
+    async def receive(self):
+        await self.receiver.run()
 
 
 class RollingDiffSum:
@@ -100,6 +87,7 @@ rolling_diff_sum = RollingDiffSum(20)
 class VwapStrategy(Strategy):
     def __init__(self, api: ccxt.bybit = None):
         super().__init__(tick_size=1)
+        self.ledger = PositionLedger(os.path.join(DIR_PATH, "positions"))
         self.current_positions = self._load_positions()
         self.trending_signal = defaultdict(int)
         self._in_ordering = defaultdict(bool)  # default to False
@@ -107,109 +95,69 @@ class VwapStrategy(Strategy):
         self.active_tasks = set()
         self.is_running = True
         self.api = api
+        self.rebalancer: Rebalancer | None = None
         
-        EventSystem.on("signal", self.on_signal)
+        # a slow on_signal must not hold up the signal feed, signals are full position
+        # snapshots so a newer one replaces any still waiting
+        EventSystem.on_async("signal", self.on_signal, ordering="latest")
     
-    def fetch_positions(self):
-        pos = self.api.fetch_positions()
-        return {
-            p['symbol']: (-1 if p['side'] == "short" else 1) * p["contracts"] * p["contractSize"]
-            for p in pos
-        }
+    def fetch_positions(self) -> Dict[str, Decimal]:
+        # positions of the connector's last reconciliation, reading them never blocks
+        return self._private_connectors[BybitAccountType.ALL].exchange_positions
         
     def _load_positions(self):
-        try:
-            with open(
-                os.path.join(DIR_PATH, "positions.pkl"), "rb"
-            ) as f:  # Changed extension and mode
-                return pickle.load(f)
-        except FileNotFoundError:
-            return defaultdict(Decimal)
-
-    def _save_positions(self, positions):
-        with open(
-            os.path.join(DIR_PATH, "positions.pkl"), "wb"
-        ) as f:  # Changed extension and mode
-            pickle.dump(positions, f)
-
-    def _get_order_params(
-        self, symbol: str, pos: Decimal
-    ) -> Tuple[OrderSide, Decimal, bool]:
-        """
-        current_positions: Dict[str, float]
-        positions: Dict[str, float]
-
-
-        1. positions - current_positions > 0
-            - positions > 0, current_positions = 0 -> side = BUY, reduce_only = False (0 -> 10)
-            - positions > 0, current_postions > 0 -> side = BUY, reduce_only = False (5 -> 20)
-
-            - positions > 0, current_positions < 0 -> side = BUY, reduce_only = True -> side = BUY, reduce_only=False (-5 -> 0) (0 -> 10)
-
-            - positions = 0, current_positions < 0 -> side = BUY, reduce_only = True (-10 -> 0)
-            - positions < 0, current_positions < 0 -> side = BUY, reduce_only = True (-10 -> -5)
-
-
-        2. positions - current_positions < 0
-            - positions > 0, current_positions > 0 -> side = SELL, reduce_only = True
-            - positions = 0, current_positions > 0 -> side = SELL, reduce_only = True
-
-            - positions < 0, current_positions = 0 -> side = SELL, reduce_only = False
-            - positions < 0, current_positions < 0 -> side = SELL, reduce_only = False
-            - positions < 0, current_positions > 0 -> side = SELL, reduce_only = True -> side = SELL, reduce_only=False
-        """
-        current_pos = self.current_positions[symbol]
-        if pos - current_pos > 0:
-            side = OrderSide.BUY
-            if pos > 0 and current_pos >= 0:
-                reduce_only = False
-            elif pos <= 0 and current_pos < 0:
-                reduce_only = True
-            else:
-                pos = Decimal(str(0))
-                reduce_only = True
-            amount = pos - current_pos
-            return side, amount, reduce_only
-        elif pos - current_pos < 0:
-            side = OrderSide.SELL
-            if pos < 0 and current_pos <= 0:
-                reduce_only = False
-            elif pos >= 0 and current_pos > 0:
-                reduce_only = True
-            else:
-                pos = Decimal(str(0))
-                reduce_only = False
-            amount = current_pos - pos
-            return side, amount, reduce_only
+        positions = self.ledger.load()
+        legacy = os.path.join(DIR_PATH, "positions.pkl")
+        if not positions and os.path.exists(legacy):
+            # one-off migration of the pickled positions
+            with open(legacy, "rb") as f:
+                for symbol, amount in pickle.load(f).items():
+                    self.ledger.set(symbol, amount)
+        return positions
+
+    def _get_rebalancer(self) -> Rebalancer:
+        if self.rebalancer is None:
+            market = self.market(BybitAccountType.ALL)
+            self.rebalancer = Rebalancer(
+                symbols=list(market),
+                amount_step=[m.precision.amount for m in market.values()],
+                min_amount=[m.limits.amount.min or 0 for m in market.values()],
+                # same threshold as before: amount >= 6 / (ask + bid) / 2
+                min_notional=1.5,
+            )
+        return self.rebalancer
 
-    async def on_signal(self, positions: Dict[str, Dict]):
+    async def on_signal(self, positions: Dict[str, Decimal]):
         if not self.is_running:
             return
-        
-        for symbol, pos in positions.items():
-            res = self._get_order_params(symbol, pos)
-            if res:
-                side, amount, reduce_only = res
-                if not self._in_ordering[symbol] and amount >= max(
-                    6
-                    / (
-                        self.get_bookl1("bybit", symbol).ask
-                        + self.get_bookl1("bybit", symbol).bid
-                    )
-                    / 2,
-                    self.market(BybitAccountType.ALL)[symbol].limits.amount.min,
-                ):
-                    task = asyncio.create_task(
-                        self.vwap_order(symbol, side, amount, reduce_only)
-                    )
-                    self.active_tasks.add(task)
-                    task.add_done_callback(self.active_tasks.discard)
-    
+
+        rebalancer = self._get_rebalancer()
+        mid = {}
+        for symbol in positions:
+            book = self.get_bookl1("bybit", symbol)
+            mid[symbol] = (book.ask + book.bid) / 2
+        plan = rebalancer.plan(
+            target=rebalancer.align(positions),
+            current=rebalancer.align(self.current_positions),
+            price=rebalancer.align(mid, default=np.nan),
+            # symbols without a signal keep their position
+            active=rebalancer.align(
+                {symbol: not self._in_ordering[symbol] for symbol in positions}
+            ).astype(bool),
+        )
+        for symbol, side, amount, reduce_only in plan.orders():
+            task = asyncio.create_task(
+                self.vwap_order(symbol, side, amount, reduce_only)
+            )
+            self.active_tasks.add(task)
+            task.add_done_callback(self.active_tasks.discard)
+
     async def shutdown(self):
         self.is_running = False
         self.log.info("Stopping strategy, waiting for active orders to complete...")
         if self.active_tasks:
             await asyncio.gather(*self.active_tasks)
+        await self.ledger.close()
         self.log.info("All active orders completed, shutting down...")
     
 
@@ -232,12 +180,11 @@ class VwapStrategy(Strategy):
         )
         await asyncio.sleep(20)
         if side == OrderSide.BUY:
-            self.current_positions[symbol] += amount
+            self.ledger.add(symbol, amount)
             self.log.debug(f"Mocked symbol: {symbol} added {amount}")
         else:
-            self.current_positions[symbol] -= amount
+            self.ledger.add(symbol, -amount)
             self.log.debug(f"Mocked symbol: {symbol} removed {amount}")
-        self._save_positions(self.current_positions)
         self._in_ordering[symbol] = False
 
     async def vwap_order(
@@ -253,6 +200,7 @@ class VwapStrategy(Strategy):
         pos = Decimal(str(0))
         on_bid = False
         order_id = None
+        handle = None
         start = int(time.time() * 1000)
         cost = 0
         first_iter = True
@@ -260,6 +208,9 @@ class VwapStrategy(Strategy):
         while True:
             if first_iter:
                 first_iter = False
+            elif handle and not handle.closed:
+                # wakes up as soon as the order closes instead of after a full interval
+                await handle.wait(interval)
             else:
                 await asyncio.sleep(interval)
             if order_id:
@@ -277,11 +228,29 @@ class VwapStrategy(Strategy):
                             cost += order.cum_cost if order.cum_cost else 0
                             self.log.debug(f"Symbol: {symbol} Filled {pos} of {amount}")
                             order_id = None
+                            handle = None
                     else:
                         book = self.get_bookl1("bybit", symbol)
                         if (on_bid and order.price != book.bid) or (
                             not on_bid and order.price != book.ask
                         ):
+                            # reprice in place, the order keeps its id and filled amount
+                            new_price = self.price_to_precision(
+                                account_type=BybitAccountType.ALL,
+                                symbol=symbol,
+                                price=book.bid if on_bid else book.ask,
+                            )
+                            order_amend = await self.amend_order(
+                                account_type=BybitAccountType.ALL,
+                                symbol=symbol,
+                                order_id=order_id,
+                                price=new_price,
+                            )
+                            if order_amend.success:
+                                continue
+                            self.log.debug(
+                                f"Symbol: {symbol} Failed to amend order {order_id}, canceling"
+                            )
                             order_cancel = await self.cancel_order(
                                 account_type=BybitAccountType.ALL,
                                 symbol=symbol,
@@ -352,6 +321,7 @@ class VwapStrategy(Strategy):
                         reduceOnly=reduce_only,
                     )
                     order_id = order.id
+                    handle = order
                     if order_id:
                         if not reduce_only:
                             self.log.debug(f"Symbol: {symbol} Created postion: {order.id}")
@@ -378,29 +348,29 @@ class VwapStrategy(Strategy):
             self.log.debug(
                 f"Side BUY Symbol: {symbol} pos: {self.current_positions[symbol]} + {pos} = {real_pos}"
             )
-            self.current_positions[symbol] += pos
+            self.ledger.add(symbol, pos)
         else:
             self.log.debug(
                 f"Side SELL Symbol: {symbol} pos: {self.current_positions[symbol]} - {pos} = {real_pos}"
             )
-            self.current_positions[symbol] -= pos
+            self.ledger.add(symbol, -pos)
         end = int(time.time() * 1000)
         average = cost / float(pos) if pos > 0 else 0
         side_string = "BUY" if side == OrderSide.BUY else "SELL"
         self.log.debug(
             f"Symbol: {symbol} Side: {side_string} VWAP completed start: {start} end: {end} average: {average}"
         )
-        self._save_positions(self.current_positions)
         self._in_ordering[symbol] = False
 
     async def run(self):
         for private_connector in self._private_connectors.values():
             await private_connector.connect()
+        self._task_manager.create_task(self.ledger.run())
 
 
-def set_leverage(api: ccxt.bybit, symbol: str, leverage: int):
+async def set_leverage(exchange: BybitExchangeManager, symbol: str, leverage: int):
     try:
-        api.set_leverage(leverage, symbol)
+        await exchange.set_leverage(leverage, symbol)
         print(f"Set leverage to {leverage} for {symbol}")
     except Exception as e:
         print(e, symbol, leverage)
@@ -413,7 +383,7 @@ async def main():
             # "sandbox": True,
         }
 
-        exchange = BybitExchangeManager(config)
+        exchange = await BybitExchangeManager.create(config)
 
         conn_linear = BybitPublicConnector(BybitAccountType.LINEAR, exchange)
 
@@ -423,6 +393,7 @@ async def main():
             strategy_id="strategy_vwap",
             user_id="vip_user",
             rate_limit=20,
+            reconcile_interval=10,
         )
         
         signal = BybitSignal(exchange.market)
@@ -439,6 +410,7 @@ async def main():
         await vwap.shutdown()
         await conn_linear.disconnect()
         await private_conn.disconnect()
+        exchange.close()
 
 
 if __name__ == "__main__":
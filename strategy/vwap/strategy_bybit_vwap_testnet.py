@@ -9,12 +9,12 @@ import ccxt
 from typing import Dict, Tuple
 from collections import defaultdict
 from tradebot.constants import CONFIG
-from tradebot.types import Order, BookL1
+from tradebot.types import Order, BookL1, PositionDrift
 from tradebot.constants import OrderSide, OrderType, OrderStatus
 from tradebot.core import Strategy
 from tradebot.exchange.bybit.types import BybitMarket
 from decimal import Decimal
-from tradebot.entity import EventSystem
+from tradebot.entity import EventSystem, PositionLedger
 from tradebot.exchange.bybit import (
     BybitPublicConnector,
     BybitPrivateConnector,
@@ -100,6 +100,7 @@ rolling_diff_sum = RollingDiffSum(20)
 class VwapStrategy(Strategy):
     def __init__(self, api: ccxt.bybit = None):
         super().__init__(tick_size=1)
+        self.ledger = PositionLedger(os.path.join(DIR_PATH, "positions"))
         self.current_positions = self._load_positions()
         self.trending_signal = defaultdict(int)
         self._in_ordering = defaultdict(bool)  # default to False
@@ -110,27 +111,24 @@ class VwapStrategy(Strategy):
         
         EventSystem.on("signal", self.on_signal)
     
-    def fetch_positions(self):
-        pos = self.api.fetch_positions()
-        return {
-            p['symbol']: Decimal(str((-1 if p['side'] == "short" else 1) * p["contracts"] * p["contractSize"]))
-            for p in pos
-        }
+    def fetch_positions(self) -> Dict[str, Decimal]:
+        # positions of the connector's last reconciliation, reading them never blocks
+        return self._private_connectors[BybitAccountType.ALL_TESTNET].exchange_positions
         00
+    def on_position_drift(self, drift: PositionDrift):
+        self.log.error(
+            f"Symbol: {drift.symbol} pos mismatch {drift.cached} != {drift.actual}"
+        )
+
     def _load_positions(self):
-        try:
-            with open(
-                os.path.join(DIR_PATH, "positions.pkl"), "rb"
-            ) as f:  # Changed extension and mode
-                return pickle.load(f)
-        except FileNotFoundError:
-            return defaultdict(Decimal)
-
-    def _save_positions(self, positions):
-        with open(
-            os.path.join(DIR_PATH, "positions.pkl"), "wb"
-        ) as f:  # Changed extension and mode
-            pickle.dump(positions, f)
+        positions = self.ledger.load()
+        legacy = os.path.join(DIR_PATH, "positions.pkl")
+        if not positions and os.path.exists(legacy):
+            # one-off migration of the pickled positions
+            with open(legacy, "rb") as f:
+                for symbol, amount in pickle.load(f).items():
+                    self.ledger.set(symbol, amount)
+        return positions
 
     def _get_order_params(
         self, symbol: str, pos: Decimal
@@ -210,6 +208,7 @@ class VwapStrategy(Strategy):
         self.log.info("Stopping strategy, waiting for active orders to complete...")
         if self.active_tasks:
             await asyncio.gather(*self.active_tasks)
+        await self.ledger.close()
         self.log.info("All active orders completed, shutting down...")
     
 
@@ -232,12 +231,11 @@ class VwapStrategy(Strategy):
         )
         await asyncio.sleep(20)
         if side == OrderSide.BUY:
-            self.current_positions[symbol] += amount
+            self.ledger.add(symbol, amount)
             self.log.debug(f"Mocked symbol: {symbol} added {amount}")
         else:
-            self.current_positions[symbol] -= amount
+            self.ledger.add(symbol, -amount)
             self.log.debug(f"Mocked symbol: {symbol} removed {amount}")
-        self._save_positions(self.current_positions)
         self._in_ordering[symbol] = False
 
     async def vwap_order(
@@ -379,37 +377,33 @@ class VwapStrategy(Strategy):
                 
         position = self.fetch_positions()
         real_pos = position.get(symbol, Decimal(str(0)))
-        pos_obj = await self.cache(BybitAccountType.ALL_TESTNET).get_position(symbol)
-        real_pos_2 = pos_obj.signed_amount
-        if real_pos_2 != real_pos:
-            self.log.error(f"Symbol: {symbol} BUY pos mismatch {real_pos_2} != {real_pos}")
         if side == OrderSide.BUY:
             self.log.debug(
                 f"Side BUY Symbol: {symbol} pos: {self.current_positions[symbol]} + {pos} = {real_pos}"
             )
-            self.current_positions[symbol] += pos
+            self.ledger.add(symbol, pos)
         else:
             self.log.debug(
                 f"Side SELL Symbol: {symbol} pos: {self.current_positions[symbol]} - {pos} = {real_pos}"
             )
-            self.current_positions[symbol] -= pos
+            self.ledger.add(symbol, -pos)
         end = int(time.time() * 1000)
         average = cost / float(pos) if pos > 0 else 0
         side_string = "BUY" if side == OrderSide.BUY else "SELL"
         self.log.debug(
             f"Symbol: {symbol} Side: {side_string} VWAP completed start: {start} end: {end} average: {average}"
         )
-        self._save_positions(self.current_positions)
         self._in_ordering[symbol] = False
 
     async def run(self):
         for private_connector in self._private_connectors.values():
             await private_connector.connect()
+        self._task_manager.create_task(self.ledger.run())
 
 
-def set_leverage(api: ccxt.bybit, symbol: str, leverage: int):
+async def set_leverage(exchange: BybitExchangeManager, symbol: str, leverage: int):
     try:
-        api.set_leverage(leverage, symbol)
+        await exchange.set_leverage(leverage, symbol)
         print(f"Set leverage to {leverage} for {symbol}")
     except Exception as e:
         print(e, symbol, leverage)
@@ -422,7 +416,7 @@ async def main():
             "sandbox": True,
         }
 
-        exchange = BybitExchangeManager(config)
+        exchange = await BybitExchangeManager.create(config)
 
         conn_linear = BybitPublicConnector(BybitAccountType.LINEAR_TESTNET, exchange)
 
@@ -432,6 +426,7 @@ async def main():
             strategy_id="strategy_vwap",
             user_id="vip_user",
             rate_limit=20,
+            reconcile_interval=10,
         )
         
         signal = BybitSignal(exchange.market)
@@ -448,6 +443,7 @@ async def main():
         await vwap.shutdown()
         await conn_linear.disconnect()
         await private_conn.disconnect()
+        exchange.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,218 @@
+import time
+
+from collections import defaultdict
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+
+import tradebot.core  # noqa: F401, import before tradebot.base to settle the import order
+from tradebot.base import PrivateConnector
+from tradebot.constants import OrderSide, OrderStatus
+from tradebot.entity import AsyncCache, EventSystem, RedisClient
+from tradebot.log import SpdLog
+from tradebot.types import Order, Position
+
+SYMBOL = "BTC/USDT:USDT"
+
+
+def make_order(status: OrderStatus, filled="0", **fields) -> Order:
+    """A bybit buy order of 1 `SYMBOL` with id "1", `fields` override the defaults."""
+    fields = {
+        "exchange": "bybit",
+        "symbol": SYMBOL,
+        "id": "1",
+        "side": OrderSide.BUY,
+        "amount": Decimal("1"),
+        "timestamp": 1,
+        **fields,
+    }
+    filled = None if filled is None else Decimal(str(filled))
+    return Order(status=status, filled=filled, **fields)
+
+
+class FakeCache:
+    """The in-memory part of `AsyncCache` the OMS and the position reconciliation use."""
+
+    def __init__(self, positions=None):
+        self.orders = {}
+        self.positions = {
+            symbol: Position(
+                symbol=symbol,
+                exchange="bybit",
+                strategy_id="test",
+                signed_amount=Decimal(amount),
+            )
+            for symbol, amount in (positions or {}).items()
+        }
+
+    def get_mem_order(self, order_id):
+        return self.orders.get(order_id)
+
+    def get_mem_position(self, symbol):
+        return self.positions.get(symbol)
+
+    def order_initialized(self, order):
+        self.orders[order.id] = order
+        return True
+
+    def order_status_update(self, order):
+        self.orders[order.id] = order
+        return True
+
+    async def apply_position(self, order):
+        pass
+
+    async def get_positions(self, symbols=()):
+        return dict(self.positions)
+
+
+class FakeResponse:
+    status = 200
+    headers = {}
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    async def read(self):
+        return self.raw
+
+
+class FakeSession:
+    """An HTTP session answering every request with `raw`, the requests are kept in `sent`."""
+
+    def __init__(self, raw=b"{}"):
+        self.raw = raw
+        self.sent = []
+
+    async def request(self, method, url, headers, data=None):
+        self.sent.append((time.time() * 1000, method, url, headers, data))
+        return FakeResponse(self.raw)
+
+    async def close(self):
+        pass
+
+
+class FakeApiClient:
+    """Sends every request at `sent_ms` on the exchange clock."""
+
+    def __init__(self, sent_ms=None):
+        self.sent_ms = sent_ms
+
+    def request_sent_ms(self):
+        return self.sent_ms
+
+
+class FakePrivateConnector(PrivateConnector):
+    """
+    A `PrivateConnector` without an exchange. Order requests are answered by the
+    coroutine functions `create`, `cancel` and `amend`, called with the connector and the
+    request arguments, and the exchange reports the signed `positions`. Requests are sent
+    at `sent_ms` unless a real `api_client` is given.
+    """
+
+    def __init__(
+        self,
+        cache,
+        positions=None,
+        create=None,
+        cancel=None,
+        amend=None,
+        account_type=None,
+        market=None,
+        api_client=None,
+        sent_ms=None,
+        **kwargs,
+    ):
+        super().__init__(
+            account_type=account_type,
+            market=market or {},
+            market_id={},
+            exchange_id="bybit",
+            ws_client=None,
+            cache=cache,
+            **kwargs,
+        )
+        self._api_client = api_client or FakeApiClient(sent_ms)
+        self.positions = positions or {}
+        self.client_order_ids = []
+        self._answers = {"create": create, "cancel": cancel, "amend": amend}
+
+    async def _answer(self, request, *args, **kwargs):
+        answer = self._answers[request]
+        if answer is None:
+            raise AssertionError(f"unexpected {request} request")
+        return await answer(self, *args, **kwargs)
+
+    async def fetch_positions(self):
+        return {symbol: Decimal(amount) for symbol, amount in self.positions.items()}
+
+    async def _create_order(self, *args, client_order_id=None, **kwargs):
+        self.client_order_ids.append(client_order_id)
+        return await self._answer("create", *args, client_order_id=client_order_id, **kwargs)
+
+    async def _cancel_order(self, *args, **kwargs):
+        return await self._answer("cancel", *args, **kwargs)
+
+    async def _amend_order(self, *args, **kwargs):
+        return await self._answer("amend", *args, **kwargs)
+
+    async def disconnect(self):
+        await self._task_manager.cancel()
+
+
+@pytest.fixture
+def order():
+    return make_order
+
+
+@pytest.fixture
+def session():
+    return FakeSession
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """An `AsyncCache` that only keeps state in memory."""
+    monkeypatch.setattr(RedisClient, "_params", {})
+    return AsyncCache(account_type="BYBIT", strategy_id="test", user_id="test")
+
+
+@pytest.fixture
+def fake_cache():
+    return FakeCache
+
+
+@pytest_asyncio.fixture
+async def private_connector():
+    """Creates `FakePrivateConnector`s, disconnected after the test."""
+    connectors = []
+
+    def connect(cache, **kwargs):
+        connector = FakePrivateConnector(cache, **kwargs)
+        connectors.append(connector)
+        return connector
+
+    yield connect
+    for connector in connectors:
+        await connector.disconnect()
+
+
+@pytest.fixture
+def events(monkeypatch):
+    """An `EventSystem` without the listeners of other tests."""
+    monkeypatch.setattr(EventSystem, "_listeners", defaultdict(list))
+    return EventSystem
+
+
+@pytest.fixture
+def registry(monkeypatch, tmp_path):
+    """A `SpdLog` registry writing synchronously into `tmp_path`."""
+    monkeypatch.setattr(SpdLog, "log_dir", tmp_path)
+    monkeypatch.setattr(SpdLog, "log_dir_created", False)
+    monkeypatch.setattr(SpdLog, "loggers", {})
+    monkeypatch.setattr(SpdLog, "overrides", {})
+    monkeypatch.setattr(SpdLog, "binary_log", None)
+    monkeypatch.setattr(SpdLog, "async_mode", False)
+    yield tmp_path
+    SpdLog.close_all_loggers()
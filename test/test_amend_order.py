@@ -0,0 +1,160 @@
+import asyncio
+import pytest
+
+from decimal import Decimal
+from types import SimpleNamespace
+from urllib.parse import parse_qs, urlsplit
+
+from tradebot.constants import OrderStatus, OrderType
+from tradebot.exchange.binance.connector import BinancePrivateConnector
+from tradebot.exchange.binance.constants import BinanceAccountType
+from tradebot.exchange.binance.rest_api import BinanceApiClient
+
+SYMBOL = "BTC/USDT:USDT"
+MARKET = {SYMBOL: SimpleNamespace(id="BTCUSDT", symbol=SYMBOL)}
+
+
+@pytest.fixture
+def cache(cache, order):
+    cache.order_initialized(order(OrderStatus.PENDING, timestamp=90))
+    cache.order_status_update(
+        order(OrderStatus.PARTIALLY_FILLED, "0.4", price=100.0, type=OrderType.LIMIT, timestamp=100)
+    )
+    return cache
+
+
+async def acknowledging(connector, symbol, order_id, price=None, amount=None):
+    order = await connector._amending_order(symbol, order_id, price=price, amount=amount)
+    connector.oms.add_order_msg(order)
+    return order
+
+
+async def applied(connector, request):
+    task = asyncio.create_task(connector.oms.handle_order_event())
+    try:
+        result = await request
+        await connector.oms.join()
+        return result
+    finally:
+        task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_amend_requires_price_or_amount(cache, private_connector):
+    connector = private_connector(cache, amend=acknowledging)
+    with pytest.raises(ValueError):
+        await connector.amend_order(SYMBOL, "1")
+
+
+@pytest.mark.asyncio
+async def test_amend_ack_carries_over_the_cached_order(cache, private_connector):
+    connector = private_connector(cache, amend=acknowledging, sent_ms=150)
+    ack = await applied(
+        connector, connector.amend_order(SYMBOL, "1", price=Decimal("101"), amount=Decimal("2"))
+    )
+
+    assert ack.status == OrderStatus.AMENDING
+    assert (ack.price, ack.amount, ack.filled) == (101.0, Decimal("2"), Decimal("0.4"))
+    assert ack.remaining == Decimal("1.6") and ack.type == OrderType.LIMIT
+    assert ack.timestamp == 150
+    assert cache.get_mem_order("1") == ack
+
+
+@pytest.mark.asyncio
+async def test_amend_ack_behind_the_exchange_update_is_dropped(cache, order, private_connector):
+    async def answered_after_the_update(connector, symbol, order_id, **kwargs):
+        # the exchange pushes the amended order before the REST response arrives
+        connector.oms.add_order_msg(
+            order(OrderStatus.PARTIALLY_FILLED, "0.4", price=101.0, timestamp=160)
+        )
+        await connector.oms.join()
+        return await acknowledging(connector, symbol, order_id, **kwargs)
+
+    connector = private_connector(cache, amend=answered_after_the_update, sent_ms=150)
+    await applied(connector, connector.amend_order(SYMBOL, "1", price=Decimal("101")))
+
+    cached = cache.get_mem_order("1")
+    assert (cached.status, cached.price, cached.timestamp) == (
+        OrderStatus.PARTIALLY_FILLED,
+        101.0,
+        160,
+    )
+
+
+@pytest.mark.asyncio
+async def test_binance_amend_fills_in_the_cached_side_quantity_and_price(
+    cache, private_connector, session
+):
+    client = BinanceApiClient(
+        api_key="key", secret="secret", account_type=BinanceAccountType.USD_M_FUTURE
+    )
+    await client.close_session()
+    client._session = session = session(
+        b'{"symbol":"BTCUSDT","orderId":1,"clientOrderId":"c1","price":"101",'
+        b'"origQty":"1","updateTime":1}'
+    )
+    connector = private_connector(
+        cache,
+        account_type=BinanceAccountType.USD_M_FUTURE,
+        market=MARKET,
+        api_client=client,
+    )
+    ack = await applied(
+        connector,
+        BinancePrivateConnector._amend_order(connector, SYMBOL, "1", price=Decimal("101")),
+    )
+
+    ((sent_ms, method, url, _, _),) = session.sent
+    params = parse_qs(urlsplit(url).query)
+    assert method == "PUT" and urlsplit(url).path == "/fapi/v1/order"
+    assert {k: params[k] for k in ("symbol", "orderId", "side", "quantity", "price")} == {
+        "symbol": ["BTCUSDT"],
+        "orderId": ["1"],
+        "side": ["BUY"],
+        "quantity": ["1"],
+        "price": ["101"],
+    }
+    assert ack.status == OrderStatus.AMENDING and ack.filled == Decimal("0.4")
+    assert ack.price == 101.0 and ack.amount == Decimal("1")
+    # stamped with the send time rather than the exchange's last update of the order
+    assert 0 <= sent_ms - ack.timestamp < 100
+    assert cache.get_mem_order("1").status == OrderStatus.AMENDING
+
+
+@pytest.mark.asyncio
+async def test_binance_spot_amend_fails(cache, private_connector):
+    connector = private_connector(
+        cache, account_type=BinanceAccountType.SPOT, market=MARKET, api_client=object()
+    )
+    order = await BinancePrivateConnector._amend_order(connector, SYMBOL, "1", price=Decimal("1"))
+    assert order.status == OrderStatus.FAILED
+
+
+@pytest.mark.asyncio
+async def test_okx_amend_response_is_parsed(cache, private_connector, session):
+    okx = pytest.importorskip("tradebot.exchange.okx.connector")
+    from tradebot.exchange.okx.constants import OkxAccountType
+    from tradebot.exchange.okx.rest_api import OkxApiClient
+
+    client = OkxApiClient(
+        api_key="key", secret="secret", passphrase="pass", account_type=OkxAccountType.DEMO
+    )
+    await client.close_session()
+    client._session = session = session(
+        b'{"code":"0","msg":"","data":[{"ordId":"1","clOrdId":"c1","ts":"1",'
+        b'"reqId":"","sCode":"0","sMsg":""}],"inTime":"1","outTime":"2"}'
+    )
+    connector = private_connector(
+        cache, account_type=OkxAccountType.DEMO, market=MARKET, api_client=client
+    )
+    ack = await applied(
+        connector,
+        okx.OkxPrivateConnector._amend_order(connector, SYMBOL, "1", amount=Decimal("2")),
+    )
+
+    ((sent_ms, method, url, _, data),) = session.sent
+    assert method == "POST" and url.endswith("/api/v5/trade/amend-order")
+    assert b'"newSz":"2"' in data and b"newPx" not in data
+    assert ack.status == OrderStatus.AMENDING and ack.filled == Decimal("0.4")
+    assert ack.amount == Decimal("2") and ack.remaining == Decimal("1.6")
+    assert 0 <= sent_ms - ack.timestamp < 100
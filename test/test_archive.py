@@ -0,0 +1,146 @@
+import threading
+import pytest
+
+from tradebot.archive import ArchiveSink, TickArchiver
+from tradebot.constants import EventType
+from tradebot.entity import EventSystem
+from tradebot.types import BookL1, Kline, MarkPrice, Trade
+
+DAY_MS = 86_400_000
+SYMBOL = "BTC/USDT:USDT"
+
+pytestmark = pytest.mark.usefixtures("events")
+
+
+class RecordingSink(ArchiveSink):
+    def __init__(self, blocked=False):
+        self.writes = []
+        self.closed = False
+        self.released = threading.Event()
+        if not blocked:
+            self.released.set()
+
+    def write(self, kind, exchange, symbol, day, columns):
+        self.released.wait()
+        self.writes.append(
+            (kind, exchange, symbol, day, {k: v.tolist() for k, v in columns.items()})
+        )
+
+    def close(self):
+        self.closed = True
+
+
+def bookl1(timestamp, bid=100.0):
+    return BookL1(
+        exchange="bybit",
+        symbol=SYMBOL,
+        bid=bid,
+        ask=bid + 1,
+        bid_size=1.0,
+        ask_size=2.0,
+        timestamp=timestamp,
+    )
+
+
+def test_events_are_written_by_kind_and_day():
+    sink = RecordingSink()
+    archiver = TickArchiver(sink, chunk_rows=3)
+    for i in range(4):
+        EventSystem.emit(EventType.BOOKL1, bookl1(DAY_MS - 2 + i, bid=100.0 + i))
+    EventSystem.emit(
+        EventType.TRADE_BATCH,
+        [
+            Trade(exchange="okx", symbol=SYMBOL, price=1.5, size=2.0, timestamp=5),
+            Trade(exchange="okx", symbol=SYMBOL, price=1.6, size=3.0, timestamp=6),
+        ],
+    )
+    EventSystem.emit(
+        EventType.KLINE,
+        Kline(
+            exchange="bybit",
+            symbol=SYMBOL,
+            interval="1m",
+            open=1.0,
+            high=2.0,
+            low=0.5,
+            close=1.5,
+            volume=10.0,
+            timestamp=7,
+        ),
+    )
+    EventSystem.emit(
+        EventType.MARK_PRICE,
+        MarkPrice(exchange="bybit", symbol=SYMBOL, price=99.0, timestamp=8),
+    )
+    archiver.close()
+
+    bookl1s = [w for w in sink.writes if w[0] == "bookl1"]
+    # the first full chunk spans midnight and is split, the last row follows on flush
+    assert [(w[3], w[4]["timestamp"], w[4]["bid"]) for w in bookl1s] == [
+        ("1970-01-01", [DAY_MS - 2, DAY_MS - 1], [100.0, 101.0]),
+        ("1970-01-02", [DAY_MS], [102.0]),
+        ("1970-01-02", [DAY_MS + 1], [103.0]),
+    ]
+    (trades,) = [w for w in sink.writes if w[0] == "trade"]
+    assert trades[1:4] == ("okx", SYMBOL, "1970-01-01")
+    assert trades[4] == {"timestamp": [5, 6], "price": [1.5, 1.6], "size": [2.0, 3.0]}
+    (kline,) = [w for w in sink.writes if w[0] == "kline"]
+    assert kline[4]["interval"] == ["1m"] and kline[4]["volume"] == [10.0]
+    (mark_price,) = [w for w in sink.writes if w[0] == "mark_price"]
+    assert mark_price[4] == {"timestamp": [8], "price": [99.0]}
+
+    assert archiver.archived == {"bookl1": 4, "trade": 2, "kline": 1, "mark_price": 1}
+    assert sum(archiver.dropped.values()) == 0 and archiver.write_errors == 0
+    assert sink.closed
+
+    # ignored once closed
+    EventSystem.emit(EventType.BOOKL1, bookl1(1))
+    assert archiver.archived["bookl1"] == 4
+
+
+def test_events_are_dropped_while_the_writer_is_behind():
+    sink = RecordingSink(blocked=True)
+    archiver = TickArchiver(sink, chunk_rows=2, max_chunks=2)
+    for i in range(7):
+        EventSystem.emit(EventType.BOOKL1, bookl1(i))
+    # both chunks are full and waiting, the next three events have nowhere to go
+    assert archiver.dropped["bookl1"] == 3
+
+    sink.released.set()
+    archiver.close()
+    assert archiver.archived["bookl1"] == 4
+    assert [w[4]["timestamp"] for w in sink.writes] == [[0, 1], [2, 3]]
+
+
+def test_parquet_files_are_partitioned_by_day(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    from tradebot.archive import ParquetSink
+
+    archiver = TickArchiver(ParquetSink(tmp_path), chunk_rows=16)
+    for timestamp in (DAY_MS - 1, DAY_MS):
+        EventSystem.emit(EventType.BOOKL1, bookl1(timestamp))
+    archiver.close()
+
+    (first,) = (tmp_path / "bookl1" / "date=1970-01-01" / "bybit").iterdir()
+    (second,) = (tmp_path / "bookl1" / "date=1970-01-02" / "bybit").iterdir()
+    assert first.name.startswith("BTC-USDT_USDT-") and first.suffix == ".parquet"
+    assert pq.read_table(first).column("timestamp").to_pylist() == [DAY_MS - 1]
+    assert pq.read_table(second).column("bid").to_pylist() == [100.0]
+
+
+def test_late_rows_of_a_closed_day_go_to_a_part_file(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    import numpy as np
+    from tradebot.archive import ParquetSink
+
+    sink = ParquetSink(tmp_path, keep_days=1)
+    for day, price in (("1970-01-01", 1.0), ("1970-01-02", 2.0), ("1970-01-01", 3.0)):
+        columns = {"timestamp": np.array([0]), "price": np.array([price])}
+        sink.write("mark_price", "bybit", SYMBOL, day, columns)
+    sink.close()
+
+    first = sink.path("mark_price", "bybit", SYMBOL, "1970-01-01")
+    late = sink.path("mark_price", "bybit", SYMBOL, "1970-01-01", part=1)
+    assert late.name == first.name.replace(".parquet", "-1.parquet")
+    assert pq.read_table(first).column("price").to_pylist() == [1.0]
+    assert pq.read_table(late).column("price").to_pylist() == [3.0]
@@ -0,0 +1,104 @@
+import os
+import subprocess
+import sys
+import orjson
+import pytest
+
+from decimal import Decimal
+
+from tradebot.binlog import BinaryLog, FileShipper, LokiShipper, LogRecord, decode_file
+from tradebot.log import SpdLog
+
+
+def test_loggers_write_through_binary_log(registry):
+    log = SpdLog.get_logger("BinaryTest", level="INFO")
+    binary_log = BinaryLog(
+        str(registry / "test.seg"),
+        shippers=[FileShipper(str(registry / "test.binlog"))],
+        flush_interval=60,
+    )
+    SpdLog.enable_binary_log(binary_log)
+
+    log.debug("skipped %s", 1)
+    log.info("order %s filled %s", "1", Decimal("0.5"))
+    log.warn("plain")
+
+    # not shipped yet, still readable from the segment
+    records = list(decode_file(str(registry / "test.seg")))
+    assert [r.format() for r in records] == ["order 1 filled 0.5", "plain"]
+
+    binary_log.close()
+    assert not (registry / "test.seg").exists()
+    records = list(decode_file(str(registry / "test.binlog")))
+    assert [(r.level, r.logger, r.format()) for r in records] == [
+        ("INFO", "BinaryTest", "order 1 filled 0.5"),
+        ("WARNING", "BinaryTest", "plain"),
+    ]
+    assert records[0].line().endswith("[BinaryTest] [info] order 1 filled 0.5")
+    assert binary_log.written == 2 and binary_log.dropped == 0
+
+
+def test_file_shipper_rotates(tmp_path):
+    shipper = FileShipper(str(tmp_path / "rot.binlog"), max_bytes=64, backups=2)
+    raw = [b"x" * 40]
+    for _ in range(4):
+        shipper.ship([], raw)
+    shipper.close()
+    assert sorted(p.name for p in tmp_path.iterdir()) == [
+        "rot.binlog",
+        "rot.binlog.1",
+        "rot.binlog.2",
+    ]
+    assert FileShipper.read(str(tmp_path / "rot.binlog.1")) == raw * 2
+
+
+def test_loki_payload_groups_streams():
+    records = [
+        LogRecord(1, "INFO", "A", "a %s", (1,)),
+        LogRecord(2, "ERROR", "A", "b"),
+        LogRecord(3, "INFO", "A", "c"),
+    ]
+    payload = orjson.loads(LokiShipper(labels={"host": "h"}).payload(records))
+    streams = {s["stream"]["level"]: s for s in payload["streams"]}
+    assert streams["info"]["stream"] == {
+        "job": "tradebot",
+        "host": "h",
+        "service": "A",
+        "level": "info",
+    }
+    assert streams["info"]["values"] == [["1", "a 1"], ["3", "c"]]
+    assert streams["error"]["values"] == [["2", "b"]]
+
+
+def crash(path, *messages):
+    """Write `messages` to a binary log in another process that dies without closing it."""
+    script = (
+        "import os, sys\n"
+        "from tradebot.binlog import BinaryLog\n"
+        "binary_log = BinaryLog(sys.argv[1], flush_interval=60)\n"
+        "for msg in sys.argv[2:]:\n"
+        "    binary_log.write('INFO', 'Crash', msg)\n"
+        "os._exit(1)\n"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    subprocess.run([sys.executable, "-c", script, str(path), *messages], env=env)
+
+
+def test_restart_keeps_unshipped_records(registry):
+    path = registry / "crash.seg"
+    # the records are only in the segment
+    crash(path, "before crash")
+
+    restarted = BinaryLog(str(path), flush_interval=60)
+    (crashed,) = registry.glob("crash.seg.crashed.*")
+    assert restarted.crashed == crashed
+    assert [r.format() for r in decode_file(str(crashed))] == ["before crash"]
+    assert list(decode_file(str(path))) == []
+    restarted.close()
+
+    # a segment left without records is simply reused
+    crash(path)
+    reused = BinaryLog(str(path), flush_interval=60)
+    assert reused.crashed is None
+    reused.close()
+    assert len(list(registry.glob("crash.seg.crashed.*"))) == 1
@@ -0,0 +1,111 @@
+import msgspec
+import pytest
+
+from decimal import Decimal
+
+from tradebot import codec
+from tradebot.types import Position
+from tradebot.constants import OrderStatus
+
+
+class FakeRedis:
+    def __init__(self, hashes, sets, strings):
+        self.hashes = hashes
+        self.sets = sets
+        self.strings = strings
+        self.calls = []
+
+    async def hscan_iter(self, key, count=None):
+        self.calls.append("hscan")
+        for item in self.hashes.get(key, {}).items():
+            yield item
+
+    async def sscan_iter(self, key, count=None):
+        self.calls.append("sscan")
+        for member in self.sets.get(key, ()):
+            yield member
+
+    async def scan_iter(self, match, count=None):
+        self.calls.append("scan")
+        for key in self.strings:
+            if key.startswith(match[:-1]):
+                yield key.encode()
+
+    async def mget(self, keys):
+        self.calls.append("mget")
+        return [self.strings.get(key.decode()) for key in keys]
+
+    async def get(self, key):
+        raise AssertionError("warmed cache must not fetch single keys")
+
+
+@pytest.mark.asyncio
+async def test_warm_up_loads_recent_open_orders_and_positions(cache, order):
+    now = cache._clock.timestamp_ms()
+    old = now - 2 * cache._expire_time * 1000
+    orders = [
+        order(OrderStatus.ACCEPTED, id="1", timestamp=now),
+        order(OrderStatus.FILLED, id="2", timestamp=now),
+        # old but open
+        order(OrderStatus.ACCEPTED, id="3", symbol="ETH/USDT:USDT", timestamp=old),
+        # expired
+        order(OrderStatus.FILLED, id="4", symbol="ETH/USDT:USDT", timestamp=old),
+    ]
+    position = Position(
+        symbol="BTC/USDT:USDT",
+        exchange="bybit",
+        strategy_id="warm",
+        signed_amount=Decimal("2"),
+    )
+    cache._r = FakeRedis(
+        hashes={
+            cache._orders_key: {
+                # entries written before the compact format are still JSON
+                o.id.encode(): msgspec.json.encode(o) if int(o.id) % 2 else codec.encode(o)
+                for o in orders
+            }
+        },
+        sets={cache._open_orders_key: [b"1", b"3"]},
+        strings={
+            f"{cache._symbol_positions_key}:BTC/USDT:USDT": msgspec.json.encode(position)
+        },
+    )
+
+    warmup = await cache.warm_up(batch_size=2)
+
+    assert (warmup.orders, warmup.open_orders, warmup.positions) == (3, 2, 1)
+    assert [cache.get_mem_order(id) is not None for id in "1234"] == [True] * 3 + [False]
+    assert await cache.get_open_orders("ETH/USDT:USDT") == {"3"}
+    assert await cache.get_symbol_orders("BTC/USDT:USDT") == {"1", "2"}
+    assert (await cache.get_position("BTC/USDT:USDT")).signed_amount == Decimal("2")
+    # loaded positions are complete, a miss does not go to Redis
+    assert await cache.get_position("SOL/USDT:USDT") is None
+    assert sorted(set(cache._r.calls)) == ["hscan", "mget", "scan", "sscan"]
+
+
+@pytest.mark.asyncio
+async def test_warm_up_skips_undecodable_entries(cache, order):
+    now = cache._clock.timestamp_ms()
+    good = order(OrderStatus.ACCEPTED, id="1", timestamp=now)
+    cache._r = FakeRedis(
+        hashes={
+            cache._orders_key: {
+                b"1": codec.encode(good),
+                b"2": b"\xffgarbage",
+                b"3": b"",
+            }
+        },
+        sets={cache._open_orders_key: [b"1"]},
+        strings={
+            f"{cache._symbol_positions_key}:BTC/USDT:USDT": b"{not json",
+            f"{cache._symbol_positions_key}:ETH/USDT:USDT": msgspec.json.encode(
+                Position(symbol="ETH/USDT:USDT", exchange="bybit", strategy_id="warm")
+            ),
+        },
+    )
+
+    warmup = await cache.warm_up()
+
+    assert (warmup.orders, warmup.positions, warmup.skipped) == (1, 1, 3)
+    assert [cache.get_mem_order(id) is not None for id in "123"] == [True, False, False]
+    assert await cache.get_position("ETH/USDT:USDT") is not None
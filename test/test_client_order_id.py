@@ -0,0 +1,173 @@
+import asyncio
+import pytest
+
+from decimal import Decimal
+
+from tradebot.entity import ClientOrderIdGenerator
+from tradebot.types import Order
+from tradebot.constants import OrderStatus, OrderSide, OrderType
+
+SYMBOL = "BTC/USDT:USDT"
+
+
+def pushing(order, updates, fail=False, response=None):
+    """
+    Answers an order request with the exchange updates of the order ahead of its REST
+    response, the response waits for `response` if given.
+    """
+
+    async def create(connector, symbol, *args, client_order_id=None, **kwargs):
+        if fail:
+            return Order(
+                exchange="bybit",
+                symbol=symbol,
+                status=OrderStatus.FAILED,
+                client_order_id=client_order_id,
+            )
+        for status, filled in updates:
+            connector.oms.add_order_msg(
+                order(status, filled, client_order_id=client_order_id, type=OrderType.LIMIT)
+            )
+        # the updates are processed while the request is in flight
+        await connector.oms.join()
+        if response:
+            await response.wait()
+        ack = order(OrderStatus.PENDING, client_order_id=client_order_id, type=OrderType.LIMIT)
+        connector.oms.add_order_msg(ack)
+        return ack
+
+    return create
+
+
+def submit(connector):
+    return connector.create_order(
+        SYMBOL, OrderSide.BUY, OrderType.LIMIT, Decimal("1"), Decimal("100")
+    )
+
+
+async def create(connector):
+    task = asyncio.create_task(connector.oms.handle_order_event())
+    try:
+        handle = await submit(connector)
+        await connector.oms.join()
+        return handle
+    finally:
+        task.cancel()
+
+
+def test_generated_ids_are_compact_and_monotonic():
+    ids = ClientOrderIdGenerator("s1")
+    generated = [ids.next() for _ in range(1000)]
+    assert len(set(generated)) == 1000
+    assert generated == sorted(generated)
+    assert all(len(i) == 13 and i.isalnum() for i in generated)
+
+
+@pytest.mark.asyncio
+async def test_updates_ahead_of_the_rest_response_are_applied(
+    cache, order, private_connector
+):
+    connector = private_connector(
+        cache,
+        create=pushing(
+            order, [(OrderStatus.ACCEPTED, "0"), (OrderStatus.PARTIALLY_FILLED, "0.4")]
+        ),
+    )
+    handle = await create(connector)
+    (client_order_id,) = connector.client_order_ids
+
+    assert handle.id == "1"
+    assert handle.status == OrderStatus.PARTIALLY_FILLED
+    assert (await cache.get_order("1")).filled == Decimal("0.4")
+    assert cache.get_order_by_client_id(client_order_id).id == "1"
+    assert await cache.get_open_orders(SYMBOL) == {"1"}
+    assert connector.oms.handles == {"1": handle}
+    assert not connector.oms.registered
+
+
+@pytest.mark.asyncio
+async def test_filled_before_the_rest_response(cache, order, private_connector):
+    connector = private_connector(cache, create=pushing(order, [(OrderStatus.FILLED, "1")]))
+    handle = await create(connector)
+    assert (await asyncio.wait_for(handle.filled(), 1)).id == "1"
+    assert await cache.get_open_orders(SYMBOL) == set()
+    assert not connector.oms.handles
+
+
+@pytest.mark.asyncio
+async def test_failed_order_is_unregistered(cache, order, private_connector):
+    connector = private_connector(cache, create=pushing(order, [], fail=True))
+    handle = await create(connector)
+    assert (await handle.done()).status == OrderStatus.FAILED
+    assert not connector.oms.registered
+    assert cache.get_order_by_client_id(connector.client_order_ids[0]) is None
+
+
+@pytest.mark.asyncio
+async def test_caller_timeout_after_sending_keeps_the_order(
+    cache, order, private_connector
+):
+    response = asyncio.Event()
+    connector = private_connector(
+        cache, create=pushing(order, [(OrderStatus.ACCEPTED, "0")], response=response)
+    )
+    task = asyncio.create_task(connector.oms.handle_order_event())
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(submit(connector), 0.1)
+    (client_order_id,) = connector.client_order_ids
+    # the order is live on the exchange
+    assert await cache.get_open_orders(SYMBOL) == {"1"}
+
+    response.set()
+    await asyncio.sleep(0.01)
+    await connector.oms.join()
+    assert cache.get_order_by_client_id(client_order_id).id == "1"
+    assert await cache.get_open_orders(SYMBOL) == {"1"}
+    assert "1" in connector.oms.handles
+    task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_caller_cancel_before_sending_unregisters(cache, order, private_connector):
+    response = asyncio.Event()
+    connector = private_connector(
+        cache, create=pushing(order, [], response=response), max_in_flight=1
+    )
+
+    # the first request holds the only slot, the second one stays queued
+    first = asyncio.create_task(submit(connector))
+    second = asyncio.create_task(submit(connector))
+    await asyncio.sleep(0.01)
+    second.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await second
+    response.set()
+    await first
+    assert len(connector.client_order_ids) == 1
+    assert not connector.oms.registered
+
+
+@pytest.mark.asyncio
+async def test_binance_order_placement_fails_cleanly():
+    from types import SimpleNamespace
+    from tradebot.exchange.binance import BinancePrivateConnector
+
+    connector = SimpleNamespace(
+        _log=SimpleNamespace(error=lambda msg: None),
+        _exchange_id="binance",
+        _clock=SimpleNamespace(timestamp_ms=lambda: 1),
+    )
+    order = await BinancePrivateConnector._create_order(
+        connector,
+        SYMBOL,
+        OrderSide.BUY,
+        OrderType.LIMIT,
+        Decimal("1"),
+        Decimal("100"),
+        time_in_force=None,
+        position_side=None,
+        client_order_id="t1",
+    )
+    # a response the OMS can acknowledge as failed, so the client order id is released
+    assert order.status == OrderStatus.FAILED
+    assert order.client_order_id == "t1" and not order.success
@@ -0,0 +1,116 @@
+import pytest
+
+from types import SimpleNamespace
+
+from tradebot.core import Strategy
+from tradebot.base import ClockSync, LatencyStats
+from tradebot.exchange.binance import BinanceAccountType
+from tradebot.exchange.bybit import BybitAccountType
+
+
+class FakeClock:
+    def __init__(self):
+        self.ns = 1_000_000_000_000_000
+
+    def timestamp_ns(self):
+        return self.ns
+
+    def timestamp_ms(self):
+        return self.ns / 1_000_000
+
+
+def clock_sync(answers, **kwargs):
+    """A `ClockSync` whose server answers with the `(rtt_ms, offset_ms)` of `answers` in turn."""
+    clock = FakeClock()
+    answers = iter(answers)
+
+    async def server_time():
+        sample = next(answers)
+        if isinstance(sample, Exception):
+            raise sample
+        rtt_ms, offset_ms = sample
+        clock.ns += int(rtt_ms * 500_000)
+        server_ts = clock.timestamp_ms() + offset_ms
+        clock.ns += int(rtt_ms * 500_000)
+        return server_ts
+
+    return ClockSync(server_time, clock=clock, **kwargs)
+
+
+def test_latency_stats():
+    stats = LatencyStats(alpha=0.5)
+    for value in (4.0, 2.0, 6.0):
+        stats.update(value)
+    assert (stats.count, stats.last, stats.max) == (3, 6.0, 6.0)
+    assert stats.mean == 4.0
+    assert stats.ewma == 4.5  # 4 -> 3 -> 4.5
+
+    stats.reset()
+    assert stats.count == 0 and stats.mean == 0.0
+
+
+@pytest.mark.asyncio
+async def test_clock_sync_uses_the_sample_with_the_smallest_rtt():
+    sync = clock_sync([(40, 12.0), (5, 3.0), (20, -8.0)], samples=3)
+    assert not sync.synced and sync.offset_ms == 0
+
+    await sync.sync()
+
+    assert sync.synced
+    assert sync.rtt_ms == pytest.approx(5)
+    assert sync.offset_ms == pytest.approx(3.0)
+    assert sync.latency_ms(sync.timestamp_ms() - sync.offset_ms - 10) == pytest.approx(13.0)
+
+
+@pytest.mark.asyncio
+async def test_clock_sync_discards_slow_and_failed_samples():
+    sync = clock_sync(
+        [(2_000, 50.0), ConnectionError("down"), (300, 7.0)], samples=3, max_rtt_ms=1_000
+    )
+    await sync.sync()
+    assert sync.rtt_ms == pytest.approx(300)
+    assert sync.offset_ms == pytest.approx(7.0)
+
+
+    # without a usable sample the clock stays unsynced
+    sync = clock_sync([(5_000, 99.0)], samples=1)
+    await sync.sync()
+    assert not sync.synced and sync.offset_ms == 0
+
+
+@pytest.mark.asyncio
+async def test_clock_sync_window_forgets_old_samples():
+    sync = clock_sync([(1, 1.0), (10, 2.0), (20, 3.0)], samples=1, window=2)
+    for _ in range(3):
+        await sync.sync()
+    # the 1ms sample slid out of the window
+    assert sync.offset_ms == pytest.approx(2.0)
+
+
+@pytest.mark.asyncio
+async def test_strategy_shares_the_clock_sync_of_the_same_exchange(events):
+    class PublicConnector(SimpleNamespace):
+        clock_sync = None
+
+        def set_clock_sync(self, clock_sync):
+            self.clock_sync = clock_sync
+
+    bybit_sync, binance_sync = clock_sync([]), clock_sync([])
+    linear = PublicConnector(account_type=BybitAccountType.LINEAR)
+    binance_public = PublicConnector(account_type=BinanceAccountType.USD_M_FUTURE)
+
+    strategy = Strategy()
+    strategy.add_public_connector(linear)
+    strategy.add_public_connector(binance_public)
+    assert linear.clock_sync is None
+
+    strategy.add_private_connector(
+        SimpleNamespace(account_type=BybitAccountType.ALL, clock_sync=bybit_sync)
+    )
+    assert linear.clock_sync is bybit_sync
+    assert binance_public.clock_sync is None
+
+    strategy.add_private_connector(
+        SimpleNamespace(account_type=BinanceAccountType.USD_M_FUTURE, clock_sync=binance_sync)
+    )
+    assert binance_public.clock_sync is binance_sync
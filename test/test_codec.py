@@ -0,0 +1,66 @@
+import msgspec
+import pytest
+
+from decimal import Decimal
+
+from tradebot import codec
+from tradebot.types import Order, Position
+from tradebot.constants import OrderStatus, OrderSide, OrderType, PositionSide, TimeInForce
+
+
+@pytest.fixture
+def order():
+    return Order(
+        exchange="binance",
+        symbol="BTC/USDT:USDT",
+        status=OrderStatus.PARTIALLY_FILLED,
+        id="4060823941",
+        amount=Decimal("0.010"),
+        filled=Decimal("0.004"),
+        client_order_id="x-xcKtGhcu",
+        timestamp=1718946360123,
+        type=OrderType.LIMIT,
+        side=OrderSide.SELL,
+        time_in_force=TimeInForce.GTC,
+        price=64000.5,
+        average=64000.5,
+        last_filled_price=64000.5,
+        last_filled=Decimal("0.004"),
+        remaining=Decimal("0.006"),
+        fee=0.0256,
+        fee_currency="USDT",
+        cost=256.002,
+        cum_cost=256.002,
+        reduce_only=False,
+        position_side=PositionSide.SHORT,
+    )
+
+
+def test_round_trip_is_compact(order):
+    data = codec.encode(order)
+    assert data[0] == codec.VERSION
+    assert codec.decode(data, Order) == order
+    assert len(data) * 2 < len(msgspec.json.encode(order))
+
+    position = Position(
+        symbol="BTC/USDT:USDT",
+        exchange="binance",
+        strategy_id="s",
+        side=PositionSide.LONG,
+        signed_amount=Decimal("0.5"),
+        last_order_filled={"1": Decimal("0.5")},
+    )
+    assert codec.decode(codec.encode(position), Position) == position
+
+
+def test_trailing_defaults_are_omitted():
+    order = Order(exchange="bybit", symbol="BTC/USDT:USDT", status=OrderStatus.FAILED)
+    data = codec.encode(order)
+    assert msgspec.msgpack.decode(data[1:]) == ["bybit", "BTC/USDT:USDT", 0]
+    assert codec.decode(data, Order) == order
+
+
+def test_decodes_json_entries(order):
+    assert codec.decode(msgspec.json.encode(order), Order) == order
+    with pytest.raises(ValueError):
+        codec.decode(b"\x7f" + codec.encode(order)[1:], Order)
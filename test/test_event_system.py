@@ -0,0 +1,116 @@
+import asyncio
+import pytest
+
+from tradebot.base import PublicConnector
+from tradebot.entity import EventSystem
+from tradebot.types import Trade
+from tradebot.constants import EventType
+
+
+class FakePublicConnector(PublicConnector):
+    async def subscribe_trade(self, symbol):
+        pass
+
+    async def subscribe_bookl1(self, symbol):
+        pass
+
+    async def subscribe_kline(self, symbol, interval):
+        pass
+
+
+def trades(n):
+    return [
+        Trade(exchange="bybit", symbol="BTC/USDT:USDT", price=100.0 + i, size=1.0, timestamp=i)
+        for i in range(n)
+    ]
+
+
+def test_trade_batch_only(events):
+    connector = FakePublicConnector(None, {}, {}, "bybit", None)
+    batches = []
+    EventSystem.on(EventType.TRADE_BATCH, batches.append)
+    assert not EventSystem.has_listeners(EventType.TRADE)
+
+    connector._emit_trades(trades(3))
+    assert len(batches) == 1
+    assert [t.timestamp for t in batches[0]] == [0, 1, 2]
+
+
+def test_single_trade_listeners_still_served(events):
+    connector = FakePublicConnector(None, {}, {}, "bybit", None)
+    single, batches = [], []
+    EventSystem.on(EventType.TRADE, single.append)
+    EventSystem.on(EventType.TRADE_BATCH, batches.append)
+
+    connector._emit_trades(trades(2))
+    assert [t.timestamp for t in single] == [0, 1]
+    assert len(batches) == 1
+
+
+@pytest.mark.asyncio
+async def test_async_listener_does_not_block_emit(events):
+    seen = []
+    slow_started = asyncio.Event()
+
+    async def slow(trade):
+        slow_started.set()
+        await asyncio.sleep(10)
+
+    async def fast(trade):
+        seen.append(trade.timestamp)
+
+    slow_listener = EventSystem.on_async(EventType.TRADE, slow, maxsize=2)
+    fast_listener = EventSystem.on_async(
+        EventType.TRADE, fast, key=lambda trade: trade.symbol
+    )
+    for trade in trades(4):
+        EventSystem.emit(EventType.TRADE, trade)
+    await fast_listener.join()
+    await slow_started.wait()
+
+    assert seen == [0, 1, 2, 3]
+    # the queue holds two events when emitting, one of them is running by now
+    assert slow_listener.stats.dropped == 2
+    assert slow_listener.queued == 1
+    await slow_listener.close()
+    await fast_listener.close()
+
+
+@pytest.mark.asyncio
+async def test_async_listener_counts_errors(events):
+    async def broken(x):
+        raise ValueError(x)
+
+    listener = EventSystem.on_async("signal", broken, ordering="concurrent")
+    await EventSystem.aemit("signal", 1)
+    await listener.join()
+    stats = EventSystem.listener_stats()[f"signal:{listener.name}"]
+    assert stats.errors == 1
+    assert stats.last_error == "ValueError(1)"
+    assert stats.processed == 0
+
+
+@pytest.mark.asyncio
+async def test_latest_listener_processes_the_last_snapshot(events):
+    seen = []
+    started, release = asyncio.Event(), asyncio.Event()
+
+    async def on_signal(snapshot):
+        seen.append(snapshot)
+        started.set()
+        await release.wait()
+
+    listener = EventSystem.on_async("signal", on_signal, ordering="latest")
+    await EventSystem.aemit("signal", {"BTC": 1})
+    await started.wait()
+    # the strategy is busy with the first snapshot while newer ones arrive
+    for amount in (2, 3, 4):
+        await EventSystem.aemit("signal", {"BTC": amount})
+    assert listener.queued == 1
+
+    release.set()
+    await listener.join()
+    assert seen == [{"BTC": 1}, {"BTC": 4}]
+    assert listener.stats.dropped == 2
+    assert listener.stats.processed == 2
+    await listener.close()
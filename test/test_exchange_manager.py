@@ -0,0 +1,60 @@
+import asyncio
+import threading
+import time
+import pytest
+
+from tradebot.base import ExchangeManager
+
+
+class SlowExchangeManager(ExchangeManager):
+    def __init__(self, config=None, load_markets=True):
+        config = config or {}
+        config["exchange_id"] = config.get("exchange_id", "bybit")
+        super().__init__(config, load_markets)
+
+    def load_markets(self):
+        time.sleep(0.2)
+        self.market = {"BTC/USDT:USDT": threading.current_thread().name}
+
+
+@pytest.mark.asyncio
+async def test_create_loads_markets_off_the_loop():
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.01)
+
+    task = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    bybit, okx = await asyncio.gather(
+        SlowExchangeManager.create(),
+        SlowExchangeManager.create({"exchange_id": "okx"}),
+    )
+    elapsed = time.perf_counter() - start
+    task.cancel()
+
+    # loaded concurrently, while the loop kept running
+    assert elapsed < 0.35
+    assert ticks >= 10
+    assert bybit.market["BTC/USDT:USDT"].startswith("bybit-ccxt")
+    assert okx.market["BTC/USDT:USDT"].startswith("okx-ccxt")
+    bybit.close()
+    okx.close()
+
+
+@pytest.mark.asyncio
+async def test_call_runs_ccxt_method_in_executor(monkeypatch):
+    exchange = SlowExchangeManager(load_markets=False)
+    monkeypatch.setattr(
+        exchange.api,
+        "set_leverage",
+        lambda leverage, symbol, params: (leverage, symbol, threading.current_thread().name),
+        raising=False,
+    )
+    leverage, symbol, thread = await exchange.set_leverage(5, "BTC/USDT:USDT")
+    assert (leverage, symbol) == (5, "BTC/USDT:USDT")
+    assert thread != threading.current_thread().name
+    exchange.close()
@@ -0,0 +1,235 @@
+import asyncio
+import pytest
+
+from decimal import Decimal
+from types import SimpleNamespace
+
+from tradebot.base import OrderManagerSystem
+from tradebot.entity import EventSystem
+from tradebot.types import Order, BookL1, MarketData
+from tradebot.constants import OrderSide, OrderStatus, ExecutionStatus
+from tradebot.execution import (
+    ExecutionEngine,
+    TWAPAlgorithm,
+    VWAPAlgorithm,
+    POVAlgorithm,
+)
+
+
+SYMBOL = "BTC/USDT:USDT"
+
+
+class FakeConnector:
+    def __init__(self):
+        self._exchange_id = "bybit"
+        self._market = {
+            SYMBOL: SimpleNamespace(
+                limits=SimpleNamespace(amount=SimpleNamespace(min=0.001))
+            )
+        }
+        self._clock = SimpleNamespace(timestamp_ms=lambda: 0)
+        self._cache = SimpleNamespace(get_order=self._get_order)
+        self.created = []
+        self.amended = []
+
+    async def _get_order(self, order_id):
+        return None
+
+    def amount_to_precision(self, symbol, amount, mode="round"):
+        return Decimal(str(amount)).quantize(Decimal("0.001"))
+
+    def price_to_precision(self, symbol, price, mode="round"):
+        return Decimal(str(price))
+
+    async def create_order(self, symbol, side, type, amount, price, **kwargs):
+        order = Order(
+            exchange="bybit",
+            symbol=symbol,
+            status=OrderStatus.PENDING,
+            id=str(len(self.created)),
+            side=side,
+            amount=amount,
+            price=float(price),
+        )
+        self.created.append(order)
+        return order
+
+    async def amend_order(self, symbol, order_id, price=None, amount=None):
+        self.amended.append((order_id, price))
+        return Order(
+            exchange="bybit", symbol=symbol, status=OrderStatus.AMENDING, id=order_id
+        )
+
+    async def cancel_order(self, symbol, order_id):
+        return Order(
+            exchange="bybit", symbol=symbol, status=OrderStatus.CANCELING, id=order_id
+        )
+
+
+def market_data(bid, ask):
+    data = MarketData()
+    data.update_bookl1(
+        BookL1(
+            exchange="bybit",
+            symbol=SYMBOL,
+            bid=bid,
+            ask=ask,
+            bid_size=1,
+            ask_size=1,
+            timestamp=0,
+        )
+    )
+    return data
+
+
+@pytest.mark.asyncio
+async def test_twap_schedule_and_fills():
+    connector = FakeConnector()
+    data = market_data(100.0, 101.0)
+    algo = TWAPAlgorithm(SYMBOL, OrderSide.BUY, Decimal("1"), duration=10)
+    parent = algo.start(connector, data, timestamp=0)
+    assert parent.arrival_price == 100.5
+    assert algo.target_quantity(5_000) == Decimal("0.5")
+
+    await algo.on_tick(5_000)
+    child = connector.created[0]
+    assert child.amount == Decimal("0.5")
+    assert child.price == 100.0
+
+    # the child is requoted in place when the touch moves
+    data.update_bookl1(
+        BookL1(exchange="bybit", symbol=SYMBOL, bid=100.5, ask=101.0, bid_size=1, ask_size=1, timestamp=1)
+    )
+    await algo.on_tick(6_000)
+    assert connector.amended == [(child.id, Decimal("100.5"))]
+    assert len(connector.created) == 1
+
+    algo.on_order(
+        Order(
+            exchange="bybit",
+            symbol=SYMBOL,
+            status=OrderStatus.FILLED,
+            id=child.id,
+            filled=Decimal("0.5"),
+            cum_cost=50.25,
+        )
+    )
+    assert parent.filled == Decimal("0.5")
+    assert parent.fill_rate == 0.5
+    assert parent.average == 100.5
+    assert parent.slippage_bps == 0
+
+    # past the end time the remainder crosses the spread
+    await algo.on_tick(11_000)
+    child = connector.created[1]
+    assert child.amount == Decimal("0.5")
+    assert child.price == 101.0
+
+    algo.on_order(
+        Order(
+            exchange="bybit",
+            symbol=SYMBOL,
+            status=OrderStatus.FILLED,
+            id=child.id,
+            filled=Decimal("0.5"),
+            cum_cost=50.5,
+        )
+    )
+    assert parent.status == ExecutionStatus.FINISHED
+    assert (await algo.wait()) is parent
+
+
+@pytest.mark.asyncio
+async def test_vwap_profile():
+    algo = VWAPAlgorithm(
+        SYMBOL, OrderSide.SELL, Decimal("10"), duration=4, volume_profile=[1, 3]
+    )
+    algo.start(FakeConnector(), market_data(100.0, 101.0), timestamp=0)
+    assert algo.target_quantity(2_000) == Decimal("2.5")
+    assert algo.target_quantity(3_000) == Decimal("6.25")
+    assert algo.target_quantity(5_000) == Decimal("10.0")
+
+
+@pytest.mark.asyncio
+async def test_pov_follows_market_volume():
+    algo = POVAlgorithm(
+        SYMBOL, OrderSide.BUY, Decimal("10"), duration=60, participation_rate=0.1
+    )
+    algo.start(FakeConnector(), market_data(100.0, 101.0), timestamp=1_000)
+    for ts in (500, 1_500, 2_000):
+        algo.on_trade(SimpleNamespace(size=5.0, timestamp=ts))
+    assert algo.market_volume == 10.0
+    assert algo.target_quantity(2_000) == Decimal("1.0")
+
+
+@pytest.mark.asyncio
+async def test_engine_routes_child_events_and_drops_finished_parents(events):
+    ticks = []
+    clock = SimpleNamespace(add_tick_callback=ticks.append)
+    engine = ExecutionEngine(clock, market_data(100.0, 101.0))
+    (tick,) = ticks
+    connector = FakeConnector()
+    algos = [
+        TWAPAlgorithm(SYMBOL, OrderSide.BUY, Decimal("1"), duration=10) for _ in range(2)
+    ]
+    parents = [engine.submit(algo, connector) for algo in algos]
+
+    # past the end time both quote their full amount
+    await tick(11.0)
+    first, second = connector.created
+    assert set(engine.children) == {first.id, second.id}
+
+    def fill(child, status, filled):
+        EventSystem.emit(
+            status,
+            Order(
+                exchange="bybit",
+                symbol=SYMBOL,
+                status=status,
+                id=child.id,
+                filled=Decimal(filled),
+                cum_cost=float(filled) * 101,
+            ),
+        )
+
+    fill(first, OrderStatus.PARTIALLY_FILLED, "0.4")
+    assert (parents[0].filled, parents[1].filled) == (Decimal("0.4"), Decimal("0"))
+    fill(first, OrderStatus.FILLED, "1")
+    assert parents[0].status == ExecutionStatus.FINISHED
+    assert engine.parents == [parents[1]]
+    assert engine.get(parents[0].id) is None
+    assert set(engine.children) == {second.id}
+    assert (await algos[0].wait()) is parents[0]
+
+    fill(second, OrderStatus.FILLED, "1")
+    assert not engine.parents and not engine.children
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("status", [OrderStatus.FAILED, OrderStatus.EXPIRED])
+async def test_child_closed_by_the_exchange_is_released(events, cache, status):
+    oms = OrderManagerSystem(cache)
+    task = asyncio.create_task(oms.handle_order_event())
+    ticks = []
+    clock = SimpleNamespace(add_tick_callback=ticks.append)
+    engine = ExecutionEngine(clock, market_data(100.0, 101.0))
+    (tick,) = ticks
+    connector = FakeConnector()
+    algo = TWAPAlgorithm(SYMBOL, OrderSide.BUY, Decimal("1"), duration=10)
+    engine.submit(algo, connector)
+
+    await tick(11.0)
+    (child,) = connector.created
+    oms.add_order_msg(child)
+    # e.g. rejected, or deactivated by bybit
+    oms.add_order_msg(
+        Order(exchange="bybit", symbol=SYMBOL, status=status, id=child.id, timestamp=1)
+    )
+    await asyncio.wait_for(oms.join(), 1)
+    task.cancel()
+
+    assert algo.children[child.id].done
+    assert child.id not in engine.children
+    # the next tick quotes a new child
+    await tick(12.0)
+    assert len(connector.created) == 2
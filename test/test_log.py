@@ -0,0 +1,50 @@
+import pytest
+
+from tradebot.log import SpdLog
+
+
+class Unformattable:
+    def __str__(self):
+        raise AssertionError("formatted a disabled message")
+
+
+def test_disabled_levels_do_not_format(registry):
+    log = SpdLog.get_logger("LazyTest", level="INFO")
+    assert not log.debug_enabled
+    assert log.info_enabled and log.error_enabled
+
+    log.debug("order %s", Unformattable())
+    log.info("order %s filled %s", "1", 0.5)
+    log.flush()
+    (path,) = registry.glob("LazyTest*.log")  # daily files carry the date
+    assert "order 1 filled 0.5" in path.read_text()
+
+
+def test_configure_overrides_levels(registry):
+    log = SpdLog.get_logger("ConfiguredTest", level="DEBUG", flush=True)
+    assert log.debug_enabled
+
+    SpdLog.configure(
+        {
+            "log": {"level": "ERROR", "flush": "false"},
+            "log.OtherTest": {"level": "debug"},
+            "bybit": {"API_KEY": "ignored"},
+        }
+    )
+    # existing loggers are reconfigured
+    assert not log.info_enabled and log.error_enabled
+    assert not log.flush_enabled
+
+    other = SpdLog.get_logger("OtherTest", level="INFO")
+    assert other.debug_enabled
+    assert not other.flush_enabled
+
+
+def test_level_aliases_and_unknown_levels(registry):
+    SpdLog.configure({"log": {"level": "warn"}})
+    log = SpdLog.get_logger("AliasTest", level="DEBUG")
+    assert log.level == "WARNING"
+    assert log.warn_enabled and not log.info_enabled
+
+    with pytest.raises(ValueError, match=r"\[log.AliasTest\] unknown log level 'verbose'"):
+        SpdLog.configure({"log.AliasTest": {"level": "verbose"}})
@@ -0,0 +1,86 @@
+import asyncio
+import pytest
+
+from decimal import Decimal
+
+from tradebot.base import OrderHandle, OrderManagerSystem
+from tradebot.constants import OrderStatus
+from tradebot.exceptions import OrderClosedError
+
+
+@pytest.mark.asyncio
+async def test_handle_resolved_by_order_events(order, fake_cache):
+    oms = OrderManagerSystem(fake_cache())
+    task = asyncio.create_task(oms.handle_order_event())
+    handle = oms.track(order(OrderStatus.PENDING))
+    assert handle.id == "1"
+    assert not handle.closed
+
+    oms.add_order_msg(order(OrderStatus.ACCEPTED))
+    assert (await asyncio.wait_for(handle.accepted(), 1)).status == OrderStatus.ACCEPTED
+
+    oms.add_order_msg(order(OrderStatus.PARTIALLY_FILLED, 0.5))
+    oms.add_order_msg(order(OrderStatus.FILLED, 1))
+    filled = await asyncio.wait_for(handle.filled(), 1)
+    assert filled.filled == Decimal("1")
+    assert handle.status == OrderStatus.FILLED
+    assert [o.status async for o in handle] == [
+        OrderStatus.PENDING,
+        OrderStatus.ACCEPTED,
+        OrderStatus.PARTIALLY_FILLED,
+        OrderStatus.FILLED,
+    ]
+    assert not oms.handles
+    task.cancel()
+
+
+@pytest.mark.asyncio
+async def test_handle_picks_up_earlier_updates_and_failures(order, fake_cache):
+    cache = fake_cache()
+    cache.orders["1"] = order(OrderStatus.CANCELED)
+    handle = OrderManagerSystem(cache).track(order(OrderStatus.PENDING))
+    assert handle.closed
+    with pytest.raises(OrderClosedError):
+        await handle.accepted()
+    with pytest.raises(OrderClosedError):
+        await handle.filled()
+
+    failed = OrderHandle(order(OrderStatus.FAILED))
+    assert (await failed.done()).status == OrderStatus.FAILED
+    assert await failed.wait(0)
+
+
+@pytest.mark.asyncio
+async def test_slow_symbol_does_not_block_other_shards(order, fake_cache):
+    release = asyncio.Event()
+    applied = []
+
+    async def apply_position(update):
+        if update.symbol == "BTC/USDT:USDT":
+            await release.wait()
+        applied.append((update.symbol, update.status))
+
+    cache = fake_cache()
+    cache.apply_position = apply_position
+    oms = OrderManagerSystem(cache, shards=4)
+    btc, sol = "BTC/USDT:USDT", "SOL/USDT:USDT"  # different shards
+    task = asyncio.create_task(oms.handle_order_event())
+
+    oms.add_order_msg(order(OrderStatus.ACCEPTED, symbol=btc))
+    oms.add_order_msg(order(OrderStatus.FILLED, 1, symbol=btc))
+    handle = oms.track(order(OrderStatus.PENDING, symbol=sol, id="2"))
+    oms.add_order_msg(order(OrderStatus.ACCEPTED, symbol=sol, id="2"))
+    oms.add_order_msg(order(OrderStatus.FILLED, 1, symbol=sol, id="2"))
+
+    assert oms.shard(btc) != oms.shard(sol)
+    assert (await asyncio.wait_for(handle.filled(), 1)).status == OrderStatus.FILLED
+    assert (btc, OrderStatus.ACCEPTED) not in applied
+
+    release.set()
+    await asyncio.wait_for(oms.join(), 1)
+    # per symbol order is kept
+    assert [s for sym, s in applied if sym == btc] == [
+        OrderStatus.ACCEPTED,
+        OrderStatus.FILLED,
+    ]
+    task.cancel()
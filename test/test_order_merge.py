@@ -0,0 +1,133 @@
+import asyncio
+import pytest
+
+from decimal import Decimal
+
+from tradebot.base import OrderManagerSystem
+from tradebot.types import Position
+from tradebot.constants import OrderStatus, PositionSide
+
+SYMBOL = "BTC/USDT:USDT"
+
+
+@pytest.fixture
+def update(order):
+    def update(status, filled, timestamp, sparse=False):
+        if sparse:
+            # REST acknowledgements carry the status only
+            return order(status, None, timestamp=timestamp, side=None, amount=None)
+        return order(status, filled, timestamp=timestamp)
+
+    return update
+
+
+@pytest.fixture
+def cache(cache, update):
+    cache.order_initialized(update(OrderStatus.PENDING, 0, 100))
+    return cache
+
+
+def apply(cache, *updates):
+    return [cache.order_status_update(u) for u in updates]
+
+
+async def open_orders(cache):
+    return await cache.get_open_orders(SYMBOL)
+
+
+def state(cache):
+    order = cache.get_mem_order("1")
+    return order.status, order.filled
+
+
+@pytest.mark.asyncio
+async def test_late_canceling_after_fill_is_dropped(cache, update):
+    assert apply(
+        cache,
+        update(OrderStatus.ACCEPTED, 0, 110),
+        update(OrderStatus.FILLED, 1, 120),
+        update(OrderStatus.CANCELING, None, 115, sparse=True),
+    ) == [True, True, False]
+    assert state(cache) == (OrderStatus.FILLED, Decimal("1"))
+    assert await open_orders(cache) == set()
+
+
+def test_filled_quantity_never_regresses(cache, update):
+    assert apply(
+        cache,
+        update(OrderStatus.PARTIALLY_FILLED, 0.6, 120),
+        update(OrderStatus.PARTIALLY_FILLED, 0.4, 130),  # late, despite its time
+        update(OrderStatus.ACCEPTED, 0, 125),
+    ) == [True, False, False]
+    assert state(cache) == (OrderStatus.PARTIALLY_FILLED, Decimal("0.6"))
+
+
+@pytest.mark.asyncio
+async def test_canceling_keeps_fields_and_newer_live_state_wins(cache, update):
+    apply(cache, update(OrderStatus.PARTIALLY_FILLED, 0.2, 110))
+    assert apply(cache, update(OrderStatus.CANCELING, None, 130, sparse=True)) == [True]
+    assert state(cache) == (OrderStatus.CANCELING, Decimal("0.2"))
+    assert cache.get_mem_order("1").amount == Decimal("1")
+
+    # an older acceptance is stale, a later one means the order is still live
+    assert apply(
+        cache,
+        update(OrderStatus.ACCEPTED, 0.2, 120),
+        update(OrderStatus.ACCEPTED, 0.2, 140),
+    ) == [False, True]
+    assert state(cache) == (OrderStatus.ACCEPTED, Decimal("0.2"))
+    assert await open_orders(cache) == {"1"}
+
+
+def test_amends_of_live_orders(cache, update):
+    apply(cache, update(OrderStatus.PARTIALLY_FILLED, 0.2, 110))
+    # amend acks are stamped with the send time, the exchange reported the order since
+    assert apply(
+        cache,
+        update(OrderStatus.AMENDING, None, 105, sparse=True),
+        update(OrderStatus.AMENDING, None, 115, sparse=True),
+    ) == [False, True]
+    assert state(cache) == (OrderStatus.AMENDING, Decimal("0.2"))
+
+    # the exchange reports the amended order, then re-announces it after another amend
+    assert apply(
+        cache,
+        update(OrderStatus.ACCEPTED, 0.2, 120),
+        update(OrderStatus.ACCEPTED, 0.2, 118),
+        update(OrderStatus.ACCEPTED, 0.2, 125),
+    ) == [True, False, True]
+    assert state(cache) == (OrderStatus.ACCEPTED, Decimal("0.2"))
+
+
+@pytest.mark.asyncio
+async def test_immediate_cancel_of_pending_order(cache, update):
+    assert apply(cache, update(OrderStatus.CANCELED, 0, 90)) == [True]
+    assert state(cache) == (OrderStatus.CANCELED, Decimal("0"))
+    assert await open_orders(cache) == set()
+
+
+@pytest.mark.asyncio
+async def test_late_partial_fill_does_not_move_the_position(cache, order):
+    cache.position_updated(Position(symbol=SYMBOL, exchange="bybit", strategy_id="merge"))
+    oms = OrderManagerSystem(cache)
+    task = asyncio.create_task(oms.handle_order_event())
+    for status, filled, timestamp in (
+        (OrderStatus.ACCEPTED, 0, 110),
+        (OrderStatus.FILLED, 10, 130),
+        (OrderStatus.PARTIALLY_FILLED, 5, 120),
+    ):
+        oms.add_order_msg(
+            order(
+                status,
+                filled,
+                timestamp=timestamp,
+                amount=Decimal("10"),
+                price=100.0,
+                position_side=PositionSide.FLAT,
+            )
+        )
+    await asyncio.wait_for(oms.join(), 1)
+    task.cancel()
+
+    assert state(cache) == (OrderStatus.FILLED, Decimal("10"))
+    assert cache.get_mem_position(SYMBOL).signed_amount == Decimal("10")
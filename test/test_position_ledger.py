@@ -0,0 +1,44 @@
+import pytest
+
+from decimal import Decimal
+
+from tradebot.entity import PositionLedger
+
+
+@pytest.mark.asyncio
+async def test_ledger_log_and_snapshot(tmp_path):
+    path = str(tmp_path / "positions")
+    ledger = PositionLedger(path, snapshot_every=3)
+    assert ledger.load() == {}
+    ledger.set("BTC/USDT:USDT", Decimal("0.5"))
+    ledger.add("BTC/USDT:USDT", Decimal("-0.2"))
+    await ledger.flush()
+
+    reloaded = PositionLedger(path).load()
+    assert reloaded == {"BTC/USDT:USDT": Decimal("0.3")}
+
+    # the third record triggers a snapshot and truncates the log
+    ledger.set("ETH/USDT:USDT", 2)
+    await ledger.flush()
+    assert (tmp_path / "positions.log").read_bytes() == b""
+    ledger.add("ETH/USDT:USDT", Decimal("1"))
+    await ledger.flush()
+
+    reloaded = PositionLedger(path).load()
+    assert reloaded == {"BTC/USDT:USDT": Decimal("0.3"), "ETH/USDT:USDT": Decimal("3")}
+
+
+@pytest.mark.asyncio
+async def test_ledger_drops_torn_record(tmp_path):
+    path = str(tmp_path / "positions")
+    ledger = PositionLedger(path)
+    ledger.set("BTC/USDT:USDT", Decimal("1"))
+    await ledger.flush()
+    with open(f"{path}.log", "ab") as f:
+        f.write(b'[2,"BTC/USDT:U')
+
+    ledger = PositionLedger(path)
+    assert ledger.load() == {"BTC/USDT:USDT": Decimal("1")}
+    ledger.set("BTC/USDT:USDT", Decimal("2"))
+    await ledger.close()
+    assert PositionLedger(path).load() == {"BTC/USDT:USDT": Decimal("2")}
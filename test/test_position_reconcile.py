@@ -0,0 +1,57 @@
+import pytest
+from decimal import Decimal
+from types import SimpleNamespace
+
+from tradebot.constants import EventType
+from tradebot.exchange.binance.connector import BinancePrivateConnector
+from tradebot.exchange.binance.constants import BinanceAccountType
+
+
+@pytest.fixture
+def drifts(events):
+    received = []
+    events.on(EventType.POSITION_DRIFT, received.append)
+    return received
+
+
+@pytest.mark.asyncio
+async def test_drift_reported_once_confirmed(drifts, fake_cache, private_connector):
+    connector = private_connector(
+        fake_cache({"BTC/USDT:USDT": "1", "ETH/USDT:USDT": "2", "SOL/USDT:USDT": "0"}),
+        positions={"BTC/USDT:USDT": "1", "ETH/USDT:USDT": "1.5", "XRP/USDT:USDT": "-3"},
+    )
+    first, second, third = [await connector.reconcile_positions() for _ in range(3)]
+
+    assert first == []
+    assert sorted((d.symbol, d.drift) for d in second) == [
+        ("ETH/USDT:USDT", Decimal("-0.5")),
+        ("XRP/USDT:USDT", Decimal("-3")),
+    ]
+    # not repeated while the drift persists
+    assert third == []
+    assert drifts == second
+    assert connector.exchange_positions["XRP/USDT:USDT"] == Decimal("-3")
+
+
+@pytest.mark.asyncio
+async def test_transient_difference_not_reported(drifts, fake_cache, private_connector):
+    connector = private_connector(
+        fake_cache({"BTC/USDT:USDT": "1"}), positions={"BTC/USDT:USDT": "0.5"}
+    )
+    assert await connector.reconcile_positions() == []
+    # the fill arrives before the next reconciliation
+    connector.positions = {"BTC/USDT:USDT": "1"}
+    assert await connector.reconcile_positions() == []
+    assert drifts == []
+
+
+@pytest.mark.asyncio
+async def test_reconcile_interval_needs_position_support(cache, private_connector):
+    assert private_connector(cache, reconcile_interval=60).can_fetch_positions
+
+    # Binance spot has no positions
+    exchange = SimpleNamespace(
+        market={}, market_id={}, exchange_id="binance", api_key=None, secret=None
+    )
+    with pytest.raises(ValueError):
+        BinancePrivateConnector(BinanceAccountType.SPOT, exchange, reconcile_interval=60)
@@ -0,0 +1,109 @@
+import asyncio
+import time
+import pytest
+
+from tradebot.base import ClockSync
+from tradebot.constants import RequestPriority
+from tradebot.rate_limit import TokenBucket
+from tradebot.exchange.bybit.rate_limit import BybitRateLimiter
+from tradebot.exchange.binance.rate_limit import BinanceRateLimiter
+from tradebot.exchange.bybit.rest_api import BybitApiClient
+
+
+def test_token_bucket_burst():
+    bucket = TokenBucket(5, 1)
+    for _ in range(5):
+        assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+
+def test_token_bucket_set_remaining_only_lowers():
+    bucket = TokenBucket(10, 1)
+    bucket.set_remaining(3)
+    assert bucket.available < 3.1
+    bucket.set_remaining(8)
+    assert bucket.available < 3.1
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_priority():
+    bucket = TokenBucket(1, 0.05)
+    assert bucket.try_acquire()
+
+    served = []
+
+    async def request(name, priority):
+        await bucket.acquire(1, priority)
+        served.append(name)
+
+    tasks = [
+        asyncio.create_task(request("new_1", RequestPriority.NEW)),
+        asyncio.create_task(request("new_2", RequestPriority.NEW)),
+        asyncio.create_task(request("cancel", RequestPriority.CANCEL)),
+    ]
+    await asyncio.gather(*tasks)
+    assert served == ["cancel", "new_1", "new_2"]
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_weight_exceeds_capacity():
+    bucket = TokenBucket(1, 1)
+    with pytest.raises(ValueError):
+        await bucket.acquire(2)
+
+
+def test_bybit_headers():
+    limiter = BybitRateLimiter()
+    limiter.update_from_headers(
+        "POST",
+        "/v5/order/create",
+        {"X-Bapi-Limit": "20", "X-Bapi-Limit-Status": "4"},
+    )
+    bucket = limiter.get_bucket("uid:/v5/order/create")
+    assert bucket.capacity == 20
+    assert bucket.available < 4.1
+
+
+def test_binance_headers():
+    limiter = BinanceRateLimiter()
+    rule = limiter.get_rule("POST", "/fapi/v1/order")
+    assert dict(rule.costs) == {
+        "fapi:weight": 0,
+        "fapi:orders:10S": 1,
+        "fapi:orders:1M": 1,
+    }
+    assert limiter.get_rule("DELETE", "/fapi/v1/order").priority == RequestPriority.CANCEL
+
+    limiter.update_from_headers(
+        "POST",
+        "/fapi/v1/order",
+        {"X-MBX-USED-WEIGHT-1M": "2000", "X-MBX-ORDER-COUNT-10S": "299"},
+    )
+    assert limiter.get_bucket("fapi:weight").available < 401
+    assert limiter.get_bucket("fapi:orders:10S").available < 1.1
+
+
+@pytest.mark.asyncio
+async def test_requests_are_signed_after_the_rate_limit_wait(monkeypatch, session):
+    client = BybitApiClient(api_key="key", secret="secret")
+    await client.close_session()
+    client._session = session = session(b'{"retCode":0,"retMsg":"OK","result":{},"time":1}')
+
+    async def throttled(method, endpoint, priority=None):
+        await asyncio.sleep(0.2)
+
+    monkeypatch.setattr(client.limiter, "acquire", throttled)
+    await client._fetch("POST", client._base_url, "/v5/order/create", {}, signed=True)
+
+    ((sent_ms, _, _, headers, _),) = session.sent
+    # stamped once the limiter let the request through, not when it was queued
+    assert sent_ms - int(headers["X-BAPI-TIMESTAMP"]) < 100
+
+    # nor is the wait taken for network round trip by the clock sync
+    async def server_time():
+        await client._fetch("GET", client._base_url, "/v5/market/time")
+        return int(time.time() * 1000)
+
+    clock_sync = ClockSync(server_time, samples=1)
+    await clock_sync.sync()
+    assert clock_sync.rtt_ms < 100
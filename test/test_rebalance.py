@@ -0,0 +1,36 @@
+import numpy as np
+
+from decimal import Decimal
+
+from tradebot.constants import OrderSide
+from tradebot.execution import Rebalancer
+
+
+SYMBOLS = ["A", "B", "C", "D", "E", "F"]
+
+
+def test_rebalance_plan():
+    rebalancer = Rebalancer(
+        SYMBOLS,
+        amount_step=[0.1] * 6,
+        min_amount=[0.1, 0.1, 0.1, 0.1, 0.1, 1.0],
+        min_notional=5.0,
+    )
+    target = rebalancer.align(
+        {"A": 1.0, "B": Decimal("-0.3"), "C": 0.5, "D": 0.2, "E": 2.0, "F": 0.5, "X": 9.0}
+    )
+    current = rebalancer.align({"A": 0.3, "B": 0.5, "C": 0.5, "D": -0.4, "E": 0.0})
+    price = rebalancer.align({"A": 10.0, "B": 10.0, "C": 10.0, "D": 100.0, "F": 10.0}, np.nan)
+
+    plan = rebalancer.plan(target, current, price)
+    assert plan.orders() == [
+        ("A", OrderSide.BUY, Decimal("0.7"), False),
+        # crossing zero closes the position first
+        ("B", OrderSide.SELL, Decimal("0.5"), True),
+        ("D", OrderSide.BUY, Decimal("0.4"), True),
+    ]
+    # C is on target, E has no price, F is below min amount
+    assert len(plan) == 3
+
+    active = rebalancer.align({"A": False}, default=1).astype(bool)
+    assert [o[0] for o in rebalancer.plan(target, current, price, active).orders()] == ["B", "D"]
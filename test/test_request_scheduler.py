@@ -0,0 +1,83 @@
+import asyncio
+import pytest
+
+from tradebot.base import RequestScheduler
+from tradebot.entity import TaskManager
+from tradebot.constants import RequestPriority
+
+
+@pytest.mark.asyncio
+async def test_cancel_dispatched_before_new():
+    task_manager = TaskManager()
+    scheduler = RequestScheduler(task_manager, max_in_flight=1)
+    sent = []
+
+    async def request(name):
+        sent.append(name)
+        await asyncio.sleep(0)
+        return name
+
+    futs = [
+        scheduler.submit(RequestPriority.NEW, request, "new_1"),
+        scheduler.submit(RequestPriority.NEW, request, "new_2"),
+        scheduler.submit(RequestPriority.AMEND, request, "amend"),
+        scheduler.submit(RequestPriority.CANCEL, request, "cancel"),
+    ]
+    assert await asyncio.gather(*futs) == ["new_1", "new_2", "amend", "cancel"]
+    assert sent == ["cancel", "amend", "new_1", "new_2"]
+    assert scheduler.wait_stats[RequestPriority.NEW].count == 2
+    await task_manager.cancel()
+
+
+@pytest.mark.asyncio
+async def test_duplicate_cancels_coalesced():
+    task_manager = TaskManager()
+    scheduler = RequestScheduler(task_manager)
+    calls = []
+
+    async def cancel(order_id):
+        calls.append(order_id)
+        return order_id
+
+    fut_1 = scheduler.submit(RequestPriority.CANCEL, cancel, "1", key=("cancel", "1"))
+    fut_2 = scheduler.submit(RequestPriority.CANCEL, cancel, "1", key=("cancel", "1"))
+    assert fut_1 is fut_2
+    assert await fut_1 == "1"
+    assert calls == ["1"]
+    assert scheduler.coalesced == 1
+
+    # completed requests are no longer coalesced
+    assert await scheduler.submit(
+        RequestPriority.CANCEL, cancel, "1", key=("cancel", "1")
+    ) == "1"
+    assert calls == ["1", "1"]
+    await task_manager.cancel()
+
+
+@pytest.mark.asyncio
+async def test_exception_propagates():
+    task_manager = TaskManager()
+    scheduler = RequestScheduler(task_manager)
+
+    async def fail():
+        raise ValueError("rejected")
+
+    with pytest.raises(ValueError):
+        await scheduler.submit(RequestPriority.NEW, fail)
+    await task_manager.cancel()
+
+
+@pytest.mark.asyncio
+async def test_dispatch_starts_with_the_first_request():
+    task_manager = TaskManager()
+    scheduler = RequestScheduler(task_manager)
+
+    async def request():
+        return "sent"
+
+    # nothing started the scheduler, e.g. an order placed before connect
+    assert await asyncio.wait_for(scheduler.submit(RequestPriority.NEW, request), 1) == "sent"
+    await task_manager.cancel()
+    # started again after a disconnect
+    assert await asyncio.wait_for(scheduler.submit(RequestPriority.NEW, request), 1) == "sent"
+    await task_manager.cancel()
@@ -0,0 +1,90 @@
+import asyncio
+import orjson
+import pytest
+
+from tradebot.shm import ByteRing, DecodePool, FrameDecoder, TRADE_RECORD
+from tradebot.shm import SharedMarketTable, SharedMarketData
+from tradebot.types import BookL1, Trade
+
+
+class JsonTradeDecoder(FrameDecoder):
+    def decode(self, raw):
+        msg = orjson.loads(bytes(raw))
+        return [(TRADE_RECORD, 0, msg["ts"], msg["p"], msg["v"], 0.0, 0.0)]
+
+
+def test_byte_ring_wraps_and_fills():
+    ring = ByteRing(64)
+    try:
+        peer = ByteRing(name=ring.name)
+        assert peer.capacity == 64
+        for i in range(10):
+            # 24 bytes per message, the ring wraps every two or three messages
+            assert ring.put(bytes([i]) * 20)
+            assert peer.get() == bytes([i]) * 20
+        assert peer.get() is None
+
+        assert ring.put(b"a" * 20)
+        assert ring.put(b"b" * 20)
+        assert not ring.put(b"c" * 20)
+        assert peer.drain() == [b"a" * 20, b"b" * 20]
+        peer.close()
+    finally:
+        ring.close()
+
+
+@pytest.mark.asyncio
+async def test_decode_pool_round_trip():
+    pool = DecodePool(workers=2, ring_size=1 << 16)
+    received = []
+    done = asyncio.Event()
+
+    def handler(records):
+        received.extend(records)
+        if len(received) == 20:
+            done.set()
+
+    source = pool.register(JsonTradeDecoder(), handler)
+    await pool.start()
+    try:
+        for i in range(20):
+            frame = orjson.dumps({"topic": f"publicTrade.{i % 3}", "ts": i, "p": 1.5, "v": 2.0})
+            assert pool.submit(source, frame)
+        await asyncio.wait_for(done.wait(), 30)
+    finally:
+        await pool.close()
+
+    assert sorted(r[3] for r in received) == list(range(20))
+    assert all(r[:3] == (TRADE_RECORD, source, 0) and r[4:6] == (1.5, 2.0) for r in received)
+
+
+def test_shared_market_table():
+    table = SharedMarketTable.create("bybit", ["BTC/USDT:USDT", "ETH/USDT:USDT"])
+    try:
+        data = SharedMarketData([table.name])
+        assert "BTC/USDT:USDT" not in data.bookl1["bybit"]
+        assert data.bookl1.get("bybit", {}).get("BTC/USDT:USDT") is None
+
+        table.write_bookl1(
+            BookL1(
+                exchange="bybit",
+                symbol="BTC/USDT:USDT",
+                bid=100.0,
+                ask=101.0,
+                bid_size=1.0,
+                ask_size=2.0,
+                timestamp=1,
+            )
+        )
+        table.write_trade(
+            Trade(exchange="bybit", symbol="ETH/USDT:USDT", price=10.0, size=3.0, timestamp=2)
+        )
+        book = data.bookl1["bybit"]["BTC/USDT:USDT"]
+        assert (book.bid, book.ask, book.bid_size, book.ask_size) == (100.0, 101.0, 1.0, 2.0)
+        assert data.trade["bybit"]["ETH/USDT:USDT"].price == 10.0
+        assert list(data.trade["bybit"]) == ["ETH/USDT:USDT"]
+        with pytest.raises(KeyError):
+            data.mark_price["bybit"]["BTC/USDT:USDT"]
+        data.close()
+    finally:
+        table.close()
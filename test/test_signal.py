@@ -0,0 +1,48 @@
+import pytest
+
+from decimal import Decimal
+from types import SimpleNamespace
+
+from tradebot.signal import SignalReceiver, InstrumentMap, bybit_linear_symbol
+
+
+MARKET = {
+    "BTC/USDT:USDT": SimpleNamespace(precision=SimpleNamespace(amount=0.001)),
+    "ETH/USDT:USDT": SimpleNamespace(precision=SimpleNamespace(amount=0.01)),
+}
+
+
+def test_instrument_map():
+    instruments = InstrumentMap(MARKET, bybit_linear_symbol, Decimal("0.5"))
+    assert instruments.resolve("BTCUSDT.BBP") == ("BTC/USDT:USDT", Decimal("0.0005"))
+    assert instruments.resolve("XYZUSDT.BBP") is None
+    assert "XYZUSDT.BBP" in instruments._instruments
+
+
+@pytest.mark.asyncio
+async def test_receiver_subscribes_new_symbols_once():
+    subscribed, received = [], []
+
+    async def subscribe(symbol):
+        subscribed.append(symbol)
+
+    receiver = SignalReceiver(
+        "ipc:///tmp/test_signal",
+        InstrumentMap(MARKET, bybit_linear_symbol),
+        handler=received.append,
+        subscribe=subscribe,
+    )
+    await receiver.on_payload(
+        b'[{"instrumentID": "BTCUSDT.BBP", "position": 12}, {"instrumentID": "XYZUSDT.BBP", "position": 1}]'
+    )
+    await receiver.on_payload(
+        b'[{"instrumentID": "BTCUSDT.BBP", "position": -3}, {"instrumentID": "ETHUSDT.BBP", "position": 5}]'
+    )
+    await receiver.on_payload(b"not json")
+
+    assert subscribed == ["BTC/USDT:USDT", "ETH/USDT:USDT"]
+    assert received == [
+        {"BTC/USDT:USDT": Decimal("0.012")},
+        {"BTC/USDT:USDT": Decimal("-0.003"), "ETH/USDT:USDT": Decimal("0.05")},
+    ]
+    assert receiver.errors == 1
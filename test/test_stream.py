@@ -0,0 +1,180 @@
+import asyncio
+import functools
+import time
+import pytest
+
+from decimal import Decimal
+
+from tradebot.base import OrderManagerSystem
+from tradebot.entity import AsyncCache, RedisClient
+from tradebot import codec
+from tradebot.stream import CacheView, StreamPublisher, stream_key
+from tradebot.types import Order, Position
+from tradebot.constants import OrderStatus, PositionSide
+
+SYMBOL = "BTC/USDT:USDT"
+
+
+class FakeStreams:
+    """The stream commands on one shared in-memory store."""
+
+    def __init__(self):
+        self.streams = {}
+        self.maxlen = {}
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def xadd(self, key, fields, maxlen=None, approximate=True, ms=None):
+        entries = self.streams.setdefault(key, [])
+        ms = int(time.time() * 1000) if ms is None else ms
+        entry_id = f"{ms}-{len(entries)}".encode()
+        entries.append((entry_id, {k.encode(): v for k, v in fields.items()}))
+        self.maxlen[key] = maxlen
+        return entry_id
+
+    async def xrevrange(self, key, max="+", min="-", count=None):
+        return list(reversed(self.streams.get(key, [])))[:count]
+
+    async def xread(self, streams, count=None, block=None):
+        (key, last_id), = streams.items()
+        last = entry_id(last_id)
+        entries = [e for e in self.streams.get(key, []) if entry_id(e[0]) > last]
+        if not entries:
+            await asyncio.sleep(block / 1000)
+            return []
+        return [[key.encode(), entries[:count]]]
+
+    async def get(self, key):
+        return None
+
+    async def hscan_iter(self, key, count=None):
+        for item in ():
+            yield item
+
+    async def sscan_iter(self, key, count=None):
+        for item in ():
+            yield item
+
+    async def scan_iter(self, match, count=None):
+        for item in ():
+            yield item
+
+    async def aclose(self):
+        pass
+
+
+def entry_id(id):
+    ms, seq = id.split(b"-")
+    return int(ms), int(seq)
+
+
+class FakePipeline:
+    def __init__(self, redis):
+        self._redis = redis
+        self._commands = []
+
+    def xadd(self, *args, **kwargs):
+        self._commands.append((args, kwargs))
+
+    async def execute(self):
+        return [self._redis.xadd(*args, **kwargs) for args, kwargs in self._commands]
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        pass
+
+
+@pytest.fixture
+def order(order):
+    return functools.partial(order, price=100.0, position_side=PositionSide.FLAT)
+
+
+@pytest.fixture
+def redis(monkeypatch):
+    monkeypatch.setattr(RedisClient, "_params", {})
+    redis = FakeStreams()
+    monkeypatch.setattr(RedisClient, "get_async_client", classmethod(lambda cls: redis))
+    return redis
+
+
+@pytest.mark.asyncio
+async def test_view_follows_published_updates(redis, order):
+    cache = AsyncCache(account_type="BYBIT", strategy_id="stream", user_id="test")
+    publisher = StreamPublisher.for_cache(cache, maxlen=1000)
+    oms = OrderManagerSystem(cache, publisher=publisher)
+    task = asyncio.create_task(oms.handle_order_event())
+
+    oms.add_order_msg(order(OrderStatus.PENDING, "0"))
+    oms.add_order_msg(order(OrderStatus.ACCEPTED, "0"))
+    await asyncio.wait_for(oms.join(), 1)
+    await publisher.flush()
+
+    received = []
+    view = CacheView("BYBIT", "stream", "test", handler=received.append, block_ms=10)
+    await view.start()
+    # the updates since the last possible sync are replayed on top of the synced state
+    for _ in range(100):
+        if view.received == 2:
+            break
+        await asyncio.sleep(0.01)
+    assert (await view.get_order("1")).status == OrderStatus.ACCEPTED
+
+    oms.add_order_msg(order(OrderStatus.FILLED, "1"))
+    await asyncio.wait_for(oms.join(), 1)
+    await publisher.flush()
+    for _ in range(100):
+        if view.received == 4:
+            break
+        await asyncio.sleep(0.01)
+
+    filled = await view.get_order("1")
+    assert (filled.status, filled.filled) == (OrderStatus.FILLED, Decimal("1"))
+    assert (await view.get_position(SYMBOL)).signed_amount == Decimal("1")
+    assert [type(obj) for obj in received] == [Order, Order, Order, Position]
+    assert publisher.published == 4 and publisher.dropped == 0
+    assert set(redis.maxlen.values()) == {1000}
+
+    task.cancel()
+    await view.close()
+
+
+@pytest.mark.asyncio
+async def test_view_replays_from_the_beginning_without_warm_up(redis, order):
+    cache = AsyncCache(account_type="BYBIT", strategy_id="stream", user_id="test")
+    publisher = StreamPublisher.for_cache(cache)
+    publisher.publish(order(OrderStatus.PENDING, "0"))
+    publisher.publish(order(OrderStatus.PARTIALLY_FILLED, "0.5"))
+    await publisher.flush()
+
+    view = CacheView("BYBIT", "stream", "test")
+    assert await view.poll(block_ms=0) == 2
+    assert await view.get_open_orders(SYMBOL) == {"1"}
+    assert (await view.get_order("1")).filled == Decimal("0.5")
+
+
+@pytest.mark.asyncio
+async def test_view_replays_updates_newer_than_the_synced_state(redis, order):
+    key = stream_key("BYBIT", "stream", "test")
+    now_ms = int(time.time() * 1000)
+    # Redis holds no state yet, the strategy has not synced since these updates
+    for status, filled, ms in (
+        (OrderStatus.PENDING, "0", now_ms - 120_000),
+        (OrderStatus.PENDING, "0", now_ms - 30_000),
+        (OrderStatus.PARTIALLY_FILLED, "0.5", now_ms - 20_000),
+    ):
+        redis.xadd(key, {"t": b"o", "d": codec.encode(order(status, filled))}, ms=ms)
+
+    view = CacheView("BYBIT", "stream", "test", block_ms=10, sync_interval=60)
+    await view.start()
+    for _ in range(100):
+        if view.received == 2:
+            break
+        await asyncio.sleep(0.01)
+
+    # only the entries of the last sync interval are read
+    assert view.received == 2
+    assert (await view.get_order("1")).filled == Decimal("0.5")
+    await view.close()
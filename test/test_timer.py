@@ -0,0 +1,63 @@
+import asyncio
+import pytest
+
+from tradebot.timer import TimerWheel
+
+
+def test_one_shot_and_cascade():
+    wheel = TimerWheel(resolution=0.01, wheel_size=4, levels=2)
+    now = wheel._tick * 0.01
+    fired = []
+    wheel.call_at(now + 0.025, lambda ts: fired.append("near"))
+    # beyond level 0 and level 1, lands in the overflow list
+    wheel.call_at(now + 0.205, lambda ts: fired.append("far"))
+    cancelled = wheel.call_at(now + 0.05, lambda ts: fired.append("cancelled"))
+    cancelled.cancel()
+    assert len(wheel) == 3
+
+    assert wheel.advance(now + 0.02) == 0
+    assert wheel.advance(now + 0.03) == 1
+    assert fired == ["near"]
+    assert wheel.advance(now + 0.2) == 0
+    assert wheel.advance(now + 0.21) == 1
+    assert fired == ["near", "far"]
+    assert len(wheel) == 0
+
+
+def test_periodic_drift_and_overrun():
+    wheel = TimerWheel(resolution=0.01)
+    now = wheel._tick * 0.01
+    ticks = []
+    timer = wheel.call_every(0.1, ticks.append, start=now + 0.1)
+    wheel.advance(now + 0.105)
+    assert ticks == [now + 0.105]
+    assert timer.deadline == pytest.approx(now + 0.2, abs=1e-6)
+    assert timer.drift == pytest.approx(0.005, abs=1e-6)
+
+    # the wheel falls behind by more than two intervals
+    wheel.advance(now + 0.43)
+    assert timer.runs == 2
+    assert timer.overruns == 2
+    assert timer.deadline == pytest.approx(now + 0.5, abs=1e-6)
+    assert timer.max_drift == pytest.approx(0.23, abs=1e-6)
+
+
+@pytest.mark.asyncio
+async def test_slow_callbacks_do_not_block_others():
+    wheel = TimerWheel(resolution=0.005)
+    fast = []
+
+    async def slow(ts):
+        await asyncio.sleep(0.2)
+
+    slow_timer = wheel.call_every(0.02, slow)
+    fast_timer = wheel.call_every(0.02, fast.append)
+    task = asyncio.create_task(wheel.run())
+    await asyncio.sleep(0.15)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    assert len(fast) >= 5
+    assert slow_timer.runs >= 5
+    assert slow_timer.overruns >= 4
+    assert fast_timer.overruns == 0
@@ -0,0 +1,376 @@
+"""
+Columnar archive of the market data events.
+
+`TickArchiver` listens to the BookL1, Trade, Kline and MarkPrice events and writes
+them field by field into preallocated NumPy column chunks, one per data type and
+(exchange, symbol). Full chunks, and every `flush_interval` seconds the partly
+filled ones, are handed to a writer thread that appends them to day partitioned
+Parquet or Arrow IPC files:
+
+    <root>/<kind>/date=<YYYY-MM-DD>/<exchange>/<symbol>-<session>[-<part>].parquet
+
+    archiver = TickArchiver(ParquetSink(".archive"))
+    task_manager.create_task(archiver.run())
+    ...
+    archiver.close()
+
+On the event loop an event costs a few dict lookups and array slot writes. When the
+writer falls behind and no chunk is free, events are dropped and counted in
+`dropped` instead of growing memory. Late rows of a day whose file was already
+closed go to a numbered part file. The sinks need pyarrow.
+"""
+
+import asyncio
+import queue
+import threading
+import time
+
+from abc import ABC, abstractmethod
+from collections import deque
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Deque, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from tradebot.constants import EventType
+from tradebot.entity import EventSystem
+from tradebot.log import SpdLog
+from tradebot.types import BookL1, Kline, MarkPrice, Trade
+
+_DAY_MS = 86_400_000
+
+# column name and dtype of each archived kind, timestamps first
+SCHEMAS: Dict[str, Tuple[Tuple[str, str], ...]] = {
+    "bookl1": (
+        ("timestamp", "i8"),
+        ("bid", "f8"),
+        ("ask", "f8"),
+        ("bid_size", "f8"),
+        ("ask_size", "f8"),
+    ),
+    "trade": (("timestamp", "i8"), ("price", "f8"), ("size", "f8")),
+    "kline": (
+        ("timestamp", "i8"),
+        ("interval", "U8"),
+        ("open", "f8"),
+        ("high", "f8"),
+        ("low", "f8"),
+        ("close", "f8"),
+        ("volume", "f8"),
+    ),
+    "mark_price": (("timestamp", "i8"), ("price", "f8")),
+}
+
+
+class ColumnChunk:
+    """
+    Fixed size columns of one kind, reused once the writer is done with them.
+    """
+
+    __slots__ = ("kind", "exchange", "symbol", "columns", "size", "capacity")
+
+    def __init__(self, kind: str, capacity: int):
+        self.kind = kind
+        self.exchange: str = None
+        self.symbol: str = None
+        self.columns = [np.empty(capacity, dtype=dtype) for _, dtype in SCHEMAS[kind]]
+        self.size = 0
+        self.capacity = capacity
+
+    def arrays(self, start: int = 0, stop: int = None) -> Dict[str, np.ndarray]:
+        stop = self.size if stop is None else stop
+        return {
+            name: column[start:stop]
+            for (name, _), column in zip(SCHEMAS[self.kind], self.columns)
+        }
+
+
+class ArchiveSink(ABC):
+    """
+    Receives the columns of one day of one (kind, exchange, symbol) on the writer thread.
+    """
+
+    @abstractmethod
+    def write(
+        self, kind: str, exchange: str, symbol: str, day: str, columns: Dict[str, np.ndarray]
+    ):
+        pass
+
+    def close(self):
+        pass
+
+
+class _ArrowSink(ArchiveSink):
+    suffix = ""
+
+    def __init__(self, root: str, keep_days: int = 2):
+        import pyarrow
+
+        self._pa = pyarrow
+        self._root = Path(root)
+        # files of a session never overwrite those of an earlier run
+        self._session = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S")
+        self._keep_days = keep_days
+        self._writers: Dict[Tuple[str, str, str, str], object] = {}
+        # files opened per key, a key written again after its writer was closed gets
+        # a numbered part file
+        self._parts: Dict[Tuple[str, str, str, str], int] = {}
+
+    def path(self, kind: str, exchange: str, symbol: str, day: str, part: int = 0) -> Path:
+        name = symbol.replace("/", "-").replace(":", "_")
+        if part:
+            name = f"{name}-{self._session}-{part}"
+        else:
+            name = f"{name}-{self._session}"
+        return self._root / kind / f"date={day}" / exchange / f"{name}{self.suffix}"
+
+    @abstractmethod
+    def _open(self, path: Path, schema):
+        pass
+
+    def write(
+        self, kind: str, exchange: str, symbol: str, day: str, columns: Dict[str, np.ndarray]
+    ):
+        table = self._pa.table(columns)
+        key = (day, kind, exchange, symbol)
+        writer = self._writers.get(key)
+        if writer is None:
+            self._close_days_before(day)
+            part = self._parts.get(key, 0)
+            self._parts[key] = part + 1
+            path = self.path(kind, exchange, symbol, day, part)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            writer = self._writers[key] = self._open(path, table.schema)
+        writer.write_table(table)
+
+    def _close_days_before(self, day: str):
+        days = sorted({key[0] for key in self._writers} | {day})
+        keep = set(days[-self._keep_days :])
+        for key in [key for key in self._writers if key[0] not in keep]:
+            self._writers.pop(key).close()
+
+    def close(self):
+        for writer in self._writers.values():
+            writer.close()
+        self._writers.clear()
+
+
+class ParquetSink(_ArrowSink):
+    suffix = ".parquet"
+
+    def __init__(self, root: str, compression: str = "zstd", keep_days: int = 2):
+        super().__init__(root, keep_days)
+        import pyarrow.parquet as pq
+
+        self._pq = pq
+        self._compression = compression
+
+    def _open(self, path: Path, schema):
+        return self._pq.ParquetWriter(path, schema, compression=self._compression)
+
+
+class ArrowSink(_ArrowSink):
+    """Arrow IPC files, readable with `pyarrow.ipc.open_file`."""
+
+    suffix = ".arrow"
+
+    def _open(self, path: Path, schema):
+        import pyarrow.ipc as ipc
+
+        return ipc.new_file(path, schema)
+
+
+class TickArchiver:
+    def __init__(
+        self,
+        sink: ArchiveSink,
+        chunk_rows: int = 4096,
+        max_chunks: int = 256,
+        flush_interval: float = 10,
+    ):
+        """
+        :param chunk_rows: Rows per column chunk
+        :param max_chunks: Chunks per kind, active or waiting for the writer; once all
+            are in use events are dropped
+        :param flush_interval: Seconds between hand-offs of partly filled chunks by `run`
+        """
+        self._log = SpdLog.get_logger(name=type(self).__name__, level="INFO", flush=True)
+        self._sink = sink
+        self._chunk_rows = chunk_rows
+        self._max_chunks = max_chunks
+        self._flush_interval = flush_interval
+        self._closed = False
+
+        # kind -> exchange -> symbol -> chunk being filled
+        self._active: Dict[str, Dict[str, Dict[str, Optional[ColumnChunk]]]] = {
+            kind: {} for kind in SCHEMAS
+        }
+        # appended by the writer thread, popped on the event loop
+        self._free: Dict[str, Deque[ColumnChunk]] = {kind: deque() for kind in SCHEMAS}
+        self._allocated: Dict[str, int] = {kind: 0 for kind in SCHEMAS}
+        self._queue: "queue.SimpleQueue[Optional[ColumnChunk]]" = queue.SimpleQueue()
+
+        self.archived: Dict[str, int] = {kind: 0 for kind in SCHEMAS}
+        self.dropped: Dict[str, int] = {kind: 0 for kind in SCHEMAS}
+        self.write_errors = 0
+
+        self._thread = threading.Thread(target=self._run_writer, name="TickArchiver", daemon=True)
+        self._thread.start()
+
+        EventSystem.on(EventType.BOOKL1, self._on_bookl1)
+        EventSystem.on(EventType.TRADE_BATCH, self._on_trades)
+        EventSystem.on(EventType.KLINE, self._on_kline)
+        EventSystem.on(EventType.MARK_PRICE, self._on_mark_price)
+
+    @property
+    def pending(self) -> int:
+        """Chunks waiting for the writer."""
+        return self._queue.qsize()
+
+    def _chunk(self, kind: str, exchange: str, symbol: str) -> Optional[ColumnChunk]:
+        chunks = self._active[kind].get(exchange)
+        chunk = chunks.get(symbol) if chunks else None
+        if chunk is not None and chunk.size < chunk.capacity:
+            return chunk
+        return self._next_chunk(kind, exchange, symbol, chunk)
+
+    def _next_chunk(
+        self, kind: str, exchange: str, symbol: str, full: Optional[ColumnChunk]
+    ) -> Optional[ColumnChunk]:
+        if self._closed:
+            return None
+        if full is not None:
+            self._queue.put(full)
+        free = self._free[kind]
+        if free:
+            chunk = free.pop()
+        elif self._allocated[kind] < self._max_chunks:
+            chunk = ColumnChunk(kind, self._chunk_rows)
+            self._allocated[kind] += 1
+        else:
+            chunk = None
+            self.dropped[kind] += 1
+        if chunk is not None:
+            chunk.exchange = exchange
+            chunk.symbol = symbol
+            chunk.size = 0
+        self._active[kind].setdefault(exchange, {})[symbol] = chunk
+        return chunk
+
+    def _on_bookl1(self, bookl1: BookL1):
+        chunk = self._chunk("bookl1", bookl1.exchange, bookl1.symbol)
+        if chunk is None:
+            return
+        i = chunk.size
+        timestamp, bid, ask, bid_size, ask_size = chunk.columns
+        timestamp[i] = bookl1.timestamp
+        bid[i] = bookl1.bid
+        ask[i] = bookl1.ask
+        bid_size[i] = bookl1.bid_size
+        ask_size[i] = bookl1.ask_size
+        chunk.size = i + 1
+
+    def _on_trades(self, trades: List[Trade]):
+        for trade in trades:
+            chunk = self._chunk("trade", trade.exchange, trade.symbol)
+            if chunk is None:
+                continue
+            i = chunk.size
+            timestamp, price, size = chunk.columns
+            timestamp[i] = trade.timestamp
+            price[i] = trade.price
+            size[i] = trade.size
+            chunk.size = i + 1
+
+    def _on_kline(self, kline: Kline):
+        chunk = self._chunk("kline", kline.exchange, kline.symbol)
+        if chunk is None:
+            return
+        i = chunk.size
+        timestamp, interval, open, high, low, close, volume = chunk.columns
+        timestamp[i] = kline.timestamp
+        interval[i] = kline.interval
+        open[i] = kline.open
+        high[i] = kline.high
+        low[i] = kline.low
+        close[i] = kline.close
+        volume[i] = kline.volume
+        chunk.size = i + 1
+
+    def _on_mark_price(self, mark_price: MarkPrice):
+        chunk = self._chunk("mark_price", mark_price.exchange, mark_price.symbol)
+        if chunk is None:
+            return
+        i = chunk.size
+        timestamp, price = chunk.columns
+        timestamp[i] = mark_price.timestamp
+        price[i] = mark_price.price
+        chunk.size = i + 1
+
+    def flush(self):
+        """
+        Hand every partly filled chunk to the writer. Runs on the event loop, the next
+        event of a symbol starts a new chunk.
+        """
+        for chunks in self._active.values():
+            for symbols in chunks.values():
+                for symbol, chunk in symbols.items():
+                    if chunk is not None and chunk.size:
+                        self._queue.put(chunk)
+                        symbols[symbol] = None
+
+    async def run(self):
+        while not self._closed:
+            await asyncio.sleep(self._flush_interval)
+            self.flush()
+
+    def _write(self, chunk: ColumnChunk):
+        days = chunk.columns[0][: chunk.size] // _DAY_MS
+        first, last = days.min(), days.max()
+        if first == last:
+            self._sink.write(
+                chunk.kind, chunk.exchange, chunk.symbol, self._day(first), chunk.arrays()
+            )
+            return
+        # a chunk across midnight, rows stay in arrival order within each day
+        for day in np.unique(days):
+            rows = np.flatnonzero(days == day)
+            self._sink.write(
+                chunk.kind,
+                chunk.exchange,
+                chunk.symbol,
+                self._day(day),
+                {name: column[rows] for name, column in chunk.arrays().items()},
+            )
+
+    @staticmethod
+    def _day(day: int) -> str:
+        return time.strftime("%Y-%m-%d", time.gmtime(int(day) * 86_400))
+
+    def _run_writer(self):
+        while True:
+            chunk = self._queue.get()
+            if chunk is None:
+                return
+            try:
+                self._write(chunk)
+                self.archived[chunk.kind] += chunk.size
+            except Exception as e:
+                self.write_errors += 1
+                self._log.error(
+                    f"Error archiving {chunk.kind} {chunk.exchange} {chunk.symbol}: {e}"
+                )
+            finally:
+                chunk.size = 0
+                self._free[chunk.kind].append(chunk)
+
+    def close(self):
+        """Write what is buffered and close the files."""
+        if self._closed:
+            return
+        self.flush()
+        self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self._sink.close()
@@ -1,18 +1,23 @@
 import asyncio
-import time
+import heapq
 import ssl
 import certifi
 import orjson
+import msgspec
 import warnings
 import aiohttp
+import functools
+import zlib
 
 # import ccxt.pro as ccxtpro
 import ccxt
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
-from typing import Callable, Literal
-from collections import defaultdict
+from typing import Dict, List, Any, Optional, Tuple
+from typing import Callable, Literal, Awaitable
+from collections import defaultdict, deque
+from contextvars import ContextVar
 from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
 
 
 from asynciolimiter import Limiter
@@ -23,10 +28,13 @@ from decimal import ROUND_HALF_UP, ROUND_CEILING, ROUND_FLOOR
 
 from tradebot.log import SpdLog
 from tradebot.entity import EventSystem, TaskManager
-from tradebot.constants import OrderStatus
-from tradebot.types import Order, BaseMarket
-from tradebot.entity import AsyncCache
-from tradebot.exceptions import OrderError, ExchangeResponseError
+from tradebot.constants import OrderStatus, RequestPriority, EventType
+from tradebot.rate_limit import RateLimiter, TokenBucket
+from tradebot.timer import TimerWheel, Timer
+from tradebot.types import Order, Trade, BaseMarket, PositionDrift
+from tradebot.entity import AsyncCache, ClientOrderIdGenerator
+from tradebot.stream import StreamPublisher
+from tradebot.exceptions import OrderError, ExchangeResponseError, OrderClosedError
 from tradebot.constants import OrderSide, OrderType, TimeInForce, PositionSide
 from picows import (
     ws_connect,
@@ -40,7 +48,24 @@ from tradebot.core.nautilius_core import LiveClock
 
 
 class ExchangeManager(ABC):
-    def __init__(self, config: Dict[str, Any]):
+    """
+    Markets and the ccxt client of an exchange.
+
+    ccxt calls are blocking, from a coroutine use the awaitable wrappers, which run the
+    call on the manager's own thread pool, e.g. `await exchange.set_leverage(5, symbol)`
+    or `await exchange.call("fetch_balance")`. The pool has a single thread by default
+    (`executor_workers` in the config) since the sync ccxt client is not thread-safe.
+
+    `create` loads the markets without blocking the loop, managers of several
+    exchanges load concurrently:
+
+        bybit, okx = await asyncio.gather(
+            BybitExchangeManager.create(bybit_config),
+            OkxExchangeManager.create(okx_config),
+        )
+    """
+
+    def __init__(self, config: Dict[str, Any], load_markets: bool = True):
         self.config = config
         self.api_key = config.get("apiKey", None)
         self.secret = config.get("secret", None)
@@ -52,12 +77,26 @@ class ExchangeManager(ABC):
         self.is_testnet = config.get("sandbox", False)
         self.market: Dict[str, BaseMarket] = {}
         self.market_id: Dict[str, BaseMarket] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=config.get("executor_workers", 1),
+            thread_name_prefix=f"{self.exchange_id}-ccxt",
+        )
 
         if not self.api_key or not self.secret:
             warnings.warn(
                 "API Key and Secret not provided, So some features related to trading will not work"
             )
-        self.load_markets()
+        if load_markets:
+            self.load_markets()
+
+    @classmethod
+    async def create(cls, config: Dict[str, Any] = None):
+        """
+        Construct the manager and load its markets off the event loop.
+        """
+        exchange = cls(config, load_markets=False)
+        await exchange.aload_markets()
+        return exchange
 
     def _init_exchange(self) -> ccxt.Exchange:
         try:
@@ -73,6 +112,33 @@ class ExchangeManager(ABC):
         )  # Set sandbox mode if demo trade is enabled
         return api
 
+    async def call(self, method: str, *args, **kwargs) -> Any:
+        """
+        Run the ccxt method `method` on the thread pool.
+        """
+        fn = functools.partial(getattr(self.api, method), *args, **kwargs)
+        return await asyncio.get_running_loop().run_in_executor(self._executor, fn)
+
+    async def aload_markets(self):
+        await asyncio.get_running_loop().run_in_executor(
+            self._executor, self.load_markets
+        )
+
+    async def fetch_positions(self, symbols: List[str] = None, **params) -> List[Dict]:
+        return await self.call("fetch_positions", symbols, params)
+
+    async def fetch_balance(self, **params) -> Dict:
+        return await self.call("fetch_balance", params)
+
+    async def fetch_open_orders(self, symbol: str = None, **params) -> List[Dict]:
+        return await self.call("fetch_open_orders", symbol, params=params)
+
+    async def set_leverage(self, leverage: int, symbol: str, **params) -> Any:
+        return await self.call("set_leverage", leverage, symbol, params)
+
+    def close(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
     @abstractmethod
     def load_markets(self):
         pass
@@ -108,11 +174,7 @@ class ExchangeManager(ABC):
             if market.future and market.active:
                 symbols.append(symbol)
         return symbols
-        
 
-    # __del__ will call .close() method
-    # async def close(self):
-    #     await self.api.close()
 
 
 class AccountManager(ABC):
@@ -444,7 +506,7 @@ class WSClient(ABC):
     def __init__(
         self,
         url: str,
-        limiter: Limiter,
+        limiter: Limiter | TokenBucket,
         handler: Callable[..., Any],
         specific_ping_msg: bytes = None,
         reconnect_interval: int = 0.2,
@@ -474,7 +536,7 @@ class WSClient(ABC):
         elif auto_ping_strategy == "ping_periodically":
             self._auto_ping_strategy = WSAutoPingStrategy.PING_PERIODICALLY
         self._task_manager = TaskManager()
-        self._log = SpdLog.get_logger(type(self).__name__, level="DEBUG", flush=True)
+        self._log = SpdLog.get_logger(type(self).__name__)
 
     @property
     def connected(self):
@@ -587,7 +649,11 @@ class RestApi:
             response.raise_for_status()
 
             self._log.debug(
-                f"Request {method} {url} succeeded with status {response.status}, kwargs: {kwargs}"
+                "Request %s %s succeeded with status %s, kwargs: %s",
+                method,
+                url,
+                response.status,
+                kwargs,
             )
             return data
 
@@ -647,22 +713,196 @@ class RestApi:
         return await self.request("DELETE", url, **kwargs)
 
 
+class LatencyStats:
+    """
+    Running latency statistics in milliseconds, cheap enough to update on every message.
+    """
+
+    __slots__ = ("count", "last", "ewma", "max", "_total", "_alpha")
+
+    def __init__(self, alpha: float = 0.05):
+        self._alpha = alpha
+        self.reset()
+
+    def update(self, value: float):
+        self.count += 1
+        self.last = value
+        self._total += value
+        self.ewma = value if self.count == 1 else self.ewma + self._alpha * (value - self.ewma)
+        if value > self.max:
+            self.max = value
+
+    @property
+    def mean(self) -> float:
+        return self._total / self.count if self.count else 0.0
+
+    def reset(self):
+        self.count = 0
+        self.last = 0.0
+        self.ewma = 0.0
+        self.max = float("-inf")
+        self._total = 0.0
+
+    def __repr__(self) -> str:
+        return (
+            f"LatencyStats(count={self.count}, last={self.last:.3f}, "
+            f"mean={self.mean:.3f}, ewma={self.ewma:.3f}, max={self.max:.3f})"
+        )
+
+
+# local time (ns) a request of the current task left the rate limiter, so `ClockSync`
+# does not count the wait for the limiter as round trip
+_request_sent_ns: ContextVar[int] = ContextVar("request_sent_ns", default=0)
+
+
+class ClockSync:
+    """
+    Estimate the offset between the local clock and an exchange server clock.
+
+    Every round takes `samples` measurements against the server-time endpoint:
+
+        t0 (local send) -> server_ts -> t1 (local receive)
+        rtt    = t1 - t0
+        offset = server_ts - (t0 + t1) / 2
+
+    Like the NTP clock filter, the offset of the sample with the smallest RTT in a
+    sliding window is used, since it carries the least queuing asymmetry.
+    """
+
+    def __init__(
+        self,
+        fetch_server_time: Callable[[], Awaitable[int]],
+        interval: float = 60,
+        samples: int = 5,
+        window: int = 8,
+        max_rtt_ms: float = 1000,
+        clock: LiveClock = None,
+    ):
+        """
+        :param fetch_server_time: Coroutine function returning the server time in ms
+        :param interval: Seconds between two sync rounds
+        :param samples: Number of measurements per sync round
+        :param window: Number of recent samples the filter chooses from
+        :param max_rtt_ms: Samples with a larger RTT are discarded
+        :param clock: Local clock, a `LiveClock` by default
+        """
+        self._fetch_server_time = fetch_server_time
+        self._interval = interval
+        self._samples = samples
+        self._max_rtt_ms = max_rtt_ms
+        self._window: deque[Tuple[float, float]] = deque(maxlen=window)  # (rtt, offset)
+        self._offset_ms = 0.0
+        self._rtt_ms: float | None = None
+        self._clock = clock or LiveClock()
+        self._log = SpdLog.get_logger(
+            name=type(self).__name__, level="INFO", flush=True
+        )
+
+    @property
+    def offset_ms(self) -> float:
+        """Server time minus local time in ms, 0 until the first successful sync."""
+        return self._offset_ms
+
+    @property
+    def rtt_ms(self) -> float | None:
+        return self._rtt_ms
+
+    @property
+    def synced(self) -> bool:
+        return self._rtt_ms is not None
+
+    def timestamp_ms(self) -> int:
+        return int(self._clock.timestamp_ms() + self._offset_ms)
+
+    def latency_ms(self, event_ts: int) -> float:
+        """One-way latency of an exchange event stamped `event_ts` (server ms)."""
+        return self._clock.timestamp_ms() + self._offset_ms - event_ts
+
+    async def _sample(self) -> Tuple[float, float]:
+        t0 = self._clock.timestamp_ns()
+        server_ts = await self._fetch_server_time()
+        t1 = self._clock.timestamp_ns()
+        t0 = max(t0, _request_sent_ns.get())
+        rtt_ms = (t1 - t0) / 1_000_000
+        offset_ms = server_ts - (t0 + t1) / 2_000_000
+        return rtt_ms, offset_ms
+
+    async def sync(self):
+        for _ in range(self._samples):
+            try:
+                rtt_ms, offset_ms = await self._sample()
+            except Exception as e:
+                self._log.error(f"Failed to fetch server time: {e}")
+                continue
+            if rtt_ms <= self._max_rtt_ms:
+                self._window.append((rtt_ms, offset_ms))
+
+        if self._window:
+            self._rtt_ms, self._offset_ms = min(self._window)
+            self._log.info(
+                f"Clock synced: offset {self._offset_ms:.3f}ms rtt {self._rtt_ms:.3f}ms"
+            )
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self._interval)
+            await self.sync()
+
+
 class ApiClient(ABC):
     def __init__(
         self,
         api_key: str = None,
         secret: str = None,
         timeout: int = 10,
+        limiter: RateLimiter = None,
     ):
         self._api_key = api_key
         self._secret = secret
         self._timeout = timeout
+        self._limiter = limiter
         self._log = SpdLog.get_logger(type(self).__name__, level="INFO", flush=True)
         self._ssl_context = ssl.create_default_context(cafile=certifi.where())
         self._session: Optional[aiohttp.ClientSession] = None
         self._clock = LiveClock()
+        self._clock_sync = ClockSync(self.get_server_time)
         self._init_session()
 
+    @property
+    def limiter(self) -> RateLimiter | None:
+        return self._limiter
+
+    @property
+    def clock_sync(self) -> ClockSync:
+        return self._clock_sync
+
+    def _timestamp_ms(self) -> int:
+        """Local time corrected by the estimated exchange clock offset, used for signing."""
+        return self._clock_sync.timestamp_ms()
+
+    async def _acquire(self, method: str, endpoint: str):
+        """
+        Wait for the rate limiter. Called before a request is stamped and signed, so the
+        wait can not push its timestamp out of the exchange's receive window.
+        """
+        await self._limiter.acquire(method, endpoint)
+        _request_sent_ns.set(self._clock.timestamp_ns())
+
+    def request_sent_ms(self) -> int:
+        """
+        Exchange clock time the last request of the current task left the rate limiter,
+        the current time if it sent none.
+        """
+        sent_ns = _request_sent_ns.get()
+        if not sent_ns:
+            return self._clock_sync.timestamp_ms()
+        return int(sent_ns / 1_000_000 + self._clock_sync.offset_ms)
+
+    @abstractmethod
+    async def get_server_time(self) -> int:
+        """Exchange server time in ms, used by `ClockSync`."""
+        raise NotImplementedError("Subclasses must implement this method.")
+
     def _init_session(self):
         if self._session is None:
             timeout = aiohttp.ClientTimeout(total=self._timeout)
@@ -684,14 +924,15 @@ class ApiClient(ABC):
 
 
 class Clock:
-    def __init__(self, tick_size: float = 1.0):
+    def __init__(self, tick_size: float = 1.0, resolution: float = None):
         """
         :param tick_size_s: Time interval of each tick in seconds (supports sub-second precision).
+        :param resolution: Resolution of the underlying timer wheel in seconds, by default
+            the smaller of `tick_size` and 10ms.
         """
         self._tick_size = tick_size  # Tick size in seconds
-        self._current_tick = (time.time() // self._tick_size) * self._tick_size
         self._clock = LiveClock()
-        self._tick_callbacks: List[Callable[[float], None]] = []
+        self._timers = TimerWheel(resolution=resolution or min(tick_size, 0.01))
         self._started = False
 
     @property
@@ -702,32 +943,39 @@ class Clock:
     def current_timestamp(self) -> float:
         return self._clock.timestamp()
 
-    def add_tick_callback(self, callback: Callable[[float], None]):
+    @property
+    def timers(self) -> TimerWheel:
+        return self._timers
+
+    def add_tick_callback(self, callback: Callable[[float], None]) -> Timer:
         """
         Register a callback to be called on each tick.
         :param callback: Function to be called with current_tick as argument.
+
+        Every callback is a timer of its own, so a slow callback does not delay the others.
         """
-        self._tick_callbacks.append(callback)
+        return self._timers.call_every(self._tick_size, callback, align=True)
+
+    def call_later(self, delay: float, callback: Callable[[float], None], name: str = None) -> Timer:
+        return self._timers.call_later(delay, callback, name)
+
+    def call_at(self, deadline: float, callback: Callable[[float], None], name: str = None) -> Timer:
+        return self._timers.call_at(deadline, callback, name)
+
+    def call_every(
+        self,
+        interval: float,
+        callback: Callable[[float], None],
+        name: str = None,
+        align: bool = False,
+    ) -> Timer:
+        return self._timers.call_every(interval, callback, name, align)
 
     async def run(self):
         if self._started:
             raise RuntimeError("Clock is already running.")
         self._started = True
-        while True:
-            now = time.time()
-            next_tick_time = self._current_tick + self._tick_size
-            sleep_duration = next_tick_time - now
-            if sleep_duration > 0:
-                await asyncio.sleep(sleep_duration)
-            else:
-                # If we're behind schedule, skip to the next tick to prevent drift
-                next_tick_time = now
-            self._current_tick = next_tick_time
-            for callback in self._tick_callbacks:
-                if asyncio.iscoroutinefunction(callback):
-                    await callback(self.current_timestamp)
-                else:
-                    callback(self.current_timestamp)
+        await self._timers.run()
 
 
 class PublicConnector(ABC):
@@ -739,19 +987,49 @@ class PublicConnector(ABC):
         exchange_id: str,
         ws_client: WSClient,
     ):
-        self._log = SpdLog.get_logger(
-            name=type(self).__name__, level="DEBUG", flush=True
-        )
+        self._log = SpdLog.get_logger(name=type(self).__name__)
         self._account_type = account_type
         self._market = market
         self._market_id = market_id
         self._exchange_id = exchange_id
         self._ws_client = ws_client
+        self._clock = LiveClock()
+        self._clock_sync: ClockSync | None = None
+        self._feed_latency = LatencyStats()
 
     @property
     def account_type(self):
         return self._account_type
 
+    @property
+    def feed_latency(self) -> LatencyStats:
+        """One-way latency (ms) between the exchange event time and local receipt."""
+        return self._feed_latency
+
+    def set_clock_sync(self, clock_sync: ClockSync):
+        """
+        Share the `ClockSync` of an `ApiClient` of the same exchange, so feed latency is
+        measured against the exchange clock instead of the raw local clock. `Strategy`
+        shares the one of its private connector of the same exchange.
+        """
+        self._clock_sync = clock_sync
+
+    def _record_latency(self, event_ts: int):
+        if self._clock_sync:
+            self._feed_latency.update(self._clock_sync.latency_ms(event_ts))
+        else:
+            self._feed_latency.update(self._clock.timestamp_ms() - event_ts)
+
+    def _emit_trades(self, trades: List[Trade]):
+        """
+        Deliver the trades of one ws frame: once as `EventType.TRADE_BATCH`, and trade by
+        trade as `EventType.TRADE` only if someone still listens to single trades.
+        """
+        if EventSystem.has_listeners(EventType.TRADE):
+            for trade in trades:
+                EventSystem.emit(EventType.TRADE, trade)
+        EventSystem.emit(EventType.TRADE_BATCH, trades)
+
     @abstractmethod
     async def subscribe_trade(self, symbol: str):
         pass
@@ -768,7 +1046,415 @@ class PublicConnector(ABC):
         await self._ws_client.disconnect()
 
 
+class RequestScheduler:
+    """
+    Outbound order request queue of a `PrivateConnector`.
+
+    Requests are dispatched by `RequestPriority` (cancels, then amends, then new orders)
+    and FIFO within a priority, with at most `max_in_flight` requests outstanding. A
+    request submitted with a `key` already queued or in flight is coalesced and shares
+    the result of the first one, so repeated cancels of one order hit the exchange once.
+
+    The dispatch loop is started with the first request, or by `start`.
+    """
+
+    def __init__(
+        self,
+        task_manager: TaskManager,
+        max_in_flight: int = 8,
+        limiter: TokenBucket = None,
+    ):
+        self._task_manager = task_manager
+        self._limiter = limiter
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._queue: List[Tuple[RequestPriority, int, int, asyncio.Future, Callable, tuple, dict]] = []
+        self._pending: Dict[Any, asyncio.Future] = {}
+        # futures of the requests handed to the exchange and not answered yet
+        self._dispatched: set[asyncio.Future] = set()
+        self._not_empty = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self._seq = 0
+        self._clock = LiveClock()
+        self._wait_stats: Dict[RequestPriority, LatencyStats] = {
+            priority: LatencyStats() for priority in RequestPriority
+        }
+        self._coalesced = 0
+
+    @property
+    def wait_stats(self) -> Dict[RequestPriority, LatencyStats]:
+        """Time (ms) requests spent queued before dispatch, per priority class."""
+        return self._wait_stats
+
+    @property
+    def coalesced(self) -> int:
+        return self._coalesced
+
+    @property
+    def queued(self) -> int:
+        return len(self._queue)
+
+    def submit(
+        self,
+        priority: RequestPriority,
+        fn: Callable[..., Awaitable[Any]],
+        *args,
+        key: Any = None,
+        **kwargs,
+    ) -> asyncio.Future:
+        if key is not None and key in self._pending:
+            self._coalesced += 1
+            return self._pending[key]
+
+        fut = asyncio.get_running_loop().create_future()
+        if key is not None:
+            self._pending[key] = fut
+            fut.add_done_callback(lambda _: self._pending.pop(key, None))
+
+        self._seq += 1
+        heapq.heappush(
+            self._queue,
+            (priority, self._seq, self._clock.timestamp_ns(), fut, fn, args, kwargs),
+        )
+        self._not_empty.set()
+        self.start()
+        return fut
+
+    def dispatched(self, fut: asyncio.Future) -> bool:
+        """Whether the request of `fut` was sent and is waiting for its response."""
+        return fut in self._dispatched
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = self._task_manager.create_task(self.run())
+
+    async def run(self):
+        while True:
+            await self._not_empty.wait()
+            await self._in_flight.acquire()
+            if self._limiter and self._queue:
+                await self._limiter.acquire(priority=self._queue[0][0])
+            if not self._queue:
+                self._in_flight.release()
+                self._not_empty.clear()
+                continue
+
+            priority, _, enqueued, fut, fn, args, kwargs = heapq.heappop(self._queue)
+            if not self._queue:
+                self._not_empty.clear()
+            if fut.done():
+                self._in_flight.release()
+                continue
+
+            self._wait_stats[priority].update(
+                (self._clock.timestamp_ns() - enqueued) / 1_000_000
+            )
+            self._dispatched.add(fut)
+            self._task_manager.create_task(self._execute(fut, fn, args, kwargs))
+
+    async def _execute(self, fut: asyncio.Future, fn: Callable, args: tuple, kwargs: dict):
+        try:
+            res = await fn(*args, **kwargs)
+            if not fut.done():
+                fut.set_result(res)
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except Exception as e:
+            if not fut.done():
+                fut.set_exception(e)
+        finally:
+            self._dispatched.discard(fut)
+            self._in_flight.release()
+
+
+class OrderHandle:
+    """
+    Returned by `PrivateConnector.create_order`, resolved by the `OrderManagerSystem` as
+    order updates are processed, so waiting on an order never polls the cache.
+
+    Attribute access falls through to the latest `Order`, so `handle.id`,
+    `handle.status` or `handle.success` work as they do on an `Order`.
+
+        handle = await connector.create_order(...)
+        await handle.accepted()
+        async for order in handle:
+            ...  # every update until the order is closed
+        order = await handle.filled()
+    """
+
+    _ACCEPTED = (
+        OrderStatus.ACCEPTED,
+        OrderStatus.PARTIALLY_FILLED,
+        OrderStatus.FILLED,
+        OrderStatus.AMENDING,
+        OrderStatus.CANCELING,
+    )
+    _CLOSED = (
+        OrderStatus.FILLED,
+        OrderStatus.CANCELED,
+        OrderStatus.EXPIRED,
+        OrderStatus.FAILED,
+    )
+
+    def __init__(self, order: Order):
+        loop = asyncio.get_running_loop()
+        self._order = order
+        self._accepted = loop.create_future()
+        self._done = loop.create_future()
+        self._updates: asyncio.Queue[Order] = asyncio.Queue()
+        self._update(order)
+
+    def __getattr__(self, name: str):
+        return getattr(self._order, name)
+
+    def __repr__(self) -> str:
+        return f"OrderHandle({self._order})"
+
+    @property
+    def order(self) -> Order:
+        """The latest known state of the order."""
+        return self._order
+
+    @property
+    def closed(self) -> bool:
+        return self._done.done()
+
+    def _update(self, order: Order):
+        if self._done.done():
+            return
+        self._order = order
+        self._updates.put_nowait(order)
+        if order.status in self._ACCEPTED and not self._accepted.done():
+            self._accepted.set_result(order)
+        if order.status in self._CLOSED:
+            if not self._accepted.done():
+                self._accepted.set_result(order)
+            self._done.set_result(order)
+
+    def _acknowledge(self, order: Order):
+        # the REST response carries the order id, unless exchange updates came first
+        if self._order.status == OrderStatus.PENDING and not self.closed:
+            self._order = order
+
+    async def accepted(self) -> Order:
+        """Wait until the exchange accepted the order."""
+        order = await asyncio.shield(self._accepted)
+        if order.status not in self._ACCEPTED:
+            raise OrderClosedError(f"Order closed before acceptance: {order.status}", order)
+        return order
+
+    async def done(self) -> Order:
+        """Wait until the order is closed: filled, canceled, expired or failed."""
+        return await asyncio.shield(self._done)
+
+    async def wait(self, timeout: float | None = None) -> bool:
+        """Wait at most `timeout` seconds for the order to close, return whether it did."""
+        try:
+            await asyncio.wait_for(asyncio.shield(self._done), timeout)
+        except asyncio.TimeoutError:
+            pass
+        return self._done.done()
+
+    async def filled(self) -> Order:
+        """Wait until the order is fully filled."""
+        order = await self.done()
+        if order.status != OrderStatus.FILLED:
+            raise OrderClosedError(f"Order closed without fill: {order.status}", order)
+        return order
+
+    def __aiter__(self):
+        return self._iter_updates()
+
+    async def _iter_updates(self):
+        while True:
+            if self._done.done() and self._updates.empty():
+                return
+            order = await self._updates.get()
+            yield order
+            if order.status in self._CLOSED:
+                return
+
+
+class OrderManagerSystem:
+    """
+    Applies order updates to the cache and resolves the `OrderHandle`s.
+
+    Updates are sharded by symbol over `shards` queues, each drained by its own worker.
+    The updates of a symbol, and so of an order, are applied in arrival order, while a
+    slow update of one symbol never holds up the symbols of other shards.
+    """
+
+    def __init__(
+        self, cache: AsyncCache, shards: int = 8, publisher: StreamPublisher = None
+    ):
+        """
+        :param publisher: Publishes every applied update, and the position it moved, for
+            other processes
+        """
+        self._log = SpdLog.get_logger(name=type(self).__name__)
+        self._cache = cache
+        self._publisher = publisher
+        self._queues: List[asyncio.Queue[Order]] = [
+            asyncio.Queue() for _ in range(shards)
+        ]
+        self._shard_of: Dict[str, asyncio.Queue[Order]] = {}
+        self._handles: Dict[str, OrderHandle] = {}  # order_id -> handle
+        self._client_handles: Dict[str, OrderHandle] = {}  # client_order_id -> handle
+
+    def add_order_msg(self, order: Order):
+        queue = self._shard_of.get(order.symbol)
+        if queue is None:
+            queue = self._queues[zlib.crc32(order.symbol.encode()) % len(self._queues)]
+            self._shard_of[order.symbol] = queue
+        queue.put_nowait(order)
+
+    @property
+    def backlog(self) -> List[int]:
+        """Queued updates per shard."""
+        return [queue.qsize() for queue in self._queues]
+
+    def shard(self, symbol: str) -> int:
+        """Index of the shard the updates of `symbol` are processed by."""
+        queue = self._shard_of.get(symbol)
+        if queue is None:
+            return zlib.crc32(symbol.encode()) % len(self._queues)
+        return self._queues.index(queue)
+
+    @property
+    def handles(self) -> Dict[str, OrderHandle]:
+        """Handles of the open orders, by order id."""
+        return dict(self._handles)
+
+    @property
+    def registered(self) -> Dict[str, OrderHandle]:
+        """Handles of the orders not acknowledged by the exchange yet, by client order id."""
+        return dict(self._client_handles)
+
+    async def join(self):
+        """Wait until every queued update is processed."""
+        await asyncio.gather(*(queue.join() for queue in self._queues))
+
+    def track(self, order: Order) -> OrderHandle:
+        """
+        Create the handle of a newly submitted order. Updates that were processed before
+        the REST response returned are already in the cache and are applied first.
+        """
+        handle = OrderHandle(order)
+        if order.id and not handle.closed:
+            cached = self._cache.get_mem_order(order.id)
+            if cached and cached is not order and cached.status != OrderStatus.PENDING:
+                handle._update(cached)
+            if not handle.closed:
+                self._handles[order.id] = handle
+        return handle
+
+    def register(self, order: Order) -> OrderHandle:
+        """
+        Pre-register a `PENDING` order by its client order id before it is sent, so its
+        updates are applied and resolve the handle even ahead of the REST response.
+        """
+        self._cache.order_registered(order)
+        handle = OrderHandle(order)
+        self._client_handles[order.client_order_id] = handle
+        return handle
+
+    def acknowledge(self, handle: OrderHandle, order: Order):
+        """
+        Apply the REST response of a registered order: the order id, or the failure.
+        """
+        client_order_id = handle.order.client_order_id
+        if not order.success:
+            self._cache.order_unregistered(client_order_id)
+            self._client_handles.pop(client_order_id, None)
+            handle._update(order)
+            return
+        handle._acknowledge(order)
+        if self._client_handles.pop(client_order_id, None) and not handle.closed:
+            self._handles[order.id] = handle
+
+    def _resolve(self, order: Order):
+        handle = self._handles.get(order.id)
+        if not handle and order.client_order_id:
+            handle = self._client_handles.pop(order.client_order_id, None)
+            if handle:
+                self._handles[order.id] = handle
+        if handle:
+            handle._update(order)
+            if handle.closed:
+                del self._handles[order.id]
+
+    def _apply(self, order: Order) -> bool:
+        if self._log.debug_enabled:
+            self._log.debug(f"ORDER STATUS {order.status.name}: {order}")
+        match order.status:
+            case OrderStatus.PENDING:
+                applied = self._cache.order_initialized(order)
+            case OrderStatus.CANCELING:
+                applied = self._cache.order_status_update(order)
+            case OrderStatus.AMENDING:
+                applied = self._cache.order_status_update(order)
+            case OrderStatus.ACCEPTED:
+                applied = self._cache.order_status_update(order)
+                EventSystem.emit(OrderStatus.ACCEPTED, order)
+            case OrderStatus.PARTIALLY_FILLED:
+                applied = self._cache.order_status_update(order)
+                EventSystem.emit(OrderStatus.PARTIALLY_FILLED, order)
+            case OrderStatus.CANCELED:
+                applied = self._cache.order_status_update(order)
+                EventSystem.emit(OrderStatus.CANCELED, order)
+            case OrderStatus.FILLED:
+                applied = self._cache.order_status_update(order)
+                EventSystem.emit(OrderStatus.FILLED, order)
+            case OrderStatus.EXPIRED:
+                applied = self._cache.order_status_update(order)
+                EventSystem.emit(OrderStatus.EXPIRED, order)
+            case OrderStatus.FAILED:
+                # rejected by the exchange after it was acknowledged
+                applied = self._cache.order_status_update(order)
+                EventSystem.emit(OrderStatus.FAILED, order)
+            case _:
+                applied = False
+        # handles start out pending, the REST acknowledgement only carries the id
+        if applied and order.status != OrderStatus.PENDING:
+            # the merged state the cache kept
+            self._resolve(self._cache.get_mem_order(order.id) or order)
+        return applied
+
+    def _publish(self, order: Order):
+        self._publisher.publish(self._cache.get_mem_order(order.id) or order)
+        if order.status in (
+            OrderStatus.FILLED,
+            OrderStatus.PARTIALLY_FILLED,
+            OrderStatus.CANCELED,
+        ):
+            if position := self._cache.get_mem_position(order.symbol):
+                self._publisher.publish(position)
+
+    async def _handle_shard(self, queue: asyncio.Queue[Order]):
+        while True:
+            order = await queue.get()
+            try:
+                if not self._apply(order):
+                    # stale or duplicate, its fill is already in the position
+                    continue
+                # the position follows the merged order, not the raw update
+                await self._cache.apply_position(
+                    self._cache.get_mem_order(order.id) or order
+                )
+                if self._publisher:
+                    self._publish(order)
+            except Exception as e:
+                self._log.error(f"Error in handle_order_event: {e}")
+            finally:
+                queue.task_done()
+
+    async def handle_order_event(self):
+        await asyncio.gather(*(self._handle_shard(queue) for queue in self._queues))
+
+
 class PrivateConnector(ABC):
+    _api_client: ApiClient
+
     def __init__(
         self,
         account_type,
@@ -778,10 +1464,26 @@ class PrivateConnector(ABC):
         ws_client: WSClient,
         cache: AsyncCache,
         rate_limit: float = None,
+        max_in_flight: int = 8,
+        reconcile_interval: float = None,
+        drift_confirmations: int = 2,
+        oms_shards: int = 8,
+        client_order_prefix: str = "t",
+        stream_maxlen: int = None,
     ):
-        self._log = SpdLog.get_logger(
-            name=type(self).__name__, level="DEBUG", flush=True
-        )
+        """
+        :param reconcile_interval: Seconds between position reconciliations against the
+            exchange, disabled by default. Raises `ValueError` when the account type can
+            not fetch positions
+        :param drift_confirmations: Consecutive reconciliations a difference has to show
+            up in before it is reported, so fills still in flight are not reported as drift
+        :param oms_shards: Queues the order updates are sharded over by symbol
+        :param client_order_prefix: Prefix of the generated client order ids, to tell apart
+            processes trading the same account
+        :param stream_maxlen: Publish the order and position updates to a Redis stream
+            of about this many entries for other processes, disabled by default
+        """
+        self._log = SpdLog.get_logger(name=type(self).__name__)
         self._account_type = account_type
         self._market = market
         self._market_id = market_id
@@ -790,19 +1492,220 @@ class PrivateConnector(ABC):
         self._ws_client = ws_client
         self._clock = LiveClock()
         self._cache = cache
-        self._oms = OrderManagerSystem(cache)
+        if stream_maxlen:
+            self._publisher = StreamPublisher.for_cache(cache, maxlen=stream_maxlen)
+        else:
+            self._publisher = None
+        self._oms = OrderManagerSystem(
+            cache, shards=oms_shards, publisher=self._publisher
+        )
+        self._client_order_ids = ClientOrderIdGenerator(client_order_prefix)
         
+        # connector-wide cap on top of the exchange limits enforced by the `ApiClient`
         if rate_limit:
-            self._limiter = Limiter(rate_limit)
+            self._limiter = TokenBucket(rate_limit, 1, name=type(self).__name__)
         else:
             self._limiter = None
-        
+
+        self._scheduler = RequestScheduler(
+            self._task_manager, max_in_flight=max_in_flight, limiter=self._limiter
+        )
+
+        if reconcile_interval and not self.can_fetch_positions:
+            raise ValueError(
+                f"{type(self).__name__} can not reconcile positions of {account_type}, "
+                "it does not support fetching positions"
+            )
+        self._reconcile_interval = reconcile_interval
+        self._drift_confirmations = drift_confirmations
+        self._drift_seen: Dict[str, int] = {}
+        self._exchange_positions: Dict[str, Decimal] = {}
+
     @property
     def account_type(self):
         return self._account_type
 
-    @abstractmethod
+    @property
+    def can_fetch_positions(self) -> bool:
+        """Whether `fetch_positions`, and so reconciliation, supports the account type."""
+        return type(self).fetch_positions is not PrivateConnector.fetch_positions
+
+    @property
+    def exchange_positions(self) -> Dict[str, Decimal]:
+        """
+        Signed positions of the last reconciliation, empty before the first one.
+        """
+        return self._exchange_positions
+
+    @property
+    def oms(self) -> OrderManagerSystem:
+        return self._oms
+
+    @property
+    def request_wait_stats(self) -> Dict[RequestPriority, LatencyStats]:
+        return self._scheduler.wait_stats
+
+    @property
+    def clock_sync(self) -> ClockSync:
+        """Offset to the exchange clock, kept in sync once connected."""
+        return self._api_client.clock_sync
+
     async def create_order(
+        self,
+        symbol: str,
+        side: OrderSide,
+        type: OrderType,
+        amount: Decimal,
+        price: Decimal = None,
+        time_in_force: TimeInForce = TimeInForce.GTC,
+        position_side: PositionSide = None,
+        **kwargs,
+    ) -> OrderHandle:
+        """
+        The order gets a client order id, `client_order_id` or a generated one, and is
+        registered with the OMS under it before the request is sent.
+        """
+        client_order_id = kwargs.pop("client_order_id", None) or self._client_order_ids.next()
+        handle = self._oms.register(
+            Order(
+                exchange=self._exchange_id,
+                symbol=symbol,
+                status=OrderStatus.PENDING,
+                client_order_id=client_order_id,
+                timestamp=self._clock.timestamp_ms(),
+                type=type,
+                side=side,
+                amount=amount,
+                price=float(price) if price else None,
+                time_in_force=time_in_force,
+                position_side=position_side,
+                filled=Decimal(0),
+                remaining=amount,
+                reduce_only=bool(kwargs.get("reduceOnly") or kwargs.get("reduce_only")),
+            )
+        )
+        fut = self._scheduler.submit(
+            RequestPriority.NEW,
+            self._create_order,
+            symbol=symbol,
+            side=side,
+            type=type,
+            amount=amount,
+            price=price,
+            time_in_force=time_in_force,
+            position_side=position_side,
+            client_order_id=client_order_id,
+            **kwargs,
+        )
+        try:
+            order = await asyncio.shield(fut)
+        except asyncio.CancelledError:
+            if fut.done() or self._scheduler.dispatched(fut):
+                # the request may have reached the exchange, keep the registration so its
+                # updates are still matched by client order id, and apply the response
+                fut.add_done_callback(functools.partial(self._acknowledge_response, handle))
+            else:
+                # still queued, it is never sent
+                fut.cancel()
+                self._oms.acknowledge(handle, self._failed(handle))
+            raise
+        except Exception:
+            # raised before an exchange response, the connectors return those as FAILED
+            self._oms.acknowledge(handle, self._failed(handle))
+            raise
+        self._oms.acknowledge(handle, order)
+        return handle
+
+    @staticmethod
+    def _failed(handle: OrderHandle) -> Order:
+        return msgspec.structs.replace(handle.order, status=OrderStatus.FAILED)
+
+    def _acknowledge_response(self, handle: OrderHandle, fut: asyncio.Future):
+        if fut.cancelled():
+            # unknown whether it was sent, the registration stays for its updates
+            return
+        if fut.exception():
+            self._oms.acknowledge(handle, self._failed(handle))
+        else:
+            self._oms.acknowledge(handle, fut.result())
+
+    async def cancel_order(self, symbol: str, order_id: str, **kwargs) -> Order:
+        # shielded: the future may be shared with coalesced duplicate cancels
+        return await asyncio.shield(
+            self._scheduler.submit(
+                RequestPriority.CANCEL,
+                self._cancel_order,
+                symbol=symbol,
+                order_id=order_id,
+                key=("cancel", order_id),
+                **kwargs,
+            )
+        )
+
+    async def amend_order(
+        self,
+        symbol: str,
+        order_id: str,
+        price: Decimal = None,
+        amount: Decimal = None,
+        **kwargs,
+    ) -> Order:
+        """
+        Modify price and/or total amount of an open order in place, one request instead
+        of cancel + create. Amends of the same order are not coalesced, they are applied
+        in submission order.
+        """
+        if price is None and amount is None:
+            raise ValueError("Either price or amount is required to amend an order")
+        return await self._scheduler.submit(
+            RequestPriority.AMEND,
+            self._amend_order,
+            symbol=symbol,
+            order_id=order_id,
+            price=price,
+            amount=amount,
+            **kwargs,
+        )
+
+    async def _amending_order(
+        self,
+        symbol: str,
+        order_id: str,
+        price: Decimal = None,
+        amount: Decimal = None,
+        client_order_id: str = None,
+    ) -> Order:
+        """
+        The `AMENDING` order to feed the OMS once the exchange acknowledged an amend,
+        carrying over the fields of the cached order. It is stamped with the time the
+        amend was sent, so the cache drops it when the exchange already reported the
+        order since.
+        """
+        timestamp = self._api_client.request_sent_ms()
+        previous = await self._cache.get_order(order_id)
+        if not previous:
+            return Order(
+                exchange=self._exchange_id,
+                symbol=symbol,
+                id=order_id,
+                client_order_id=client_order_id,
+                status=OrderStatus.AMENDING,
+                timestamp=timestamp,
+                price=float(price) if price else None,
+                amount=amount,
+            )
+
+        changes = {"status": OrderStatus.AMENDING, "timestamp": timestamp}
+        if price is not None:
+            changes["price"] = float(price)
+        if amount is not None:
+            changes["amount"] = amount
+            if previous.filled is not None:
+                changes["remaining"] = amount - previous.filled
+        return msgspec.structs.replace(previous, **changes)
+
+    @abstractmethod
+    async def _create_order(
         self,
         symbol: str,
         side: OrderSide,
@@ -811,18 +1714,101 @@ class PrivateConnector(ABC):
         price: Decimal,
         time_in_force: TimeInForce,
         position_side: PositionSide,
+        client_order_id: str = None,
         **kwargs,
     ) -> Order:
         pass
 
     @abstractmethod
-    async def cancel_order(self, symbol: str, order_id: str, **kwargs) -> Order:
+    async def _cancel_order(self, symbol: str, order_id: str, **kwargs) -> Order:
         pass
 
+    @abstractmethod
+    async def _amend_order(
+        self,
+        symbol: str,
+        order_id: str,
+        price: Decimal = None,
+        amount: Decimal = None,
+        **kwargs,
+    ) -> Order:
+        pass
+
+    async def fetch_positions(self) -> Dict[str, Decimal]:
+        """
+        Signed open positions of the account by symbol, as reported by the exchange REST
+        api, in the same unit as order amounts.
+        """
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support fetching positions"
+        )
+
+    async def reconcile_positions(self) -> List[PositionDrift]:
+        """
+        Compare the cached positions with the exchange and emit
+        `EventType.POSITION_DRIFT` for every symbol that differs in
+        `drift_confirmations` reconciliations in a row.
+
+        The cache only knows the positions of its own strategy, so this assumes the
+        strategy is the only one trading the account.
+        """
+        actual = await self._scheduler.submit(
+            RequestPriority.QUERY, self.fetch_positions, key="fetch_positions"
+        )
+        self._exchange_positions = actual
+        cached = await self._cache.get_positions(actual)
+
+        timestamp = self._clock.timestamp_ms()
+        zero = Decimal("0")
+        drifts = []
+        seen = {}
+        for symbol in actual.keys() | cached.keys():
+            position = cached.get(symbol)
+            cached_amount = position.signed_amount if position else zero
+            actual_amount = actual.get(symbol, zero)
+            if cached_amount == actual_amount:
+                continue
+            seen[symbol] = self._drift_seen.get(symbol, 0) + 1
+            if seen[symbol] == self._drift_confirmations:
+                drift = PositionDrift(
+                    exchange=self._exchange_id,
+                    symbol=symbol,
+                    cached=cached_amount,
+                    actual=actual_amount,
+                    timestamp=timestamp,
+                )
+                self._log.warn(
+                    f"Position drift {symbol}: cached {cached_amount} exchange {actual_amount}"
+                )
+                EventSystem.emit(EventType.POSITION_DRIFT, drift)
+                drifts.append(drift)
+        # a drift is reported once, again only after it went away
+        self._drift_seen = seen
+        return drifts
+
+    async def _reconcile(self, interval: float):
+        while True:
+            try:
+                await self.reconcile_positions()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._log.error(f"Error reconciling positions: {e}")
+            await asyncio.sleep(interval)
+
     async def connect(self):
+        self._scheduler.start()
         await self._cache.sync()
+        await self._api_client.clock_sync.sync()
+        self._task_manager.create_task(self._api_client.clock_sync.run())
+        if self._reconcile_interval:
+            self._task_manager.create_task(self._reconcile(self._reconcile_interval))
+        if self._publisher:
+            self._task_manager.create_task(self._publisher.run())
 
     async def disconnect(self):
+        if self._publisher:
+            await self._publisher.close()
         await self._cache.close()
         await self._ws_client.disconnect()
         await self._task_manager.cancel()
@@ -879,51 +1865,3 @@ class PrivateConnector(ABC):
             price = (price / exp).quantize(precision_decimal, rounding=ROUND_FLOOR) * exp
 
         return price
-
-
-
-class OrderManagerSystem:
-    def __init__(self, cache: AsyncCache):
-        self._log = SpdLog.get_logger(
-            name=type(self).__name__, level="DEBUG", flush=True
-        )
-        self._cache = cache
-        self._order_msg_queue: asyncio.Queue[Order] = asyncio.Queue()
-
-    def add_order_msg(self, order: Order):
-        self._order_msg_queue.put_nowait(order)
-
-    async def handle_order_event(self):
-        while True:
-            try:
-                order = await self._order_msg_queue.get()
-                match order.status:
-                    case OrderStatus.PENDING:
-                        self._log.debug(f"ORDER STATUS PENDING: {str(order)}")
-                        self._cache.order_initialized(order)
-                    case OrderStatus.CANCELING:
-                        self._log.debug(f"ORDER STATUS CANCELING: {str(order)}")
-                        self._cache.order_status_update(order)
-                    case OrderStatus.ACCEPTED:
-                        self._log.debug(f"ORDER STATUS ACCEPTED: {str(order)}")
-                        self._cache.order_status_update(order)
-                        EventSystem.emit(OrderStatus.ACCEPTED, order)
-                    case OrderStatus.PARTIALLY_FILLED:
-                        self._log.debug(f"ORDER STATUS PARTIALLY FILLED: {str(order)}")
-                        self._cache.order_status_update(order)
-                        EventSystem.emit(OrderStatus.PARTIALLY_FILLED, order)
-                    case OrderStatus.CANCELED:
-                        self._log.debug(f"ORDER STATUS CANCELED: {str(order)}")
-                        self._cache.order_status_update(order)
-                        EventSystem.emit(OrderStatus.CANCELED, order)
-                    case OrderStatus.FILLED:
-                        self._log.debug(f"ORDER STATUS FILLED: {str(order)}")
-                        self._cache.order_status_update(order)
-                        EventSystem.emit(OrderStatus.FILLED, order)
-                    case OrderStatus.EXPIRED:
-                        self._log.debug(f"ORDER STATUS EXPIRED: {str(order)}")
-                        self._cache.order_status_update(order)
-                await self._cache.apply_position(order)
-                self._order_msg_queue.task_done()
-            except Exception as e:
-                self._log.error(f"Error in handle_order_event: {e}")
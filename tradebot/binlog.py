@@ -0,0 +1,340 @@
+"""
+Binary structured log.
+
+Log calls encode a `LogRecord` with msgpack into a memory-mapped ring segment, which is
+all the work left on the event loop. A background thread drains the segment in batches
+and hands them to the shippers, which push them to Loki or append them to rotated
+binary files. Messages are formatted by the shippers, not by the caller.
+
+    SpdLog.enable_binary_log(
+        BinaryLog(".log/tradebot.seg", shippers=[LokiShipper("http://localhost:3100")])
+    )
+
+Segments and rotated files decode back to text lines in the SpdLog layout:
+
+    python -m tradebot.binlog .log/tradebot.seg .log/tradebot.binlog
+"""
+
+import argparse
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+import urllib.request
+import msgspec
+import orjson
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Iterator, List, Sequence, Tuple
+
+from tradebot.shm import ByteRing
+
+
+class LogRecord(msgspec.Struct, array_like=True, gc=False):
+    timestamp: int  # unix ns
+    level: str
+    logger: str
+    msg: str
+    args: Tuple[Any, ...] = ()
+
+    def format(self) -> str:
+        if not self.args:
+            return self.msg
+        try:
+            return self.msg % self.args
+        except (TypeError, ValueError):
+            return f"{self.msg} {self.args}"
+
+    def line(self) -> str:
+        ts = datetime.fromtimestamp(self.timestamp / 1e9).strftime("%Y-%m-%d %H:%M:%S.%f")
+        return f"[{ts[:-3]}] [{self.logger}] [{self.level.lower()}] {self.format()}"
+
+
+_encoder = msgspec.msgpack.Encoder(enc_hook=str)
+_decoder = msgspec.msgpack.Decoder(LogRecord)
+
+
+class SegmentRing(ByteRing):
+    """
+    A `ByteRing` in a memory-mapped file instead of shared memory, so records that were
+    not shipped yet survive a crash and can still be decoded from the file. A segment
+    left with records by a crashed run is moved to `<path>.crashed.<time>`, kept in
+    `crashed`, before the new one is created.
+    """
+
+    MAGIC = b"TBSEG001"
+    _MAGIC_OFFSET = 32
+
+    def __init__(self, path: str, capacity: int = 1 << 22):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.crashed: Path | None = None
+        try:
+            unshipped = self.read(self.path)
+        except (OSError, ValueError):
+            # missing, or not a segment that could hold records
+            unshipped = None
+        if unshipped:
+            self.crashed = self.path.with_name(
+                f"{self.path.name}.crashed.{time.strftime('%Y%m%dT%H%M%S')}"
+            )
+            self.path.replace(self.crashed)
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT | os.O_TRUNC)
+        try:
+            os.ftruncate(fd, self._DATA + capacity)
+            self._mmap = mmap.mmap(fd, self._DATA + capacity)
+        finally:
+            os.close(fd)
+        self._buf = memoryview(self._mmap)
+        self._POS.pack_into(self._buf, 0, 0)
+        self._POS.pack_into(self._buf, 8, 0)
+        self._POS.pack_into(self._buf, 16, capacity)
+        self._buf[self._MAGIC_OFFSET : self._MAGIC_OFFSET + 8] = self.MAGIC
+        self._capacity = capacity
+
+    @classmethod
+    def read(cls, path: str) -> List[bytes]:
+        """
+        The messages left in a segment file, without consuming them.
+        """
+        data = bytearray(Path(path).read_bytes())
+        if data[cls._MAGIC_OFFSET : cls._MAGIC_OFFSET + 8] != cls.MAGIC:
+            raise ValueError(f"{path} is not a log segment")
+        ring = cls.__new__(cls)
+        ring._buf = memoryview(data)
+        ring._capacity = cls._POS.unpack_from(data, 16)[0]
+        return ring.drain()
+
+    @property
+    def name(self) -> str:
+        return str(self.path)
+
+    def close(self):
+        self._buf.release()
+        self._buf = None
+        self._mmap.close()
+        self.path.unlink(missing_ok=True)
+
+
+class Shipper(ABC):
+    """
+    Receives the drained records on the background thread.
+    """
+
+    @abstractmethod
+    def ship(self, records: List[LogRecord], raw: List[bytes]):
+        pass
+
+    def close(self):
+        pass
+
+
+class LokiShipper(Shipper):
+    """
+    Pushes batches to the Loki push api, with the same `service` and `level` labels as
+    the promtail pipeline in `yaml-config/promtail-config.yaml`.
+    """
+
+    def __init__(self, url: str = "http://localhost:3100", labels: dict = None, timeout: float = 5):
+        self._url = url.rstrip("/") + "/loki/api/v1/push"
+        self._labels = {"job": "tradebot", **(labels or {})}
+        self._timeout = timeout
+
+    def payload(self, records: List[LogRecord]) -> bytes:
+        streams = {}
+        for record in records:
+            values = streams.setdefault((record.logger, record.level), [])
+            values.append([str(record.timestamp), record.format()])
+        return orjson.dumps(
+            {
+                "streams": [
+                    {
+                        "stream": {**self._labels, "service": logger, "level": level.lower()},
+                        "values": values,
+                    }
+                    for (logger, level), values in streams.items()
+                ]
+            }
+        )
+
+    def ship(self, records: List[LogRecord], raw: List[bytes]):
+        request = urllib.request.Request(
+            self._url,
+            data=self.payload(records),
+            headers={"Content-Type": "application/json"},
+            method="POST",
+        )
+        with urllib.request.urlopen(request, timeout=self._timeout):
+            pass
+
+
+class FileShipper(Shipper):
+    """
+    Appends the encoded records to `path`, rotated to `path.1` ... `path.<backups>` once
+    it exceeds `max_bytes`. Each record is a u32 length followed by its msgpack bytes.
+    """
+
+    MAGIC = b"TBLOG001"
+    _LEN = struct.Struct("<I")
+
+    def __init__(self, path: str, max_bytes: int = 64 << 20, backups: int = 5):
+        self._path = Path(path)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._backups = backups
+        self._file = None
+        self._open()
+
+    def _open(self):
+        self._file = open(self._path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(self.MAGIC)
+
+    def _rotate(self):
+        self._file.close()
+        for i in range(self._backups - 1, 0, -1):
+            src = self._path.with_name(f"{self._path.name}.{i}")
+            if src.exists():
+                src.replace(self._path.with_name(f"{self._path.name}.{i + 1}"))
+        if self._backups:
+            self._path.replace(self._path.with_name(f"{self._path.name}.1"))
+        else:
+            self._path.unlink()
+        self._open()
+
+    def ship(self, records: List[LogRecord], raw: List[bytes]):
+        self._file.write(b"".join(self._LEN.pack(len(data)) + data for data in raw))
+        self._file.flush()
+        if self._file.tell() >= self._max_bytes:
+            self._rotate()
+
+    @classmethod
+    def read(cls, path: str) -> List[bytes]:
+        data = Path(path).read_bytes()
+        if not data.startswith(cls.MAGIC):
+            raise ValueError(f"{path} is not a binary log file")
+        messages = []
+        offset = len(cls.MAGIC)
+        while offset + 4 <= len(data):
+            (size,) = cls._LEN.unpack_from(data, offset)
+            if offset + 4 + size > len(data):
+                break  # torn tail
+            messages.append(data[offset + 4 : offset + 4 + size])
+            offset += 4 + size
+        return messages
+
+    def close(self):
+        self._file.close()
+
+
+class BinaryLog:
+    """
+    Writes `LogRecord`s into a `SegmentRing`, shipped by a background thread every
+    `flush_interval` seconds. When the ring is full records are dropped and counted
+    rather than blocking the caller.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        shippers: Sequence[Shipper] = (),
+        capacity: int = 1 << 22,
+        flush_interval: float = 0.2,
+    ):
+        self._ring = SegmentRing(path, capacity)
+        if self._ring.crashed:
+            print(
+                f"BinaryLog: unshipped records of a previous run kept in {self._ring.crashed}",
+                file=sys.stderr,
+            )
+        self._shippers = list(shippers)
+        self._flush_interval = flush_interval
+        # the ring has a single producer and a single consumer side, one lock each
+        self._lock = threading.Lock()
+        self._ship_lock = threading.Lock()
+        self._stop = threading.Event()
+        self.written = 0
+        self.dropped = 0
+        self.ship_errors = 0
+        self._thread = threading.Thread(target=self._run, name="BinaryLog", daemon=True)
+        self._thread.start()
+
+    @property
+    def crashed(self) -> Path | None:
+        """Where the unshipped records of a crashed previous run were moved, if any."""
+        return self._ring.crashed
+
+    def write(self, level: str, logger: str, msg: str, args: tuple = ()):
+        data = _encoder.encode(LogRecord(time.time_ns(), level, logger, msg, args))
+        with self._lock:
+            if self._stop.is_set():
+                return
+            if self._ring.put(data):
+                self.written += 1
+            else:
+                self.dropped += 1
+
+    def _ship(self):
+        raw = self._ring.drain()
+        if not raw:
+            return
+        records = [_decoder.decode(data) for data in raw]
+        for shipper in self._shippers:
+            try:
+                shipper.ship(records, raw)
+            except Exception as e:
+                self.ship_errors += 1
+                print(f"BinaryLog: {type(shipper).__name__} failed: {e}", file=sys.stderr)
+
+    def _run(self):
+        while not self._stop.wait(self._flush_interval):
+            with self._ship_lock:
+                self._ship()
+
+    def flush(self):
+        """
+        Ship what is in the ring now, on the calling thread.
+        """
+        if not self._stop.is_set():
+            with self._ship_lock:
+                self._ship()
+
+    def close(self):
+        with self._lock:
+            self._stop.set()
+        self._thread.join()
+        self._ship()
+        for shipper in self._shippers:
+            shipper.close()
+        self._ring.close()
+
+
+def decode_file(path: str) -> Iterator[LogRecord]:
+    """
+    Records of a segment or of a rotated binary log file.
+    """
+    with open(path, "rb") as f:
+        head = f.read(64)
+    if head.startswith(FileShipper.MAGIC):
+        messages = FileShipper.read(path)
+    else:
+        messages = SegmentRing.read(path)
+    for data in messages:
+        yield _decoder.decode(data)
+
+
+def main(argv: List[str] = None):
+    parser = argparse.ArgumentParser(description="Decode binary log files to text")
+    parser.add_argument("files", nargs="+", help="segment or rotated binary log files")
+    args = parser.parse_args(argv)
+    for path in args.files:
+        for record in decode_file(path):
+            print(record.line())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""
+Compact storage format for the `Order` and `Position` kept in Redis.
+
+A record is a version byte followed by the struct as a msgpack array: field values
+in declaration order, trailing defaults left out and enums stored as small integers.
+Entries written as msgspec JSON by earlier versions start with `{` and still decode.
+
+    data = encode(order)  # b"\\x01\\x9a\\xa5bybit..."
+    order = decode(data, Order)
+"""
+
+from enum import Enum
+from typing import Any, Dict, List, Optional, Tuple, Type, Union, get_args, get_origin
+
+import msgspec
+
+from tradebot.constants import OrderSide, OrderStatus, OrderType, PositionSide, TimeInForce
+from tradebot.types import Order, Position
+
+VERSION = 1
+_VERSION = bytes([VERSION])
+_JSON = ord("{")
+
+# Integer codes of version 1. New members are appended after the listed ones, so
+# reordering the enums does not change the codes of existing records.
+ENUM_CODES: Dict[Type[Enum], Tuple[Enum, ...]] = {
+    OrderStatus: (
+        OrderStatus.FAILED,
+        OrderStatus.PENDING,
+        OrderStatus.CANCELING,
+        OrderStatus.AMENDING,
+        OrderStatus.ACCEPTED,
+        OrderStatus.PARTIALLY_FILLED,
+        OrderStatus.FILLED,
+        OrderStatus.CANCELED,
+        OrderStatus.EXPIRED,
+    ),
+    OrderType: (OrderType.LIMIT, OrderType.MARKET),
+    OrderSide: (OrderSide.BUY, OrderSide.SELL),
+    TimeInForce: (TimeInForce.GTC, TimeInForce.IOC, TimeInForce.FOK),
+    PositionSide: (PositionSide.LONG, PositionSide.SHORT, PositionSide.FLAT),
+}
+
+
+def _enum_members(enum_type: Type[Enum]) -> List[Enum]:
+    members = list(ENUM_CODES.get(enum_type, ()))
+    members.extend(m for m in enum_type if m not in members)
+    return members
+
+
+def _enum_type(annotation: Any) -> Optional[Type[Enum]]:
+    if isinstance(annotation, type) and issubclass(annotation, Enum):
+        return annotation
+    if get_origin(annotation) is Union:
+        for arg in get_args(annotation):
+            if isinstance(arg, type) and issubclass(arg, Enum):
+                return arg
+    return None
+
+
+class StructCodec:
+    """
+    Encodes one struct type as a versioned array-like msgpack record.
+    """
+
+    def __init__(self, struct_type: Type[msgspec.Struct]):
+        self.struct_type = struct_type
+        self._enums: List[Tuple[int, Dict[Enum, int], List[Enum]]] = []
+        # trailing fields equal to their default are left out of the record
+        self._defaults: List[Any] = []
+        record_fields = []
+        for i, field in enumerate(msgspec.structs.fields(struct_type)):
+            annotation = field.type
+            if enum_type := _enum_type(field.type):
+                members = _enum_members(enum_type)
+                self._enums.append((i, {m: c for c, m in enumerate(members)}, members))
+                annotation = Optional[int] if annotation is not enum_type else int
+            if field.default is not msgspec.NODEFAULT:
+                default = field.default
+                if isinstance(default, Enum):
+                    default = self._enums[-1][1][default]
+                record_fields.append((field.name, annotation, default))
+                self._defaults.append(default)
+            elif field.default_factory is not msgspec.NODEFAULT:
+                record_fields.append(
+                    (field.name, annotation, msgspec.field(default_factory=field.default_factory))
+                )
+                self._defaults.append(field.default_factory())
+            else:
+                record_fields.append((field.name, annotation))
+                self._defaults.append(msgspec.NODEFAULT)
+        self._record = msgspec.defstruct(
+            f"{struct_type.__name__}Record",
+            record_fields,
+            array_like=True,
+            gc=False,
+        )
+        self._encoder = msgspec.msgpack.Encoder()
+        self._decoder = msgspec.msgpack.Decoder(self._record)
+        self._json_decoder = msgspec.json.Decoder(struct_type)
+
+    def encode(self, obj: msgspec.Struct) -> bytes:
+        values = list(msgspec.structs.astuple(obj))
+        for i, codes, _ in self._enums:
+            if values[i] is not None:
+                values[i] = codes[values[i]]
+        n = len(values)
+        while n and values[n - 1] == self._defaults[n - 1]:
+            n -= 1
+        return _VERSION + self._encoder.encode(values[:n])
+
+    def decode(self, data: bytes) -> msgspec.Struct:
+        if data[0] == _JSON:
+            return self._json_decoder.decode(data)
+        if data[0] != VERSION:
+            raise ValueError(f"unknown {self.struct_type.__name__} record version {data[0]}")
+        values = list(msgspec.structs.astuple(self._decoder.decode(memoryview(data)[1:])))
+        for i, _, members in self._enums:
+            if values[i] is not None:
+                values[i] = members[values[i]]
+        return self.struct_type(*values)
+
+
+CODECS: Dict[type, StructCodec] = {
+    Order: StructCodec(Order),
+    Position: StructCodec(Position),
+}
+
+
+def encode(obj: Order | Position) -> bytes:
+    return CODECS[type(obj)].encode(obj)
+
+
+def decode(data: bytes, obj_type: Type[Order | Position]) -> Order | Position:
+    return CODECS[obj_type].decode(data)
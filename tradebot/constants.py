@@ -1,7 +1,8 @@
 import os
 from configparser import ConfigParser
 from typing import Literal, Union, Dict, List
-from enum import Enum
+from enum import Enum, IntEnum
+from tradebot.log import SpdLog
 
 if not os.path.exists(".keys/"):
     os.makedirs(".keys/")
@@ -12,6 +13,8 @@ if not os.path.exists(".keys/config.cfg"):
 
 CONFIG = ConfigParser()
 CONFIG.read(".keys/config.cfg")
+# [log] / [log.<name>] sections set logger levels and flushing
+SpdLog.configure(CONFIG)
 
 
 def get_redis_config(in_docker: bool = False):
@@ -170,6 +173,8 @@ class EventType(Enum):
     MARK_PRICE = 3
     FUNDING_RATE = 4
     INDEX_PRICE = 5
+    TRADE_BATCH = 6  # List[Trade] of one ws frame
+    POSITION_DRIFT = 7
 
 
 class OrderStatus(Enum):
@@ -180,6 +185,7 @@ class OrderStatus(Enum):
     # IN-FLOW
     PENDING = "PENDING"
     CANCELING = "CANCELING"
+    AMENDING = "AMENDING"
 
     # OPEN
     ACCEPTED = "ACCEPTED"
@@ -191,6 +197,23 @@ class OrderStatus(Enum):
     EXPIRED = "EXPIRED"
 
 
+class RequestPriority(IntEnum):
+    """
+    Lower value is served first when requests queue on a rate limit.
+    """
+
+    CANCEL = 0
+    AMEND = 1
+    NEW = 2
+    QUERY = 3
+
+
+class ExecutionStatus(Enum):
+    RUNNING = "RUNNING"
+    FINISHED = "FINISHED"
+    CANCELED = "CANCELED"
+
+
 class ExchangeType(Enum):
     BINANCE = 0
     OKX = 1
@@ -387,7 +410,18 @@ STATUS_TRANSITIONS: Dict[OrderStatus, List[OrderStatus]] = {
         OrderStatus.PARTIALLY_FILLED,
         OrderStatus.FILLED,
     ],
+    OrderStatus.AMENDING: [
+        OrderStatus.AMENDING,
+        OrderStatus.ACCEPTED,
+        OrderStatus.PARTIALLY_FILLED,
+        OrderStatus.FILLED,
+        OrderStatus.CANCELING,
+        OrderStatus.CANCELED,
+        OrderStatus.EXPIRED,
+    ],
     OrderStatus.ACCEPTED: [
+        OrderStatus.ACCEPTED,  # amended on the exchange
+        OrderStatus.AMENDING,
         OrderStatus.PARTIALLY_FILLED,
         OrderStatus.FILLED,
         OrderStatus.CANCELING,
@@ -396,6 +430,7 @@ STATUS_TRANSITIONS: Dict[OrderStatus, List[OrderStatus]] = {
     ],
     OrderStatus.PARTIALLY_FILLED: [
         OrderStatus.PARTIALLY_FILLED,
+        OrderStatus.AMENDING,
         OrderStatus.FILLED,
         OrderStatus.CANCELING,
         OrderStatus.CANCELED,
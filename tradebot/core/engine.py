@@ -4,7 +4,7 @@ import uvloop
 from typing import List
 
 from tradebot.base import PublicConnector, PrivateConnector
-from tradebot.core import Strategy
+from tradebot.core.strategy import Strategy
 
 
 class Engine:
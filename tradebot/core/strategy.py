@@ -1,33 +1,40 @@
 import asyncio
-from typing import Dict
+from typing import Dict, List
 from decimal import Decimal
 from typing import Literal
 from tradebot.log import SpdLog
 from tradebot.constants import EventType, AccountType, OrderStatus
 from tradebot.base import Clock, PublicConnector, PrivateConnector, TaskManager
 from tradebot.entity import EventSystem
-from tradebot.types import BookL1, Trade, Kline, Order, MarketData
+from tradebot.types import BookL1, Trade, Kline, Order, MarketData, PositionDrift
 from tradebot.constants import OrderSide, OrderType, TimeInForce, PositionSide
+from tradebot.execution import ExecutionEngine, ExecAlgorithm, ParentOrder
 
 
 class Strategy:
-    def __init__(self, tick_size=0.01):
+    def __init__(self, tick_size=0.01, market_data: MarketData = None):
+        """
+        :param market_data: Where market data is read from, e.g. a `SharedMarketData` fed
+            by a market data daemon. By default the strategy keeps its own.
+        """
         self.log = SpdLog.get_logger(name = type(self).__name__, level = "DEBUG", flush = True)
         self._pulic_connectors: Dict[AccountType, PublicConnector] = {}
         self._private_connectors: Dict[AccountType, PrivateConnector] = {}
         self._clock = Clock(tick_size=tick_size)
-        self._market_data: MarketData = MarketData()
+        self._market_data: MarketData = market_data or MarketData()
         self._subscribed_pairs = set() # Store (exchange_id, symbol, data_type) tuples
         self._ready = False
         self._task_manager = TaskManager()
         self._clock.add_tick_callback(self._on_tick)
-        EventSystem.on(EventType.TRADE, self._on_trade)
+        self._execution = ExecutionEngine(self._clock, self._market_data)
+        EventSystem.on(EventType.TRADE_BATCH, self._on_trade_batch)
         EventSystem.on(EventType.BOOKL1, self._on_bookl1)
         EventSystem.on(EventType.KLINE, self._on_kline)
         EventSystem.on(OrderStatus.ACCEPTED, self._on_accepted_order)
         EventSystem.on(OrderStatus.PARTIALLY_FILLED, self._on_partially_filled_order)
         EventSystem.on(OrderStatus.FILLED, self._on_filled_order)
         EventSystem.on(OrderStatus.CANCELED, self._on_canceled_order)
+        EventSystem.on(EventType.POSITION_DRIFT, self._on_position_drift)
     
     @property
     def ready(self):
@@ -73,6 +80,35 @@ class Strategy:
         params.update(kwargs)
         return await self._private_connectors[account_type].cancel_order(**params)
 
+    async def amend_order(
+        self,
+        account_type: AccountType,
+        symbol: str,
+        order_id: str,
+        price: Decimal = None,
+        amount: Decimal = None,
+        **kwargs,
+    ):
+        params = {
+            "symbol": symbol,
+            "order_id": order_id,
+            "price": price,
+            "amount": amount,
+        }
+        params.update(kwargs)
+        return await self._private_connectors[account_type].amend_order(**params)
+
+    def execute(self, account_type: AccountType, algorithm: ExecAlgorithm) -> ParentOrder:
+        """
+        Start an execution algorithm (TWAP, VWAP, POV) on the private connector of
+        `account_type`. `await algorithm.wait()` returns the finished `ParentOrder`.
+        """
+        return self._execution.submit(algorithm, self._private_connectors[account_type])
+
+    @property
+    def execution(self) -> ExecutionEngine:
+        return self._execution
+
     def price_to_precision(
         self,
         account_type: AccountType,
@@ -97,9 +133,25 @@ class Strategy:
 
     def add_public_connector(self, connector: PublicConnector):
         self._pulic_connectors[connector.account_type] = connector
+        self._share_clock_sync()
 
     def add_private_connector(self, connector: PrivateConnector):
         self._private_connectors[connector.account_type] = connector
+        self._share_clock_sync()
+
+    def _share_clock_sync(self):
+        """
+        Measure the feed latency of the public connectors against the clock offset the
+        private connector of the same exchange keeps in sync.
+        """
+        clock_syncs = {
+            account_type.exchange_id: connector.clock_sync
+            for account_type, connector in self._private_connectors.items()
+        }
+        for account_type, connector in self._pulic_connectors.items():
+            clock_sync = clock_syncs.get(account_type.exchange_id)
+            if clock_sync is not None:
+                connector.set_clock_sync(clock_sync)
 
     async def subscribe_bookl1(self, type: AccountType, symbol: str):
         self._subscribed_pairs.add((type.exchange_id, symbol, "bookl1"))
@@ -172,16 +224,28 @@ class Strategy:
         if hasattr(self, "on_canceled_order"):
             self.on_canceled_order(order)
 
+    def _on_position_drift(self, drift: PositionDrift):
+        if hasattr(self, "on_position_drift"):
+            self.on_position_drift(drift)
+
     def get_bookl1(self, exchange: str, symbol: str):
         return self._market_data.bookl1[exchange][symbol]
     
     def get_trade(self, exchange: str, symbol: str):
         return self._market_data.trade[exchange][symbol]
 
-    def _on_trade(self, trade: Trade):
-        self._market_data.update_trade(trade)
-        if hasattr(self, "on_trade"):
-            self.on_trade(trade)
+    def _on_trade_batch(self, trades: List[Trade]):
+        """
+        Strategies may define `on_trade_batch(trades)` to get the trades of a frame at once,
+        otherwise `on_trade(trade)` is called for each trade.
+        """
+        for trade in trades:
+            self._market_data.update_trade(trade)
+        if hasattr(self, "on_trade_batch"):
+            self.on_trade_batch(trades)
+        elif hasattr(self, "on_trade"):
+            for trade in trades:
+                self.on_trade(trade)
 
     def _on_bookl1(self, bookl1: BookL1):
         self._market_data.update_bookl1(bookl1)
@@ -1,9 +1,13 @@
+import os
 import asyncio
+import inspect
 import socket
+import time
 
 from collections import defaultdict
-from typing import Callable, Optional, Type
-from typing import Dict, List, Any, Set
+from decimal import Decimal
+from typing import Callable, Optional, Type, Awaitable, Hashable, Literal, Tuple
+from typing import Dict, List, Any, Set, Iterable
 
 import redis
 import msgspec
@@ -14,6 +18,7 @@ from tradebot.constants import STATUS_TRANSITIONS
 from tradebot.constants import OrderStatus, AccountType
 from tradebot.types import Order
 from tradebot.log import SpdLog
+from tradebot import codec
 
 from tradebot.core.nautilius_core import LiveClock
 
@@ -43,6 +48,144 @@ class TaskManager:
         await asyncio.gather(*self._tasks, return_exceptions=True)
 
 
+class ListenerStats(msgspec.Struct):
+    """
+    Counters of an `AsyncListener`, lag is the time in ms between emit and the start of
+    the callback.
+    """
+
+    received: int = 0
+    processed: int = 0
+    dropped: int = 0
+    errors: int = 0
+    lag_ms: float = 0.0
+    max_lag_ms: float = 0.0
+    last_error: str | None = None
+
+
+class AsyncListener:
+    """
+    Runs a coroutine listener off the emit path. `emit` only enqueues, so a slow listener
+    never blocks the connector or the other listeners.
+
+    - ordering="sequential": events are processed one at a time in emit order. With `key`,
+      ordering holds per key (e.g. per symbol) and different keys run concurrently.
+    - ordering="concurrent": every event runs as its own task.
+    - ordering="latest": like "sequential", but only the newest event waits behind the
+      running one and replaces any older waiting event, for snapshots where only the
+      current state matters. Replaced events count as dropped.
+
+    At most `maxsize` events are queued (or in flight for "concurrent"); beyond that new
+    events are dropped and counted. Exceptions are logged and counted, not swallowed.
+    """
+
+    def __init__(
+        self,
+        callback: Callable[..., Awaitable],
+        ordering: Literal["sequential", "concurrent", "latest"] = "sequential",
+        key: Optional[Callable[..., Hashable]] = None,
+        maxsize: int = 1000,
+    ):
+        if ordering not in ("sequential", "concurrent", "latest"):
+            raise ValueError(f"Unknown ordering: {ordering}")
+        self.callback = callback
+        self.name = getattr(callback, "__qualname__", repr(callback))
+        self.ordering = ordering
+        self.stats = ListenerStats()
+        self._key = key
+        self._maxsize = 1 if ordering == "latest" else maxsize
+        self._queues: Dict[Hashable, asyncio.Queue] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._in_flight = 0
+        self._log = SpdLog.get_logger(
+            name=type(self).__name__, level="INFO", flush=True
+        )
+
+    @property
+    def queued(self) -> int:
+        if self.ordering == "concurrent":
+            return self._in_flight
+        return sum(q.qsize() for q in self._queues.values())
+
+    def __call__(self, *args: Any, **kwargs: Any):
+        self.stats.received += 1
+        item = (time.monotonic(), args, kwargs)
+        if self.ordering == "concurrent":
+            if self._in_flight >= self._maxsize:
+                self._drop()
+                return
+            self._in_flight += 1
+            self._spawn(self._run_one(item))
+            return
+
+        key = self._key(*args, **kwargs) if self._key else None
+        queue = self._queues.get(key)
+        if queue is None:
+            queue = self._queues[key] = asyncio.Queue(self._maxsize)
+            self._spawn(self._worker(queue))
+        try:
+            queue.put_nowait(item)
+        except asyncio.QueueFull:
+            if self.ordering != "latest":
+                self._drop()
+                return
+            # superseded, expected rather than a sign of lag
+            queue.get_nowait()
+            queue.task_done()
+            queue.put_nowait(item)
+            self.stats.dropped += 1
+
+    def _drop(self):
+        self.stats.dropped += 1
+        if self.stats.dropped % 100 == 1:
+            self._log.warn(f"{self.name} is lagging, dropped {self.stats.dropped} events")
+
+    def _spawn(self, coro):
+        task = asyncio.get_running_loop().create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _invoke(self, item: tuple):
+        ts, args, kwargs = item
+        lag = (time.monotonic() - ts) * 1000
+        self.stats.lag_ms = lag
+        if lag > self.stats.max_lag_ms:
+            self.stats.max_lag_ms = lag
+        try:
+            await self.callback(*args, **kwargs)
+            self.stats.processed += 1
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.stats.errors += 1
+            self.stats.last_error = repr(e)
+            self._log.error(f"Error in listener {self.name}: {e}")
+
+    async def _worker(self, queue: asyncio.Queue):
+        while True:
+            item = await queue.get()
+            await self._invoke(item)
+            queue.task_done()
+
+    async def _run_one(self, item: tuple):
+        try:
+            await self._invoke(item)
+        finally:
+            self._in_flight -= 1
+
+    async def join(self):
+        """Wait until every queued event has been processed."""
+        for queue in list(self._queues.values()):
+            await queue.join()
+        while self._in_flight:
+            await asyncio.sleep(0)
+
+    async def close(self):
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+
 class EventSystem:
     _listeners: Dict[str, List[Callable]] = defaultdict(list)
 
@@ -72,6 +215,51 @@ class EventSystem:
         cls._listeners[event].append(callback)
         return callback  # Optionally return the callback for chaining
 
+    @classmethod
+    def on_async(
+        cls,
+        event: str,
+        callback: Optional[Callable[..., Awaitable]] = None,
+        ordering: Literal["sequential", "concurrent", "latest"] = "sequential",
+        key: Optional[Callable[..., Hashable]] = None,
+        maxsize: int = 1000,
+    ):
+        """
+        Register a coroutine listener that runs as a task behind a bounded queue, see
+        `AsyncListener`. Can be used as a decorator or as a direct method.
+
+        Usage:
+            EventSystem.on_async(EventType.TRADE, on_trade, key=lambda trade: trade.symbol)
+        """
+        if callback is None:
+
+            def decorator(fn: Callable[..., Awaitable]):
+                cls.on_async(event, fn, ordering, key, maxsize)
+                return fn
+
+            return decorator
+
+        listener = AsyncListener(callback, ordering, key, maxsize)
+        cls._listeners[event].append(listener)
+        return listener
+
+    @classmethod
+    def listener_stats(cls) -> Dict[str, ListenerStats]:
+        """Lag, drop and error counters of every async listener, by `event:listener`."""
+        return {
+            f"{event}:{listener.name}": listener.stats
+            for event, listeners in cls._listeners.items()
+            for listener in listeners
+            if isinstance(listener, AsyncListener)
+        }
+
+    @classmethod
+    def has_listeners(cls, event: str) -> bool:
+        """
+        Whether anyone listens to `event`, lets emitters skip building payloads nobody reads.
+        """
+        return bool(cls._listeners.get(event))
+
     @classmethod
     def emit(cls, event: str, *args: Any, **kwargs: Any):
         """
@@ -94,7 +282,9 @@ class EventSystem:
         :param kwargs: Keyword arguments to pass to the listeners.
         """
         for callback in cls._listeners.get(event, []):
-            await callback(*args, **kwargs)
+            res = callback(*args, **kwargs)
+            if inspect.isawaitable(res):
+                await res
 
 
 class RedisClient:
@@ -124,6 +314,40 @@ class RedisClient:
         return redis.asyncio.Redis(**cls._get_params())
 
 
+class ClientOrderIdGenerator:
+    """
+    Compact, monotonic client order ids: `prefix` followed by the microseconds since the
+    epoch in base 36, moved one microsecond on when two ids would collide. Letters and
+    digits only, valid as Bybit `orderLinkId`, OKX `clOrdId` and Binance
+    `newClientOrderId`.
+    """
+
+    _DIGITS = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+    def __init__(self, prefix: str = "t", width: int = 11):
+        self._prefix = prefix
+        self._width = width
+        self._last = 0
+
+    def next(self) -> str:
+        n = max(time.time_ns() // 1000, self._last + 1)
+        self._last = n
+        chars = []
+        while n:
+            n, r = divmod(n, 36)
+            chars.append(self._DIGITS[r])
+        return self._prefix + "".join(reversed(chars)).rjust(self._width, "0")
+
+
+class CacheWarmup(msgspec.Struct):
+    orders: int
+    open_orders: int
+    positions: int
+    elapsed_ms: float
+    # entries that could not be decoded and were left in Redis
+    skipped: int = 0
+
+
 class AsyncCache:
     def __init__(
         self,
@@ -137,9 +361,7 @@ class AsyncCache:
         self.user_id = user_id
         self.account_type = account_type
 
-        self._log = SpdLog.get_logger(
-            name=type(self).__name__, level="DEBUG", flush=True
-        )
+        self._log = SpdLog.get_logger(name=type(self).__name__)
         self._clock = LiveClock()
         self._r = RedisClient.get_async_client()
         self._orders_key = f"strategy:{strategy_id}:user_id:{user_id}:account_type:{account_type}:orders"
@@ -158,6 +380,11 @@ class AsyncCache:
             set
         )  # symbol -> set(order_id)
         self._mem_symbol_positions: Dict[str, Position] = {}  # symbol -> Position
+        # orders registered before they were sent, until the exchange assigns an id
+        self._mem_client_orders: Dict[str, Order] = {}  # client_order_id -> Order
+        self._mem_client_order_ids: Dict[str, str] = {}  # client_order_id -> order_id
+        # once every position in Redis is in memory a miss means there is no position
+        self._positions_loaded = False
 
         # set params
         self._sync_interval = sync_interval  # sync interval
@@ -167,15 +394,89 @@ class AsyncCache:
         self._task_manager = TaskManager()
 
     def _encode(self, obj: Order | Position) -> bytes:
-        return msgspec.json.encode(obj)
+        return codec.encode(obj)
 
     def _decode(
         self, data: bytes, obj_type: Type[Order | Position]
     ) -> Order | Position:
-        return msgspec.json.decode(data, type=obj_type)
+        return codec.decode(data, obj_type)
 
-    async def sync(self):
+    async def sync(self) -> CacheWarmup:
+        """
+        Warm the memory from Redis, then write it back every `sync_interval` seconds.
+        """
+        warmup = await self.warm_up()
         self._task_manager.create_task(self._periodic_sync())
+        return warmup
+
+    async def warm_up(self, batch_size: int = 1000) -> CacheWarmup:
+        """
+        Load the recent and the open orders and all positions in bulk instead of one
+        key per first access: HSCAN of the orders hash, SSCAN of the open order set and
+        SCAN + MGET of the position keys.
+        Orders older than `expire_time` are left in Redis unless still open.
+        """
+        start = time.perf_counter()
+        open_ids = {
+            order_id.decode() if isinstance(order_id, bytes) else order_id
+            async for order_id in self._r.sscan_iter(
+                self._open_orders_key, count=batch_size
+            )
+        }
+
+        expire_before = self._clock.timestamp_ms() - self._expire_time * 1000
+        order_codec = codec.CODECS[Order]
+        batch = []
+        orders = 0
+        skipped = 0
+
+        def load(batch: List[Tuple[bytes, bytes]]) -> int:
+            nonlocal skipped
+            loaded = 0
+            for key, raw in batch:
+                try:
+                    order = order_codec.decode(raw)
+                except Exception as e:
+                    skipped += 1
+                    self._log.error(f"Skipping undecodable order {key!r} in Redis: {e!r}")
+                    continue
+                if order.timestamp < expire_before and order.id not in open_ids:
+                    continue
+                # updates received since connecting are newer
+                if order.id in self._mem_orders:
+                    continue
+                self._mem_orders[order.id] = order
+                self._mem_symbol_orders[order.symbol].add(order.id)
+                if order.client_order_id:
+                    self._mem_client_order_ids[order.client_order_id] = order.id
+                if order.id in open_ids:
+                    self._mem_open_orders.add(order.id)
+                    self._mem_symbol_open_orders[order.symbol].add(order.id)
+                loaded += 1
+            return loaded
+
+        async for key, raw in self._r.hscan_iter(self._orders_key, count=batch_size):
+            batch.append((key, raw))
+            if len(batch) == batch_size:
+                orders += load(batch)
+                batch = []
+        if batch:
+            orders += load(batch)
+
+        positions, skipped_positions = await self._preload_positions(batch_size)
+        warmup = CacheWarmup(
+            orders=orders,
+            open_orders=len(self._mem_open_orders),
+            positions=positions,
+            elapsed_ms=(time.perf_counter() - start) * 1000,
+            skipped=skipped + skipped_positions,
+        )
+        self._log.info(
+            f"Cache warmed up in {warmup.elapsed_ms:.1f}ms: {warmup.orders} orders, "
+            f"{warmup.open_orders} open, {warmup.positions} positions, "
+            f"{warmup.skipped} skipped"
+        )
+        return warmup
 
     async def _periodic_sync(self):
         while not self._shutdown_event.is_set():
@@ -222,29 +523,128 @@ class AsyncCache:
             if order.timestamp < expire_before
         ]
         for order_id in expired_orders:
-            del self._mem_orders[order_id]
+            order = self._mem_orders.pop(order_id)
+            if order.client_order_id:
+                self._mem_client_order_ids.pop(order.client_order_id, None)
             self._log.debug(f"removing order {order_id} from memory")
             for symbol, order_set in self._mem_symbol_orders.copy().items():
                 self._log.debug(f"removing order {order_id} from symbol {symbol}")
                 order_set.discard(order_id)
 
-    def _check_status_transition(self, order: Order):
-        previous_order = self._mem_orders.get(order.id)
-        if not previous_order:
-            return True
+    _CLOSED = (
+        OrderStatus.FILLED,
+        OrderStatus.CANCELED,
+        OrderStatus.EXPIRED,
+        OrderStatus.FAILED,
+    )
+    # reported by the exchange, as opposed to the acknowledgements of our own requests
+    _EXCHANGE_STATES = (
+        OrderStatus.ACCEPTED,
+        OrderStatus.PARTIALLY_FILLED,
+        OrderStatus.FILLED,
+        OrderStatus.CANCELED,
+        OrderStatus.EXPIRED,
+        OrderStatus.FAILED,
+    )
+
+    def _merge(self, order: Order) -> Optional[Order]:
+        """
+        The state to keep for an order update, None if the cached state is fresher.
+
+        A closed order stays closed and the cumulative filled quantity never goes back,
+        so the update that filled more wins. Otherwise the update has to be a valid
+        status transition, and between exchange reported states the later update time
+        wins, which also moves an order out of `CANCELING` or `AMENDING` when the
+        exchange reports it live again. An `AMENDING` acknowledgement, stamped with the
+        time the amend was sent, is dropped when the exchange reported the order since.
+        """
+        previous = self._mem_orders.get(order.id)
+        if not previous and order.client_order_id:
+            previous = self._mem_client_orders.get(order.client_order_id)
+        if not previous:
+            return order
 
-        if order.status not in STATUS_TRANSITIONS[previous_order.status]:
-            self._log.error(
-                f"Invalid status transition: {previous_order.status} -> {order.status}"
+        if order.amount is None:
+            # status only acknowledgements of the REST api keep the known fields
+            order = msgspec.structs.replace(
+                previous,
+                id=order.id,
+                status=order.status,
+                timestamp=order.timestamp or previous.timestamp,
             )
-            return False
 
-        return True
+        if previous.status in self._CLOSED:
+            return None
+        if order.filled is not None and previous.filled is not None:
+            if order.filled > previous.filled:
+                return order
+            if order.filled < previous.filled:
+                return None
+
+        exchange_reported = order.status in self._EXCHANGE_STATES
+        if previous.status == OrderStatus.PENDING and exchange_reported:
+            return order
+        timed = bool(order.timestamp and previous.timestamp)
+        if (
+            timed
+            and order.status == OrderStatus.AMENDING
+            and previous.status in self._EXCHANGE_STATES
+            and order.timestamp <= previous.timestamp
+        ):
+            return None
+        if order.status in STATUS_TRANSITIONS[previous.status]:
+            if (
+                timed
+                and exchange_reported
+                and previous.status in self._EXCHANGE_STATES
+                and order.timestamp < previous.timestamp
+            ):
+                return None
+            return order
+        if timed and exchange_reported and order.timestamp > previous.timestamp:
+            return order
+        return None
+
+    async def preload_positions(self, batch_size: int = 500) -> int:
+        """
+        Load the positions of every symbol from Redis, so `apply_position` never waits on
+        Redis afterwards. Returns the number of positions loaded.
+        """
+        positions, _ = await self._preload_positions(batch_size)
+        return positions
+
+    async def _preload_positions(self, batch_size: int) -> Tuple[int, int]:
+        keys = [
+            key
+            async for key in self._r.scan_iter(
+                match=f"{self._symbol_positions_key}:*", count=batch_size
+            )
+        ]
+        prefix = len(self._symbol_positions_key) + 1
+        loaded = skipped = 0
+        for i in range(0, len(keys), batch_size):
+            batch = keys[i : i + batch_size]
+            for key, data in zip(batch, await self._r.mget(batch)):
+                if data is None:
+                    continue
+                if isinstance(key, bytes):
+                    key = key.decode()
+                try:
+                    position = self._decode(data, Position)
+                except Exception as e:
+                    skipped += 1
+                    self._log.error(f"Skipping undecodable position {key!r} in Redis: {e!r}")
+                    continue
+                # positions updated in memory since connecting are newer
+                self._mem_symbol_positions.setdefault(key[prefix:], position)
+                loaded += 1
+        self._positions_loaded = True
+        return loaded, skipped
 
     async def apply_position(self, order: Order):
         symbol = order.symbol
         if symbol not in self._mem_symbol_positions:
-            position = await self.get_position(symbol)
+            position = None if self._positions_loaded else await self.get_position(symbol)
             if not position:
                 position = Position(
                     symbol=symbol,
@@ -257,16 +657,28 @@ class AsyncCache:
             OrderStatus.PARTIALLY_FILLED,
             OrderStatus.CANCELED,
         ):
-            self._log.debug(
-                f"POSITION UPDATED: status {order.status} order_id {order.id} side {order.side} filled: {order.filled} amount: {order.amount} reduceOnly: {order.reduce_only}"
-            )
+            if self._log.debug_enabled:
+                self._log.debug(
+                    f"POSITION UPDATED: status {order.status} order_id {order.id} side {order.side} filled: {order.filled} amount: {order.amount} reduceOnly: {order.reduce_only}"
+                )
             self._mem_symbol_positions[symbol].apply(order)
 
+    def get_mem_position(self, symbol: str) -> Optional[Position]:
+        """The position of a symbol held in memory, None if it is not loaded."""
+        return self._mem_symbol_positions.get(symbol)
+
+    def position_updated(self, position: Position):
+        """Replace the in-memory position of its symbol with one computed elsewhere."""
+        self._mem_symbol_positions[position.symbol] = position
+
     async def get_position(self, symbol: str) -> Position:
         # First try memory
         if position := self._mem_symbol_positions.get(symbol):
             return position
 
+        if self._positions_loaded:
+            return None
+
         # Then try Redis
         key = f"{self._symbol_positions_key}:{symbol}"
         if position_data := await self._r.get(key):
@@ -276,26 +688,68 @@ class AsyncCache:
 
         return None
 
-    def order_initialized(self, order: Order):
-        if not self._check_status_transition(order):
+    async def get_positions(self, symbols: Iterable[str] = ()) -> Dict[str, Position]:
+        """
+        The positions held in memory, plus those of `symbols` that are only in Redis.
+        """
+        for symbol in symbols:
+            if symbol not in self._mem_symbol_positions:
+                await self.get_position(symbol)
+        return dict(self._mem_symbol_positions)
+
+    def order_registered(self, order: Order):
+        """
+        Register a new order by its `client_order_id` before the request is sent, so the
+        exchange updates that arrive ahead of the REST response are applied right away.
+        """
+        self._mem_client_orders[order.client_order_id] = order
+
+    def order_unregistered(self, client_order_id: str):
+        """Drop a registered order that was never placed."""
+        self._mem_client_orders.pop(client_order_id, None)
+
+    def _link_client_order(self, order: Order):
+        client_order_id = order.client_order_id
+        if not client_order_id:
             return
+        self._mem_client_order_ids[client_order_id] = order.id
+        if self._mem_client_orders.pop(client_order_id, None):
+            self._mem_open_orders.add(order.id)
+            self._mem_symbol_orders[order.symbol].add(order.id)
+            self._mem_symbol_open_orders[order.symbol].add(order.id)
+
+    def order_initialized(self, order: Order) -> bool:
+        if order.id in self._mem_orders:
+            # the REST response came after the exchange updates of the order
+            return False
+        self._link_client_order(order)
         self._mem_orders[order.id] = order
         self._mem_open_orders.add(order.id)
         self._mem_symbol_orders[order.symbol].add(order.id)
         self._mem_symbol_open_orders[order.symbol].add(order.id)
+        return True
 
-    def order_status_update(self, order: Order):
-        if not self._check_status_transition(order):
-            return
+    def order_status_update(self, order: Order) -> bool:
+        merged = self._merge(order)
+        if merged is None:
+            if self._log.debug_enabled:
+                self._log.debug(f"Stale order update dropped: {order}")
+            return False
 
-        self._mem_orders[order.id] = order
-        if order.status in (
-            OrderStatus.FILLED,
-            OrderStatus.CANCELED,
-            OrderStatus.EXPIRED,
-        ):
+        if order.id not in self._mem_orders:
+            self._link_client_order(order)
+        self._mem_orders[order.id] = merged
+        if order.status in self._CLOSED:
             self._mem_open_orders.discard(order.id)
             self._mem_symbol_open_orders[order.symbol].discard(order.id)
+        return True
+
+    def get_mem_order(self, order_id: str) -> Optional[Order]:
+        """
+        The merged state of an order held in memory, None if it is not loaded. Never
+        goes to Redis.
+        """
+        return self._mem_orders.get(order_id)
 
     async def get_order(self, order_id: str) -> Order:
         if order_id in self._mem_orders:
@@ -308,6 +762,15 @@ class AsyncCache:
             return order
         return None
 
+    def get_order_by_client_id(self, client_order_id: str) -> Optional[Order]:
+        """
+        The order of a client order id known to this process, the registered order while
+        the exchange did not assign an id yet.
+        """
+        if order_id := self._mem_client_order_ids.get(client_order_id):
+            return self._mem_orders.get(order_id)
+        return self._mem_client_orders.get(client_order_id)
+
     async def get_symbol_orders(self, symbol: str, in_mem: bool = True) -> Set[str]:
         """Get all orders for a symbol from memory and Redis"""
 
@@ -332,3 +795,164 @@ class AsyncCache:
         await self._sync_to_redis()
         await self._r.aclose()
         await self._task_manager.cancel()
+
+
+class _LedgerSnapshot(msgspec.Struct):
+    seq: int
+    positions: Dict[str, Decimal]
+
+
+class PositionLedger:
+    """
+    Crash safe store of signed position amounts by symbol, replaces pickling the whole
+    position dict after every order.
+
+    `set` and `add` update memory and queue a `[seq, symbol, amount]` record, they never
+    touch the disk. `run` appends the queued records and fsyncs them as one batch every
+    `flush_interval` seconds in a worker thread. Every `snapshot_every` records the state
+    is written to `{path}.snapshot` atomically (write, fsync, rename) and `{path}.log` is
+    truncated. `load` reads the snapshot and replays the newer log records, a torn last
+    record is cut off.
+    """
+
+    def __init__(
+        self, path: str, flush_interval: float = 1.0, snapshot_every: int = 10_000
+    ):
+        self._log = SpdLog.get_logger(
+            name=type(self).__name__, level="INFO", flush=True
+        )
+        self._log_path = f"{path}.log"
+        self._snapshot_path = f"{path}.snapshot"
+        self._flush_interval = flush_interval
+        self._snapshot_every = snapshot_every
+
+        self._positions: Dict[str, Decimal] = defaultdict(Decimal)
+        self._pending: List[bytes] = []
+        self._seq = 0
+        self._logged = 0  # records in the log since the last snapshot
+        self._encoder = msgspec.json.Encoder()
+        self._lock = asyncio.Lock()
+        self._shutdown_event = asyncio.Event()
+
+    @property
+    def positions(self) -> Dict[str, Decimal]:
+        return self._positions
+
+    def load(self) -> Dict[str, Decimal]:
+        """
+        Read the snapshot and the log, call once at startup before any update.
+        """
+        seq = 0
+        positions = {}
+        if os.path.exists(self._snapshot_path):
+            with open(self._snapshot_path, "rb") as f:
+                snapshot = msgspec.json.decode(f.read(), type=_LedgerSnapshot)
+            seq, positions = snapshot.seq, snapshot.positions
+
+        logged = 0
+        if os.path.exists(self._log_path):
+            decoder = msgspec.json.Decoder(Tuple[int, str, Decimal])
+            with open(self._log_path, "rb") as f:
+                data = f.read()
+            offset = 0
+            while offset < len(data):
+                end = data.find(b"\n", offset)
+                try:
+                    if end < 0:
+                        raise msgspec.DecodeError("missing newline")
+                    record_seq, symbol, amount = decoder.decode(data[offset:end])
+                except msgspec.DecodeError:
+                    self._log.warn(
+                        f"Dropping torn record at byte {offset} of {self._log_path}"
+                    )
+                    with open(self._log_path, "r+b") as f:
+                        f.truncate(offset)
+                    break
+                if record_seq > seq:
+                    positions[symbol] = amount
+                    seq = record_seq
+                logged += 1
+                offset = end + 1
+
+        self._positions.clear()
+        self._positions.update(positions)
+        self._seq = seq
+        self._logged = logged
+        return self._positions
+
+    def set(self, symbol: str, amount: Decimal):
+        amount = amount if isinstance(amount, Decimal) else Decimal(str(amount))
+        if symbol in self._positions and self._positions[symbol] == amount:
+            return
+        self._positions[symbol] = amount
+        self._seq += 1
+        self._pending.append(self._encoder.encode((self._seq, symbol, amount)) + b"\n")
+
+    def add(self, symbol: str, delta: Decimal):
+        self.set(symbol, self._positions[symbol] + delta)
+
+    def _append(self, data: bytes):
+        with open(self._log_path, "ab") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _write_snapshot(self, data: bytes):
+        tmp = f"{self._snapshot_path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._snapshot_path)
+        dir_fd = os.open(os.path.dirname(os.path.abspath(self._snapshot_path)), os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+        # records up to the snapshot seq are skipped on load anyway, so a crash before
+        # the truncate is harmless
+        with open(self._log_path, "wb"):
+            pass
+
+    async def flush(self):
+        async with self._lock:
+            if not self._pending:
+                return
+            pending, self._pending = self._pending, []
+            try:
+                await asyncio.to_thread(self._append, b"".join(pending))
+            except OSError:
+                self._pending[:0] = pending  # retried with the next flush
+                raise
+            self._logged += len(pending)
+            if self._logged >= self._snapshot_every:
+                await self._snapshot()
+
+    async def snapshot(self):
+        async with self._lock:
+            await self._snapshot()
+
+    async def _snapshot(self):
+        # the snapshot covers the queued records as well
+        data = msgspec.json.encode(
+            _LedgerSnapshot(seq=self._seq, positions=dict(self._positions))
+        )
+        pending, self._pending = self._pending, []
+        try:
+            await asyncio.to_thread(self._write_snapshot, data)
+        except OSError:
+            self._pending[:0] = pending
+            raise
+        self._logged = 0
+
+    async def run(self):
+        while not self._shutdown_event.is_set():
+            await asyncio.sleep(self._flush_interval)
+            try:
+                await self.flush()
+            except OSError as e:
+                self._log.error(f"Failed to flush position ledger: {e}")
+
+    async def close(self):
+        self._shutdown_event.set()
+        await self.snapshot()
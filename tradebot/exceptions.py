@@ -37,3 +37,17 @@ class PositionError(Exception):
     
     def __repr__(self):
         return self.__str__()
+
+class OrderClosedError(Exception):
+    """Raised by `OrderHandle` waits that can no longer be satisfied."""
+
+    def __init__(self, message: str, order):
+        self.message = message
+        self.order = order
+        super().__init__(message)
+
+    def __str__(self):
+        return f"{self.message}\nOrder: {self.order}"
+
+    def __repr__(self):
+        return self.__str__()
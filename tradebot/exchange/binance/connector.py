@@ -4,6 +4,7 @@ import orjson
 
 
 from typing import Dict, Any
+from collections import defaultdict
 from decimal import Decimal
 from tradebot.base import PublicConnector, PrivateConnector
 from tradebot.entity import EventSystem, AsyncCache
@@ -80,6 +81,8 @@ class BinancePublicConnector(PublicConnector):
 
     def _ws_msg_handler(self, msg):
         msg = orjson.loads(msg)
+        if "E" in msg:
+            self._record_latency(msg["E"])
         if "e" in msg:
             match msg["e"]:
                 case "trade":
@@ -135,7 +138,8 @@ class BinancePublicConnector(PublicConnector):
             volume=float(res["k"]["v"]),
             timestamp=res.get("E", time.time_ns() // 1_000_000),
         )
-        self._log.debug(f"{ticker}")
+        if self._log.debug_enabled:
+            self._log.debug(f"{ticker}")
         EventSystem.emit(EventType.KLINE, ticker)
 
     def _parse_trade(self, res: Dict[str, Any]) -> Trade:
@@ -171,8 +175,9 @@ class BinancePublicConnector(PublicConnector):
             size=float(res["q"]),
             timestamp=res.get("T", time.time_ns() // 1_000_000),
         )
-        self._log.debug(f"{trade}")
-        EventSystem.emit(EventType.TRADE, trade)
+        if self._log.debug_enabled:
+            self._log.debug(f"{trade}")
+        self._emit_trades([trade])
 
     def _parse_book_ticker(self, res: Dict[str, Any]) -> BookL1:
         """
@@ -197,7 +202,8 @@ class BinancePublicConnector(PublicConnector):
             ask_size=float(res["A"]),
             timestamp=res.get("T", time.time_ns() // 1_000_000),
         )
-        self._log.debug(f"{bookl1}")
+        if self._log.debug_enabled:
+            self._log.debug(f"{bookl1}")
         EventSystem.emit(EventType.BOOKL1, bookl1)
 
     def _parse_mark_price(self, res: Dict[str, Any]):
@@ -237,9 +243,10 @@ class BinancePublicConnector(PublicConnector):
             price=float(res["i"]),
             timestamp=res.get("E", time.time_ns() // 1_000_000),
         )
-        self._log.debug(f"{mark_price}")
-        self._log.debug(f"{funding_rate}")
-        self._log.debug(f"{index_price}")
+        if self._log.debug_enabled:
+            self._log.debug(f"{mark_price}")
+            self._log.debug(f"{funding_rate}")
+            self._log.debug(f"{index_price}")
         EventSystem.emit(EventType.MARK_PRICE, mark_price)
         EventSystem.emit(EventType.FUNDING_RATE, funding_rate)
         EventSystem.emit(EventType.INDEX_PRICE, index_price)
@@ -258,6 +265,8 @@ class BinancePrivateConnector(PrivateConnector):
         strategy_id: str = None,
         user_id: str = None,
         rate_limit: float = None,
+        reconcile_interval: float = None,
+        stream_maxlen: int = None,
     ):
         super().__init__(
             account_type=account_type,
@@ -273,12 +282,15 @@ class BinancePrivateConnector(PrivateConnector):
                 user_id=user_id,
             ),
             rate_limit=rate_limit,
+            reconcile_interval=reconcile_interval,
+            stream_maxlen=stream_maxlen,
         )
 
         self._api_client = BinanceApiClient(
             api_key=exchange.api_key,
             secret=exchange.secret,
             testnet=account_type.is_testnet,
+            account_type=account_type,
         )
 
     @property
@@ -335,6 +347,40 @@ class BinancePrivateConnector(PrivateConnector):
                     )
                     break
 
+    @property
+    def can_fetch_positions(self) -> bool:
+        return (
+            self._account_type.is_linear
+            or self._account_type.is_inverse
+            or self._account_type.is_portfolio_margin
+        )
+
+    async def fetch_positions(self) -> Dict[str, Decimal]:
+        if self._account_type.is_linear:
+            queries = [(self._api_client.get_fapi_v2_position_risk, "_linear")]
+        elif self._account_type.is_inverse:
+            queries = [(self._api_client.get_dapi_v1_position_risk, "_inverse")]
+        elif self._account_type.is_portfolio_margin:
+            queries = [
+                (self._api_client.get_papi_v1_um_position_risk, "_linear"),
+                (self._api_client.get_papi_v1_cm_position_risk, "_inverse"),
+            ]
+        else:
+            return await super().fetch_positions()
+
+        results = await asyncio.gather(*(query() for query, _ in queries))
+        positions = defaultdict(Decimal)
+        for (_, market_type), items in zip(queries, results):
+            for item in items:
+                # signed in one-way and hedge mode, hedge mode sides net out
+                amount = Decimal(item.positionAmt)
+                if not amount:
+                    continue
+                market = self._market_id.get(item.symbol + market_type)
+                if market is not None:
+                    positions[market.symbol] += amount
+        return dict(positions)
+
     async def connect(self):
         await super().connect()
         listen_key = await self._start_user_data_stream()
@@ -553,7 +599,7 @@ class BinancePrivateConnector(PrivateConnector):
             case "failed":
                 EventSystem.emit(OrderStatus.FAILED, order)
 
-    def create_order(
+    async def _create_order(
         self,
         symbol: str,
         side: OrderSide,
@@ -562,12 +608,95 @@ class BinancePrivateConnector(PrivateConnector):
         price: Decimal,
         time_in_force: TimeInForce,
         position_side: PositionSide,
+        client_order_id: str = None,
         **kwargs,
     ):
-        pass
+        # not implemented for Binance yet, reported as a failed order so the registered
+        # client order id is released
+        self._log.error(f"Creating orders is not supported yet, {symbol} order not sent")
+        return Order(
+            exchange=self._exchange_id,
+            client_order_id=client_order_id,
+            timestamp=self._clock.timestamp_ms(),
+            symbol=symbol,
+            type=type,
+            side=side,
+            amount=amount,
+            price=float(price) if price else None,
+            time_in_force=time_in_force,
+            position_side=position_side,
+            status=OrderStatus.FAILED,
+        )
 
-    def cancel_order(self, symbol: str, order_id: str, **kwargs):
-        pass
+    async def _cancel_order(self, symbol: str, order_id: str, **kwargs):
+        self._log.error(f"Canceling orders is not supported yet, {order_id} not canceled")
+        return Order(
+            exchange=self._exchange_id,
+            id=order_id,
+            timestamp=self._clock.timestamp_ms(),
+            symbol=symbol,
+            status=OrderStatus.FAILED,
+        )
+
+    async def _amend_order(
+        self,
+        symbol: str,
+        order_id: str,
+        price: Decimal = None,
+        amount: Decimal = None,
+        **kwargs,
+    ):
+        """
+        Binance only supports modifying LIMIT orders on futures, and requires side,
+        quantity and price on every request, so missing values come from the cache.
+        """
+        market = self._market.get(symbol)
+        if not market:
+            raise ValueError(f"Symbol {symbol} formated wrongly, or not supported")
+
+        params = {}
+        try:
+            if self._account_type.is_linear:
+                put_order = self._api_client.put_fapi_v1_order
+            elif self._account_type.is_inverse:
+                put_order = self._api_client.put_dapi_v1_order
+            else:
+                raise ValueError(
+                    f"Amend order is not supported for {self._account_type.value}"
+                )
+
+            previous = await self._cache.get_order(order_id)
+            if not previous:
+                raise ValueError(f"Order {order_id} not found in cache")
+
+            params = {
+                "symbol": market.id,
+                "orderId": order_id,
+                "side": previous.side.value,
+                "quantity": str(amount if amount is not None else previous.amount),
+                "price": str(price if price is not None else previous.price),
+                **kwargs,
+            }
+            res = await put_order(**params)
+            order = await self._amending_order(
+                symbol=symbol,
+                order_id=str(res.orderId),
+                price=price,
+                amount=amount,
+                client_order_id=res.clientOrderId,
+            )
+            self._oms.add_order_msg(order)
+            return order
+        except Exception as e:
+            self._log.error(f"Error amending order: {e} params: {str(params)}")
+            order = Order(
+                exchange=self._exchange_id,
+                id=order_id,
+                timestamp=self._clock.timestamp_ms(),
+                symbol=symbol,
+                status=OrderStatus.FAILED,
+            )
+            return order
 
     # async def place_market_order(
     #     self, symbol: str, side: Literal["buy", "sell"], amount: Decimal, **params
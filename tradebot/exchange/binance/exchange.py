@@ -11,10 +11,10 @@ class BinanceExchangeManager(ExchangeManager):
     market: Dict[str, BinanceMarket] 
     market_id: Dict[str, BinanceMarket]
     
-    def __init__(self, config: Dict[str, Any] = None):
+    def __init__(self, config: Dict[str, Any] = None, load_markets: bool = True):
         config = config or {}
         config["exchange_id"] = config.get("exchange_id", "binance")
-        super().__init__(config)
+        super().__init__(config, load_markets)
 
     def load_markets(self):
         market = self.api.load_markets()
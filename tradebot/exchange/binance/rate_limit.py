@@ -0,0 +1,93 @@
+from typing import Mapping
+
+from tradebot.constants import RequestPriority
+from tradebot.rate_limit import RateLimiter
+
+
+class BinanceRateLimiter(RateLimiter):
+    """
+    Binance limits are tracked per API family (`api`, `sapi`, `fapi`, `dapi`, `papi`), as
+    each one is served by its own gateway with its own counters:
+
+    - REQUEST_WEIGHT per IP, reported in `X-MBX-USED-WEIGHT-1M`.
+    - ORDERS per account, reported in `X-MBX-ORDER-COUNT-10S` / `-1M` / `-1D`.
+
+    https://developers.binance.com/docs/binance-spot-api-docs/rest-api/limits
+    https://developers.binance.com/docs/derivatives/usds-margined-futures/general-info#limits
+    """
+
+    # family -> request weight per minute
+    WEIGHT_LIMITS = {
+        "api": 6000,
+        "sapi": 12000,
+        "fapi": 2400,
+        "dapi": 2400,
+        "papi": 6000,
+    }
+
+    # family -> (header suffix, limit, period in seconds)
+    ORDER_LIMITS = {
+        "api": (("10S", 100, 10), ("1D", 200000, 86400)),
+        "fapi": (("10S", 300, 10), ("1M", 1200, 60)),
+        "dapi": (("1M", 1200, 60),),
+        "papi": (("1M", 1200, 60),),
+    }
+
+    # (method, endpoint) -> (request weight, counts as an order, priority)
+    ENDPOINTS = {
+        ("POST", "/api/v3/order"): (1, True, RequestPriority.NEW),
+        ("DELETE", "/api/v3/order"): (1, False, RequestPriority.CANCEL),
+        ("POST", "/sapi/v1/margin/order"): (6, True, RequestPriority.NEW),
+        ("POST", "/fapi/v1/order"): (0, True, RequestPriority.NEW),
+        ("PUT", "/fapi/v1/order"): (1, True, RequestPriority.AMEND),
+        ("DELETE", "/fapi/v1/order"): (1, False, RequestPriority.CANCEL),
+        ("GET", "/fapi/v2/positionRisk"): (5, False, RequestPriority.QUERY),
+        ("GET", "/dapi/v1/positionRisk"): (1, False, RequestPriority.QUERY),
+        ("POST", "/dapi/v1/order"): (0, True, RequestPriority.NEW),
+        ("PUT", "/dapi/v1/order"): (1, True, RequestPriority.AMEND),
+        ("DELETE", "/dapi/v1/order"): (1, False, RequestPriority.CANCEL),
+        ("POST", "/papi/v1/um/order"): (1, True, RequestPriority.NEW),
+        ("POST", "/papi/v1/cm/order"): (1, True, RequestPriority.NEW),
+        ("POST", "/papi/v1/margin/order"): (1, True, RequestPriority.NEW),
+        ("GET", "/papi/v1/um/positionRisk"): (5, False, RequestPriority.QUERY),
+        ("GET", "/papi/v1/cm/positionRisk"): (1, False, RequestPriority.QUERY),
+    }
+
+    def __init__(self):
+        super().__init__()
+        for family, limit in self.WEIGHT_LIMITS.items():
+            self.add_bucket(f"{family}:weight", limit, 60)
+        for family, windows in self.ORDER_LIMITS.items():
+            for suffix, limit, period in windows:
+                self.add_bucket(f"{family}:orders:{suffix}", limit, period)
+
+        for (method, endpoint), (weight, is_order, priority) in self.ENDPOINTS.items():
+            family = self._family(endpoint)
+            costs = {f"{family}:weight": weight}
+            if is_order:
+                for suffix, _, _ in self.ORDER_LIMITS.get(family, ()):
+                    costs[f"{family}:orders:{suffix}"] = 1
+            self.add_rule(method, endpoint, costs, priority=priority)
+
+    @staticmethod
+    def _family(endpoint: str) -> str:
+        return endpoint.split("/", 2)[1]
+
+    def get_rule(self, method: str, endpoint: str):
+        rule = self._rules.get((method, endpoint))
+        if rule is None:
+            # unknown endpoints cost a weight of 1 on their family
+            self.add_rule(method, endpoint, {f"{self._family(endpoint)}:weight": 1})
+            rule = self._rules[(method, endpoint)]
+        return rule
+
+    def update_from_headers(self, method: str, endpoint: str, headers: Mapping[str, str]):
+        family = self._family(endpoint)
+        used_weight = headers.get("X-MBX-USED-WEIGHT-1M")
+        if used_weight is not None:
+            self._buckets[f"{family}:weight"].set_used(float(used_weight))
+
+        for suffix, _, _ in self.ORDER_LIMITS.get(family, ()):
+            count = headers.get(f"X-MBX-ORDER-COUNT-{suffix}")
+            if count is not None:
+                self._buckets[f"{family}:orders:{suffix}"].set_used(float(count))
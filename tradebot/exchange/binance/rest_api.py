@@ -7,14 +7,20 @@ import asyncio
 import aiohttp
 
 
-from typing import Any, Dict
+from typing import Any, Dict, List
 from urllib.parse import urljoin, urlencode
 
 from tradebot.base import RestApi, ApiClient
-from tradebot.exchange.binance.types import BinanceOrder, BinanceListenKey
+from tradebot.exchange.binance.types import (
+    BinanceOrder,
+    BinanceListenKey,
+    BinanceServerTime,
+    BinancePositionRisk,
+)
 from tradebot.exchange.binance.constants import BASE_URLS, ENDPOINTS
 from tradebot.exchange.binance.constants import BinanceAccountType, EndpointsType
 from tradebot.exchange.binance.error import BinanceClientError, BinanceServerError
+from tradebot.exchange.binance.rate_limit import BinanceRateLimiter
 
 
 class BinanceRestApi(RestApi):
@@ -107,12 +113,21 @@ class BinanceApiClient(ApiClient):
         secret: str = None,
         testnet: bool = False,
         timeout: int = 10,
+        account_type: BinanceAccountType = None,
+        recv_window: int = None,
     ):
+        """
+        `account_type` selects the server-time endpoint used for clock sync, spot by default.
+        `recv_window` is only sent when given, otherwise Binance applies its 5000ms default.
+        """
         super().__init__(
             api_key=api_key,
             secret=secret,
             timeout=timeout,
+            limiter=BinanceRateLimiter(),
         )
+        self._account_type = account_type or BinanceAccountType.SPOT
+        self._recv_window = recv_window
         self._headers = {
             "Content-Type": "application/json",
             "User-Agent": "TradingBot/1.0",
@@ -121,6 +136,8 @@ class BinanceApiClient(ApiClient):
         self._testnet = testnet
         self._order_decoder = msgspec.json.Decoder(BinanceOrder)
         self._listen_key_decoder = msgspec.json.Decoder(BinanceListenKey)
+        self._server_time_decoder = msgspec.json.Decoder(BinanceServerTime)
+        self._position_risk_decoder = msgspec.json.Decoder(List[BinancePositionRisk])
 
     def _generate_signature(self, query: str) -> str:
         signature = hmac.new(
@@ -138,7 +155,11 @@ class BinanceApiClient(ApiClient):
     ) -> Any:
         url = urljoin(base_url, endpoint)
         payload = payload or {}
-        payload["timestamp"] = self._clock.timestamp_ms()
+        await self._acquire(method, endpoint)
+        if signed:
+            payload["timestamp"] = self._timestamp_ms()
+            if self._recv_window:
+                payload["recvWindow"] = self._recv_window
         payload = urlencode(payload)
 
         if signed:
@@ -155,6 +176,7 @@ class BinanceApiClient(ApiClient):
                 headers=self._headers,
             )
             raw = await response.read()
+            self._limiter.update_from_headers(method, endpoint, response.headers)
             self.raise_error(raw, response.status, response.headers)
             return raw
         except aiohttp.ClientError as e:
@@ -193,6 +215,42 @@ class BinanceApiClient(ApiClient):
         elif account_type == BinanceAccountType.PORTFOLIO_MARGIN:
             return BinanceAccountType.PORTFOLIO_MARGIN.base_url
 
+    async def get_api_v3_time(self) -> BinanceServerTime:
+        """
+        https://developers.binance.com/docs/binance-spot-api-docs/rest-api#check-server-time
+        """
+        base_url = self._get_base_url(BinanceAccountType.SPOT)
+        end_point = "/api/v3/time"
+        raw = await self._fetch("GET", base_url, end_point)
+        return self._server_time_decoder.decode(raw)
+
+    async def get_fapi_v1_time(self) -> BinanceServerTime:
+        """
+        https://developers.binance.com/docs/derivatives/usds-margined-futures/market-data/rest-api/Check-Server-Time
+        """
+        base_url = self._get_base_url(BinanceAccountType.USD_M_FUTURE)
+        end_point = "/fapi/v1/time"
+        raw = await self._fetch("GET", base_url, end_point)
+        return self._server_time_decoder.decode(raw)
+
+    async def get_dapi_v1_time(self) -> BinanceServerTime:
+        """
+        https://developers.binance.com/docs/derivatives/coin-margined-futures/market-data/Check-Server-time
+        """
+        base_url = self._get_base_url(BinanceAccountType.COIN_M_FUTURE)
+        end_point = "/dapi/v1/time"
+        raw = await self._fetch("GET", base_url, end_point)
+        return self._server_time_decoder.decode(raw)
+
+    async def get_server_time(self) -> int:
+        if self._account_type.is_inverse:
+            res = await self.get_dapi_v1_time()
+        elif self._account_type.is_linear or self._account_type.is_portfolio_margin:
+            res = await self.get_fapi_v1_time()
+        else:
+            res = await self.get_api_v3_time()
+        return res.serverTime
+
     async def put_dapi_v1_listen_key(self):
         """
         https://developers.binance.com/docs/derivatives/coin-margined-futures/user-data-streams/Keepalive-User-Data-Stream
@@ -373,6 +431,52 @@ class BinanceApiClient(ApiClient):
         raw = await self._fetch("POST", base_url, end_point, payload=data, signed=True)
         return self._order_decoder.decode(raw)
 
+    async def put_fapi_v1_order(
+        self,
+        symbol: str,
+        side: str,
+        quantity: str,
+        price: str,
+        **kwargs,
+    ) -> BinanceOrder:
+        """
+        https://developers.binance.com/docs/derivatives/usds-margined-futures/trade/rest-api/Modify-Order
+        """
+        base_url = self._get_base_url(BinanceAccountType.USD_M_FUTURE)
+        end_point = "/fapi/v1/order"
+        data = {
+            "symbol": symbol,
+            "side": side,
+            "quantity": quantity,
+            "price": price,
+            **kwargs,
+        }
+        raw = await self._fetch("PUT", base_url, end_point, payload=data, signed=True)
+        return self._order_decoder.decode(raw)
+
+    async def put_dapi_v1_order(
+        self,
+        symbol: str,
+        side: str,
+        quantity: str,
+        price: str,
+        **kwargs,
+    ) -> BinanceOrder:
+        """
+        https://developers.binance.com/docs/derivatives/coin-margined-futures/trade/Modify-Order
+        """
+        base_url = self._get_base_url(BinanceAccountType.COIN_M_FUTURE)
+        end_point = "/dapi/v1/order"
+        data = {
+            "symbol": symbol,
+            "side": side,
+            "quantity": quantity,
+            "price": price,
+            **kwargs,
+        }
+        raw = await self._fetch("PUT", base_url, end_point, payload=data, signed=True)
+        return self._order_decoder.decode(raw)
+
     async def post_dapi_v1_order(
         self,
         symbol: str,
@@ -459,3 +563,39 @@ class BinanceApiClient(ApiClient):
         }
         raw = await self._fetch("POST", base_url, end_point, payload=data, signed=True)
         return self._order_decoder.decode(raw)
+
+    async def get_fapi_v2_position_risk(self, **kwargs) -> List[BinancePositionRisk]:
+        """
+        https://developers.binance.com/docs/derivatives/usds-margined-futures/trade/rest-api/Position-Information-V2
+        """
+        base_url = self._get_base_url(BinanceAccountType.USD_M_FUTURE)
+        end_point = "/fapi/v2/positionRisk"
+        raw = await self._fetch("GET", base_url, end_point, payload=kwargs, signed=True)
+        return self._position_risk_decoder.decode(raw)
+
+    async def get_dapi_v1_position_risk(self, **kwargs) -> List[BinancePositionRisk]:
+        """
+        https://developers.binance.com/docs/derivatives/coin-margined-futures/trade/Position-Information
+        """
+        base_url = self._get_base_url(BinanceAccountType.COIN_M_FUTURE)
+        end_point = "/dapi/v1/positionRisk"
+        raw = await self._fetch("GET", base_url, end_point, payload=kwargs, signed=True)
+        return self._position_risk_decoder.decode(raw)
+
+    async def get_papi_v1_um_position_risk(self, **kwargs) -> List[BinancePositionRisk]:
+        """
+        https://developers.binance.com/docs/derivatives/portfolio-margin/account/Query-UM-Position-Information
+        """
+        base_url = self._get_base_url(BinanceAccountType.PORTFOLIO_MARGIN)
+        end_point = "/papi/v1/um/positionRisk"
+        raw = await self._fetch("GET", base_url, end_point, payload=kwargs, signed=True)
+        return self._position_risk_decoder.decode(raw)
+
+    async def get_papi_v1_cm_position_risk(self, **kwargs) -> List[BinancePositionRisk]:
+        """
+        https://developers.binance.com/docs/derivatives/portfolio-margin/account/Query-CM-Position-Information
+        """
+        base_url = self._get_base_url(BinanceAccountType.PORTFOLIO_MARGIN)
+        end_point = "/papi/v1/cm/positionRisk"
+        raw = await self._fetch("GET", base_url, end_point, payload=kwargs, signed=True)
+        return self._position_risk_decoder.decode(raw)
@@ -4,10 +4,32 @@ from tradebot.types import Order, BaseMarket
 from tradebot.constants import OrderSide, TimeInForce
 from tradebot.exchange.binance.constants import BinanceOrderStatus, BinanceOrderType, BinancePositionSide
 
+
+class BinanceServerTime(msgspec.Struct):
+    serverTime: int
+
+
 class BinanceListenKey(msgspec.Struct):
     listenKey: str 
     
     
+class BinancePositionRisk(msgspec.Struct, frozen=True):
+    """
+    HTTP response item from Binance USD-M Futures `GET /fapi/v2/positionRisk`, COIN-M
+    Futures `GET /dapi/v1/positionRisk` and Portfolio Margin
+    `GET /papi/v1/um/positionRisk`, `GET /papi/v1/cm/positionRisk`.
+    """
+
+    symbol: str
+    positionAmt: str  # signed, in contracts for COIN-M
+    entryPrice: str
+    markPrice: str
+    unRealizedProfit: str
+    positionSide: BinancePositionSide
+    leverage: str | None = None
+    updateTime: int | None = None
+
+
 class BinanceUserTrade(msgspec.Struct, frozen=True):
     """
     HTTP response from Binance Spot/Margin `GET /api/v3/myTrades` HTTP response from
@@ -1,11 +1,13 @@
+import asyncio
 import msgspec
-from typing import Dict
+from typing import Dict, List
 from decimal import Decimal
 from collections import defaultdict
 from tradebot.base import PublicConnector, PrivateConnector
 from tradebot.entity import EventSystem
 from tradebot.types import BookL1, Order, Trade
 from tradebot.entity import AsyncCache
+from tradebot.shm import DecodePool, FrameDecoder, BOOKL1_RECORD, TRADE_RECORD
 from tradebot.constants import (
     EventType,
     OrderSide,
@@ -28,10 +30,56 @@ from tradebot.exchange.bybit.constants import (
     BybitAccountType,
     BybitEnumParser,
     BybitProductType,
+    BybitPositionSide,
 )
 from tradebot.exchange.bybit.exchange import BybitExchangeManager
 
 
+class BybitFrameDecoder(FrameDecoder):
+    """
+    Decodes `orderbook` and `publicTrade` frames into `tradebot.shm` records inside a
+    `DecodePool` worker.
+    """
+
+    def __init__(self, symbol_index: Dict[str, int]):
+        self._symbol_index = symbol_index  # bybit symbol, e.g. BTCUSDT -> index
+
+    def setup(self):
+        self._general_decoder = msgspec.json.Decoder(BybitWsMessageGeneral)
+        self._trade_decoder = msgspec.json.Decoder(BybitWsTradeMsg)
+        self._orderbook_decoder = msgspec.json.Decoder(BybitWsOrderbookDepthMsg)
+        self._orderbook = defaultdict(BybitOrderBook)
+
+    def decode(self, raw: bytes) -> List[tuple]:
+        topic = self._general_decoder.decode(raw).topic
+        if "orderbook" in topic:
+            msg: BybitWsOrderbookDepthMsg = self._orderbook_decoder.decode(raw)
+            res = self._orderbook[msg.data.s].parse_orderbook_depth(msg, levels=1)
+            bid, bid_size = res["bids"][0] if res["bids"] else (0, 0)
+            ask, ask_size = res["asks"][0] if res["asks"] else (0, 0)
+            return [
+                (
+                    BOOKL1_RECORD,
+                    self._symbol_index[msg.data.s],
+                    msg.ts,
+                    bid,
+                    bid_size,
+                    ask,
+                    ask_size,
+                )
+            ]
+        elif "publicTrade" in topic:
+            msg: BybitWsTradeMsg = self._trade_decoder.decode(raw)
+            if not msg.data:
+                return []
+            index = self._symbol_index[msg.data[0].s]
+            return [
+                (TRADE_RECORD, index, msg.ts, float(d.p), float(d.v), 0.0, 0.0)
+                for d in msg.data
+            ]
+        return []
+
+
 class BybitPublicConnector(PublicConnector):
     _ws_client: BybitWSClient
     _account_type: BybitAccountType
@@ -40,7 +88,12 @@ class BybitPublicConnector(PublicConnector):
         self,
         account_type: BybitAccountType,
         exchange: BybitExchangeManager,
+        decode_pool: DecodePool = None,
     ):
+        """
+        :param decode_pool: Decode market data frames in the worker processes of the pool
+            instead of on the event loop.
+        """
         if account_type in {BybitAccountType.ALL, BybitAccountType.ALL_TESTNET}:
             raise ValueError(
                 "Please not using `BybitAccountType.ALL` or `BybitAccountType.ALL_TESTNET` in `PublicConnector`"
@@ -52,7 +105,7 @@ class BybitPublicConnector(PublicConnector):
             market_id=exchange.market_id,
             exchange_id=exchange.exchange_id,
             ws_client=BybitWSClient(
-                account_type=account_type, handler=self._ws_msg_handler
+                account_type=account_type, handler=self._ws_frame_handler
             ),
         )
         self._ws_client: BybitWSClient = self._ws_client
@@ -62,6 +115,18 @@ class BybitPublicConnector(PublicConnector):
 
         self._orderbook = defaultdict(BybitOrderBook)
 
+        self._decode_pool = decode_pool
+        if decode_pool:
+            suffix = self.market_type
+            ids = [id for id in self._market_id if id.endswith(suffix)]
+            self._symbols = [self._market_id[id].symbol for id in ids]
+            self._decode_source = decode_pool.register(
+                BybitFrameDecoder(
+                    {id[: -len(suffix)]: i for i, id in enumerate(ids)}
+                ),
+                self._handle_records,
+            )
+
     @property
     def market_type(self):
         if self._account_type.is_spot:
@@ -73,12 +138,50 @@ class BybitPublicConnector(PublicConnector):
         else:
             raise ValueError(f"Unsupported BybitAccountType.{self._account_type.value}")
 
+    def _ws_frame_handler(self, raw: bytes):
+        # data frames go to the decode workers, pongs and replies are handled here
+        if self._decode_pool and b'"topic"' in raw[:64]:
+            self._decode_pool.submit(self._decode_source, raw)
+        else:
+            self._ws_msg_handler(raw)
+
+    def _handle_records(self, records: List[tuple]):
+        exchange = self._exchange_id
+        trades = []
+        for kind, _, index, ts, a, b, c, d in records:
+            self._record_latency(ts)
+            if kind == TRADE_RECORD:
+                trades.append(
+                    Trade(
+                        exchange=exchange,
+                        symbol=self._symbols[index],
+                        price=a,
+                        size=b,
+                        timestamp=ts,
+                    )
+                )
+            elif kind == BOOKL1_RECORD:
+                EventSystem.emit(
+                    EventType.BOOKL1,
+                    BookL1(
+                        exchange=exchange,
+                        symbol=self._symbols[index],
+                        timestamp=ts,
+                        bid=a,
+                        bid_size=b,
+                        ask=c,
+                        ask_size=d,
+                    ),
+                )
+        if trades:
+            self._emit_trades(trades)
+
     def _ws_msg_handler(self, raw: bytes):
         try:
             ws_msg: BybitWsMessageGeneral = self._ws_msg_general_decoder.decode(raw)
             if ws_msg.ret_msg == "pong":
                 self._ws_client._transport.notify_user_specific_pong_received()
-                self._log.debug(f"Pong received {str(ws_msg)}")
+                self._log.debug("Pong received %s", ws_msg)
                 return
             if ws_msg.success is False:
                 self._log.error(f"WebSocket error: {ws_msg}")
@@ -94,22 +197,30 @@ class BybitPublicConnector(PublicConnector):
     
     def _handle_trade(self, raw: bytes):
         msg: BybitWsTradeMsg = self._ws_msg_trade_decoder.decode(raw)
-        for d in msg.data:
-            id = d.s + self.market_type
-            market = self._market_id[id]
-            symbol = market.symbol
-            trade = Trade(
-                exchange=self._exchange_id,
-                symbol=symbol,
-                price=float(d.p),
-                size=float(d.v),
-                timestamp=msg.ts,
-            )
-            EventSystem.emit(EventType.TRADE, trade)
+        self._record_latency(msg.ts)
+        if not msg.data:
+            return
+        # a publicTrade frame belongs to a single topic, hence a single symbol
+        symbol = self._market_id[msg.data[0].s + self.market_type].symbol
+        exchange = self._exchange_id
+        ts = msg.ts
+        self._emit_trades(
+            [
+                Trade(
+                    exchange=exchange,
+                    symbol=symbol,
+                    price=float(d.p),
+                    size=float(d.v),
+                    timestamp=ts,
+                )
+                for d in msg.data
+            ]
+        )
             
 
     def _handle_orderbook(self, raw: bytes, topic: str):
         msg: BybitWsOrderbookDepthMsg = self._ws_msg_orderbook_decoder.decode(raw)
+        self._record_latency(msg.ts)
         id = msg.data.s + self.market_type
         market = self._market_id[id]
         symbol = market.symbol
@@ -162,6 +273,8 @@ class BybitPrivateConnector(PrivateConnector):
         strategy_id: str = None,
         user_id: str = None,
         rate_limit: float = None,
+        reconcile_interval: float = None,
+        stream_maxlen: int = None,
     ):
         # all the private endpoints are the same for all account types, so no need to pass account_type
         # only need to determine if it's testnet or not
@@ -191,6 +304,8 @@ class BybitPrivateConnector(PrivateConnector):
                 user_id=user_id,
             ),
             rate_limit=rate_limit,
+            reconcile_interval=reconcile_interval,
+            stream_maxlen=stream_maxlen,
         )
 
         self._api_client = BybitApiClient(
@@ -212,7 +327,7 @@ class BybitPrivateConnector(PrivateConnector):
             ws_msg = self._ws_msg_general_decoder.decode(raw)
             if ws_msg.op == "pong":
                 self._ws_client._transport.notify_user_specific_pong_received()
-                self._log.debug(f"Pong received {str(ws_msg)}")
+                self._log.debug("Pong received %s", ws_msg)
                 return
             if ws_msg.success is False:
                 self._log.error(f"WebSocket error: {ws_msg}")
@@ -222,6 +337,45 @@ class BybitPrivateConnector(PrivateConnector):
         except msgspec.DecodeError:
             self._log.error(f"Error decoding message: {str(raw)}")
 
+    # linear positions can only be listed per settle coin
+    _POSITION_QUERIES = (
+        ("linear", {"settleCoin": "USDT"}),
+        ("linear", {"settleCoin": "USDC"}),
+        ("inverse", {}),
+    )
+
+    async def _fetch_position_list(self, category: str, params: Dict[str, str]):
+        positions = []
+        params = {"limit": 200, **params}
+        while True:
+            res = await self._api_client.get_v5_position_list(category, **params)
+            positions.extend(res.result.list)
+            if not res.result.nextPageCursor:
+                return category, positions
+            params["cursor"] = res.result.nextPageCursor
+
+    async def fetch_positions(self) -> Dict[str, Decimal]:
+        results = await asyncio.gather(
+            *(
+                self._fetch_position_list(category, params)
+                for category, params in self._POSITION_QUERIES
+            )
+        )
+        positions = defaultdict(Decimal)
+        for category, items in results:
+            for item in items:
+                size = Decimal(item.size)
+                if not size:
+                    continue
+                market = self._market_id.get(f"{item.symbol}_{category}")
+                if market is None:
+                    continue
+                # hedge mode lists both sides of a symbol, they net out
+                if item.side == BybitPositionSide.SELL:
+                    size = -size
+                positions[market.symbol] += size
+        return dict(positions)
+
     def _get_category(self, market: BybitMarket):
         if market.spot:
             return "spot"
@@ -232,9 +386,7 @@ class BybitPrivateConnector(PrivateConnector):
         else:
             raise ValueError(f"Unsupported market type: {market.type}")
 
-    async def cancel_order(self, symbol: str, order_id: str, **kwargs):
-        if self._limiter:
-            await self._limiter.wait()
+    async def _cancel_order(self, symbol: str, order_id: str, **kwargs):
         try:
             market = self._market.get(symbol)
             if not market:
@@ -246,7 +398,7 @@ class BybitPrivateConnector(PrivateConnector):
             params = {
                 "category": category,
                 "symbol": symbol,
-                "order_id": order_id,
+                "orderId": order_id,
                 **kwargs,
             }
 
@@ -271,7 +423,52 @@ class BybitPrivateConnector(PrivateConnector):
             )
             return order
 
-    async def create_order(
+    async def _amend_order(
+        self,
+        symbol: str,
+        order_id: str,
+        price: Decimal = None,
+        amount: Decimal = None,
+        **kwargs,
+    ):
+        market = self._market.get(symbol)
+        if not market:
+            raise ValueError(f"Symbol {symbol} formated wrongly, or not supported")
+
+        params = {
+            "category": self._get_category(market),
+            "symbol": market.id,
+            "orderId": order_id,
+            **kwargs,
+        }
+        if price is not None:
+            params["price"] = str(price)
+        if amount is not None:
+            params["qty"] = str(amount)
+
+        try:
+            res = await self._api_client.post_v5_order_amend(**params)
+            order = await self._amending_order(
+                symbol=market.symbol,
+                order_id=res.result.orderId,
+                price=price,
+                amount=amount,
+                client_order_id=res.result.orderLinkId,
+            )
+            self._oms.add_order_msg(order)
+            return order
+        except Exception as e:
+            self._log.error(f"Error amending order: {e} params: {str(params)}")
+            order = Order(
+                exchange=self._exchange_id,
+                id=order_id,
+                timestamp=self._clock.timestamp_ms(),
+                symbol=market.symbol,
+                status=OrderStatus.FAILED,
+            )
+            return order
+
+    async def _create_order(
         self,
         symbol: str,
         side: OrderSide,
@@ -280,10 +477,9 @@ class BybitPrivateConnector(PrivateConnector):
         price: Decimal = None,
         time_in_force: TimeInForce = TimeInForce.GTC,
         position_side: PositionSide = None,
+        client_order_id: str = None,
         **kwargs,
     ):
-        if self._limiter:
-            await self._limiter.wait()
         market = self._market.get(symbol)
         if not market:
             raise ValueError(f"Symbol {symbol} formated wrongly, or not supported")
@@ -313,6 +509,8 @@ class BybitPrivateConnector(PrivateConnector):
         reduce_only = kwargs.pop("reduceOnly", False) or kwargs.pop("reduce_only", False)
         if reduce_only:
             params["reduceOnly"] = True
+        if client_order_id:
+            params["orderLinkId"] = client_order_id
         params.update(kwargs)
 
         try:
@@ -341,6 +539,7 @@ class BybitPrivateConnector(PrivateConnector):
             self._log.error(f"Error creating order: {e} params: {str(params)}")
             order = Order(
                 exchange=self._exchange_id,
+                client_order_id=client_order_id,
                 timestamp=self._clock.timestamp_ms(),
                 symbol=symbol,
                 type=type,
@@ -357,7 +556,8 @@ class BybitPrivateConnector(PrivateConnector):
 
     def _parse_order_update(self, raw: bytes):
         order_msg = self._ws_msg_order_update_decoder.decode(raw)
-        self._log.debug(f"Order update: {str(order_msg)}")
+        if self._log.debug_enabled:
+            self._log.debug(f"Order update: {order_msg}")
         for data in order_msg.data:
             category = data.category
             if category == BybitProductType.SPOT:
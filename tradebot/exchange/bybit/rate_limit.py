@@ -0,0 +1,63 @@
+from typing import Mapping
+
+from tradebot.constants import RequestPriority
+from tradebot.rate_limit import RateLimiter
+
+
+class BybitRateLimiter(RateLimiter):
+    """
+    https://bybit-exchange.github.io/docs/v5/rate-limit
+
+    - IP: 600 requests per 5 seconds across all HTTP endpoints.
+    - UID: per endpoint limit per second, reported back in `X-Bapi-Limit` and
+      `X-Bapi-Limit-Status` (remaining requests in the current window).
+    """
+
+    IP_BUCKET = "ip"
+
+    # default per-UID limits (requests per second) for non-VIP accounts
+    UID_LIMITS = {
+        ("POST", "/v5/order/create"): (10, RequestPriority.NEW),
+        ("POST", "/v5/order/amend"): (10, RequestPriority.AMEND),
+        ("POST", "/v5/order/cancel"): (10, RequestPriority.CANCEL),
+        ("POST", "/v5/order/cancel-all"): (1, RequestPriority.CANCEL),
+        ("GET", "/v5/order/realtime"): (50, RequestPriority.QUERY),
+        ("GET", "/v5/order/history"): (50, RequestPriority.QUERY),
+        ("GET", "/v5/position/list"): (50, RequestPriority.QUERY),
+    }
+
+    def __init__(self):
+        super().__init__()
+        self.add_bucket(self.IP_BUCKET, 600, 5)
+        self.set_default_rule({self.IP_BUCKET: 1})
+        for (method, endpoint), (limit, priority) in self.UID_LIMITS.items():
+            self._add_uid_rule(method, endpoint, limit, priority)
+
+    def _add_uid_rule(
+        self,
+        method: str,
+        endpoint: str,
+        limit: float,
+        priority: RequestPriority = RequestPriority.NEW,
+    ):
+        name = f"uid:{endpoint}"
+        self.add_bucket(name, limit, 1)
+        self.add_rule(
+            method, endpoint, {self.IP_BUCKET: 1, name: 1}, priority=priority
+        )
+
+    def update_from_headers(self, method: str, endpoint: str, headers: Mapping[str, str]):
+        remaining = headers.get("X-Bapi-Limit-Status")
+        if remaining is None:
+            return
+        limit = headers.get("X-Bapi-Limit")
+
+        bucket = self.get_bucket(f"uid:{endpoint}")
+        if bucket is None:
+            if limit is None:
+                return
+            self._add_uid_rule(method, endpoint, float(limit))
+            bucket = self.get_bucket(f"uid:{endpoint}")
+        elif limit is not None and float(limit) != bucket.capacity:
+            bucket.set_limit(float(limit))
+        bucket.set_remaining(float(remaining))
@@ -11,12 +11,14 @@ from decimal import Decimal
 from tradebot.base import ApiClient
 from tradebot.exchange.bybit.constants import BybitBaseUrl
 from tradebot.exchange.bybit.error import BybitError
+from tradebot.exchange.bybit.rate_limit import BybitRateLimiter
 from tradebot.exchange.bybit.types import (
     BybitResponse,
     BybitOrderResponse,
     BybitPositionResponse,
     BybitOrderHistoryResponse,
     BybitOpenOrdersResponse,
+    BybitServerTimeResponse,
 )
 
 
@@ -27,6 +29,7 @@ class BybitApiClient(ApiClient):
         secret: str = None,
         timeout: int = 10,
         testnet: bool = False,
+        recv_window: int = 5000,
     ):
         """
         ### Testnet:
@@ -42,14 +45,19 @@ class BybitApiClient(ApiClient):
         Hong Kong users: use `https://api.byhkbit.com` for mainnet
         Turkey users: use `https://api.bybit-tr.com` for mainnet
         Kazakhstan users: use `https://api.bybit.kz` for mainnet
+
+        ### recv_window:
+        Signed requests are stamped with the exchange-synced clock, so the window only
+        has to cover network latency, not local clock drift.
         """
 
         super().__init__(
             api_key=api_key,
             secret=secret,
             timeout=timeout,
+            limiter=BybitRateLimiter(),
         )
-        self._recv_window = 5000
+        self._recv_window = recv_window
 
         if testnet:
             self._base_url = BybitBaseUrl.TESTNET.value
@@ -71,9 +79,12 @@ class BybitApiClient(ApiClient):
         self._open_orders_response_decoder = msgspec.json.Decoder(
             BybitOpenOrdersResponse
         )
+        self._server_time_response_decoder = msgspec.json.Decoder(
+            BybitServerTimeResponse
+        )
 
     def _generate_signature(self, payload: str) -> List[str]:
-        timestamp = str(self._clock.timestamp_ms())
+        timestamp = str(self._timestamp_ms())
 
         param = str(timestamp) + self._api_key + str(self._recv_window) + payload
         hash = hmac.new(
@@ -99,6 +110,7 @@ class BybitApiClient(ApiClient):
             else orjson.dumps(payload).decode("utf-8")
         )
 
+        await self._acquire(method, endpoint)
         headers = self._headers
         if signed:
             signature, timestamp = self._generate_signature(payload_str)
@@ -114,7 +126,7 @@ class BybitApiClient(ApiClient):
             payload_str = None
 
         try:
-            self._log.debug(f"Request: {url} {payload_str}")
+            self._log.debug("Request: %s %s", url, payload_str)
             response = await self._session.request(
                 method=method,
                 url=url,
@@ -122,6 +134,7 @@ class BybitApiClient(ApiClient):
                 data=payload_str,
             )
             raw = await response.read()
+            self._limiter.update_from_headers(method, endpoint, response.headers)
             if response.status >= 400:
                 raise BybitError(
                     code=response.status,
@@ -145,6 +158,18 @@ class BybitApiClient(ApiClient):
             self._log.error(f"Error {method} Url: {url} {e}")
             raise
 
+    async def get_v5_market_time(self) -> BybitServerTimeResponse:
+        """
+        https://bybit-exchange.github.io/docs/v5/market/time
+        """
+        endpoint = "/v5/market/time"
+        raw = await self._fetch("GET", self._base_url, endpoint)
+        return self._server_time_response_decoder.decode(raw)
+
+    async def get_server_time(self) -> int:
+        res = await self.get_v5_market_time()
+        return int(res.result.timeNano) // 1_000_000
+
     async def post_v5_order_create(
         self,
         category: str,
@@ -184,6 +209,21 @@ class BybitApiClient(ApiClient):
         raw = await self._fetch("POST", self._base_url, endpoint, payload, signed=True)
         return self._order_response_decoder.decode(raw)
 
+    async def post_v5_order_amend(
+        self, category: str, symbol: str, **kwargs
+    ) -> BybitOrderResponse:
+        """
+        https://bybit-exchange.github.io/docs/v5/order/amend-order
+        """
+        endpoint = "/v5/order/amend"
+        payload = {
+            "category": category,
+            "symbol": symbol,
+            **kwargs,
+        }
+        raw = await self._fetch("POST", self._base_url, endpoint, payload, signed=True)
+        return self._order_response_decoder.decode(raw)
+
     async def get_v5_position_list(
         self, category: str, **kwargs
     ) -> BybitPositionResponse:
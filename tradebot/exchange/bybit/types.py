@@ -105,6 +105,7 @@ T = TypeVar("T")
 
 class BybitListResult(Generic[T], msgspec.Struct):
     list: list[T]
+    nextPageCursor: str = ""
     
 class BybitPositionResponse(msgspec.Struct):
     retCode: int
@@ -124,6 +125,18 @@ class BybitOpenOrdersResponse(msgspec.Struct):
     result: BybitListResult[BybitOrder]
     time: int
 
+class BybitServerTime(msgspec.Struct):
+    timeSecond: str
+    timeNano: str
+
+
+class BybitServerTimeResponse(msgspec.Struct):
+    retCode: int
+    retMsg: str
+    result: BybitServerTime
+    time: int
+
+
 class BybitResponse(msgspec.Struct, frozen=True):
     retCode: int
     retMsg: str
@@ -3,7 +3,7 @@ import orjson
 import asyncio
 
 from typing import Any, Callable
-from asynciolimiter import Limiter
+from tradebot.rate_limit import TokenBucket
 
 from tradebot.base import WSClient
 from tradebot.exchange.bybit.constants import BybitAccountType
@@ -28,7 +28,7 @@ class BybitWSClient(WSClient):
         # Bybit: do not exceed 500 requests per 5 minutes
         super().__init__(
             url,
-            limiter=Limiter(500 / 5 * 60),
+            limiter=TokenBucket(500, 5 * 60, name="BybitWSClient"),
             handler=handler,
             ping_idle_timeout=2,
             specific_ping_msg=orjson.dumps({"op": "ping"}),
@@ -1,4 +1,5 @@
-from typing import cast
+from typing import Dict, cast
+from collections import defaultdict
 import orjson
 import msgspec
 from decimal import Decimal
@@ -8,7 +9,7 @@ from tradebot.exchange.okx.websockets import OkxWSClient
 from tradebot.exchange.okx.websockets_v2 import OkxWSClient as OkxWSClientV2
 from tradebot.exchange.okx.exchange import OkxExchangeManager
 from tradebot.types import Trade, BookL1, Kline
-from tradebot.exchange.okx.types import OkxMarket
+from tradebot.exchange.okx.types import OkxMarket, OKXWsOrdersPushDataMsg
 from tradebot.constants import (
     EventType,
     OrderStatus,
@@ -26,11 +27,11 @@ from tradebot.exchange.okx.constants import (
     OKXWsPushDataMsg,
     OKXWsAccountPushDataMsg,
     OKXWsFillsPushDataMsg,
-    OKXWsOrdersPushDataMsg,
     OKXWsPositionsPushDataMsg,
     TdMode,
     OkxEnumParser,
     OkxOrderType,
+    OkxPositionSide,
 )
 
 
@@ -145,6 +146,7 @@ class OkxPublicConnector(PublicConnector):
         }
         """
         data = msg["data"][0]
+        self._record_latency(int(data["ts"]))
         id = msg["arg"]["instId"]
         market = self._market_id[id]
 
@@ -155,7 +157,7 @@ class OkxPublicConnector(PublicConnector):
             size=float(data["sz"]),
             timestamp=int(data["ts"]),
         )
-        EventSystem.emit(EventType.TRADE, trade)
+        self._emit_trades([trade])
 
     def _parse_bbo_tbt(self, msg):
         """
@@ -173,6 +175,7 @@ class OkxPublicConnector(PublicConnector):
         }
         """
         data = msg["data"][0]
+        self._record_latency(int(data["ts"]))
         id = msg["arg"]["instId"]
         market = self._market_id[id]
 
@@ -195,6 +198,8 @@ class OkxPrivateConnector(PrivateConnector):
         exchange: OkxExchangeManager,
         strategy_id: str = None,
         user_id: str = None,
+        reconcile_interval: float = None,
+        stream_maxlen: int = None,
     ):
         super().__init__(
             account_type=account_type,
@@ -213,6 +218,8 @@ class OkxPrivateConnector(PrivateConnector):
                 strategy_id=strategy_id,
                 user_id=user_id,
             ),
+            reconcile_interval=reconcile_interval,
+            stream_maxlen=stream_maxlen,
         )
 
         self._api_client = OkxApiClient(
@@ -269,10 +276,35 @@ class OkxPrivateConnector(PrivateConnector):
         orders_push_data: OKXWsOrdersPushDataMsg = self._decoder_ws_orders_msg.decode(
             raw
         )
-        print(orjson.loads(raw))
-        # print(orders_push_data.data)
-        # self._log.info(str(orders_push_data.data))
-        return orders_push_data.data
+        for data in orders_push_data.data:
+            market = self._market_id.get(data.instId)
+            if market is None:
+                continue
+            filled = Decimal(data.accFillSz or "0")
+            amount = Decimal(data.sz)
+            order = Order(
+                exchange=self._exchange_id,
+                symbol=market.symbol,
+                status=OkxEnumParser.parse_order_status(data.state),
+                id=data.ordId,
+                client_order_id=data.clOrdId or None,
+                timestamp=int(data.uTime),
+                type=OkxEnumParser.parse_okx_order_type(data.ordType),
+                side=OkxEnumParser.parse_order_side(data.side),
+                time_in_force=OkxEnumParser.parse_okx_time_in_force(data.ordType),
+                price=float(data.px) if data.px else None,
+                average=float(data.avgPx) if data.avgPx else None,
+                last_filled_price=float(data.fillPx) if data.fillPx else None,
+                last_filled=Decimal(data.fillSz) if data.fillSz else None,
+                amount=amount,
+                filled=filled,
+                remaining=amount - filled,
+                fee=float(data.fee) if data.fee else None,
+                fee_currency=data.feeCcy or None,
+                reduce_only=data.reduceOnly == "true",
+                position_side=OkxEnumParser.parse_position_side(data.posSide),
+            )
+            self._oms.add_order_msg(order)
 
     def _parse_positions(self, raw: bytes):
         """nautilus updates positions from fills."""
@@ -305,10 +337,27 @@ class OkxPrivateConnector(PrivateConnector):
         # await self.ws_client.subscrbe_fills()  # vip5 or above only
         await self.ws_client.subscribe_account()
 
+    async def fetch_positions(self) -> Dict[str, Decimal]:
+        res = await self._api_client.get_v5_account_positions()
+        positions = defaultdict(Decimal)
+        for item in res.data:
+            # in contracts, like order amounts
+            amount = Decimal(item.pos or "0")
+            if not amount:
+                continue
+            market = self._market_id.get(item.instId)
+            if market is None:
+                continue
+            # signed in net mode, long/short mode reports the side in `posSide`
+            if item.posSide == OkxPositionSide.SHORT.value:
+                amount = -abs(amount)
+            positions[market.symbol] += amount
+        return dict(positions)
+
     def _get_td_mode(self, market: OkxMarket):
         return TdMode.CASH if market.spot else TdMode.CROSS  # ?
 
-    async def create_order(
+    async def _create_order(
         self,
         symbol: str,
         side: OrderSide,
@@ -317,6 +366,7 @@ class OkxPrivateConnector(PrivateConnector):
         price: Decimal = None,
         time_in_force: TimeInForce = TimeInForce.GTC,
         position_side: PositionSide = None,
+        client_order_id: str = None,
         **kwargs,
     ):
         market = self._market.get(symbol)
@@ -340,6 +390,8 @@ class OkxPrivateConnector(PrivateConnector):
         if position_side:
             params["posSide"] = OkxEnumParser.to_okx_position_side(position_side).value
 
+        if client_order_id:
+            params["clOrdId"] = client_order_id
         params.update(kwargs)
 
         try:
@@ -367,6 +419,7 @@ class OkxPrivateConnector(PrivateConnector):
             self._log.error(f"Error creating order: {e} params: {str(params)}")
             order = Order(
                 exchange=self._exchange_id,
+                client_order_id=client_order_id,
                 timestamp=self._clock.timestamp_ms(),
                 symbol=symbol,
                 type=type,
@@ -381,7 +434,7 @@ class OkxPrivateConnector(PrivateConnector):
             )
             return order
 
-    async def cancel_order(self, symbol: str, order_id: str, **kwargs):
+    async def _cancel_order(self, symbol: str, order_id: str, **kwargs):
         market = self._market.get(symbol)
         if not market:
             raise ValueError(f"Symbol {symbol} formated wrongly, or not supported")
@@ -412,6 +465,49 @@ class OkxPrivateConnector(PrivateConnector):
             )
             return order
 
+    async def _amend_order(
+        self,
+        symbol: str,
+        order_id: str,
+        price: Decimal = None,
+        amount: Decimal = None,
+        **kwargs,
+    ):
+        market = self._market.get(symbol)
+        if not market:
+            raise ValueError(f"Symbol {symbol} formated wrongly, or not supported")
+
+        params = {
+            "instId": market.id,
+            "ordId": order_id,
+            "newPx": price,
+            "newSz": amount,
+            **kwargs,
+        }
+
+        try:
+            _res = await self._api_client.post_v5_order_amend(**params)
+            res = _res.data[0]
+            order = await self._amending_order(
+                symbol=symbol,
+                order_id=res.ordId,
+                price=price,
+                amount=amount,
+                client_order_id=res.clOrdId,
+            )
+            self._oms.add_order_msg(order)
+            return order
+        except Exception as e:
+            self._log.error(f"Error amending order: {e} params: {str(params)}")
+            order = Order(
+                exchange=self._exchange_id,
+                id=order_id,
+                timestamp=self._clock.timestamp_ms(),
+                symbol=symbol,
+                status=OrderStatus.FAILED,
+            )
+            return order
+
     async def disconnect(self):
         await super().disconnect()
         await self._api_client.close_session()
@@ -39,7 +39,6 @@ REST_URLS = {
 from nautilus_trader.adapters.okx.schemas.ws import OKXWsAccountPushDataMsg
 # from nautilus_trader.adapters.okx.schemas.ws import OKXWsPositionsPushDataMsg
 from nautilus_trader.adapters.okx.schemas.ws import OKXWsFillsPushDataMsg
-from nautilus_trader.adapters.okx.schemas.ws import OKXWsOrdersPushDataMsg
 from nautilus_trader.adapters.okx.schemas.ws import OKXWsGeneralMsg
 from nautilus_trader.adapters.okx.schemas.ws import OKXWsOrderbookPushDataMsg
 from nautilus_trader.adapters.okx.schemas.ws import OKXWsPushDataMsg
@@ -112,6 +111,8 @@ class OkxOrderStatus(Enum):  # "state"
 
 class OkxEnumParser:
     _okx_order_status_map = {
+        # ahead of CANCELED, which the reverse mapping has to keep
+        OkxOrderStatus.MMP_CANCELED: OrderStatus.CANCELED,
         OkxOrderStatus.LIVE: OrderStatus.ACCEPTED,
         OkxOrderStatus.PARTIALLY_FILLED: OrderStatus.PARTIALLY_FILLED,
         OkxOrderStatus.FILLED: OrderStatus.FILLED,
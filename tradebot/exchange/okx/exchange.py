@@ -11,10 +11,10 @@ class OkxExchangeManager(ExchangeManager):
     market: Dict[str, OkxMarket]
     market_id: Dict[str, OkxMarket]
 
-    def __init__(self, config: Dict[str, Any] = None):
+    def __init__(self, config: Dict[str, Any] = None, load_markets: bool = True):
         config = config or {}
         config["exchange_id"] = config.get("exchange_id", "okx")
-        super().__init__(config)
+        super().__init__(config, load_markets)
         self.passphrase = config.get("password", None)
 
     def load_markets(self):
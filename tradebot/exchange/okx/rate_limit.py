@@ -0,0 +1,27 @@
+from tradebot.constants import RequestPriority
+from tradebot.rate_limit import RateLimiter
+
+
+class OkxRateLimiter(RateLimiter):
+    """
+    OKX does not report usage in response headers, so only the documented static
+    per-endpoint limits are applied.
+
+    https://www.okx.com/docs-v5/en/#overview-rate-limits
+    """
+
+    # (method, endpoint) -> (requests, period in seconds, priority)
+    ENDPOINTS = {
+        ("POST", "/api/v5/trade/order"): (60, 2, RequestPriority.NEW),
+        ("POST", "/api/v5/trade/amend-order"): (60, 2, RequestPriority.AMEND),
+        ("POST", "/api/v5/trade/cancel-order"): (60, 2, RequestPriority.CANCEL),
+        ("GET", "/api/v5/account/positions"): (10, 2, RequestPriority.QUERY),
+        ("GET", "/api/v5/public/time"): (10, 2, RequestPriority.QUERY),
+    }
+
+    def __init__(self):
+        super().__init__()
+        for (method, endpoint), (limit, period, priority) in self.ENDPOINTS.items():
+            name = f"{method}:{endpoint}"
+            self.add_bucket(name, limit, period)
+            self.add_rule(method, endpoint, {name: 1}, priority=priority)
@@ -12,9 +12,13 @@ from tradebot.base import ApiClient
 from tradebot.exchange.okx import OkxAccountType
 from tradebot.exchange.okx.constants import REST_URLS
 from tradebot.exchange.okx.error import OKXHttpError
+from tradebot.exchange.okx.rate_limit import OkxRateLimiter
 from tradebot.exchange.okx.types import (
     OKXPlaceOrderResponse,
     OKXCancelOrderResponse,
+    OKXAmendOrderResponse,
+    OKXServerTimeResponse,
+    OKXPositionResponse,
 )
 
 
@@ -31,12 +35,16 @@ class OkxApiClient(ApiClient):
             api_key=api_key,
             secret=secret,
             timeout=timeout,
+            limiter=OkxRateLimiter(),
         )
         self._base_url = REST_URLS[account_type]
         self._passphrase = passphrase
         self._testnet = account_type.is_testnet
         self._place_order_decoder = msgspec.json.Decoder(OKXPlaceOrderResponse)
         self._cancel_order_decoder = msgspec.json.Decoder(OKXCancelOrderResponse)
+        self._amend_order_decoder = msgspec.json.Decoder(OKXAmendOrderResponse)
+        self._server_time_decoder = msgspec.json.Decoder(OKXServerTimeResponse)
+        self._position_decoder = msgspec.json.Decoder(OKXPositionResponse)
 
         self._headers = {
             "Content-Type": "application/json",
@@ -45,7 +53,11 @@ class OkxApiClient(ApiClient):
 
     def raise_error(self, raw: bytes, http_status: int, headers: Dict[str, Any]):
         msg = orjson.loads(raw)
-        msg_status = msg["data"][0]["sCode"]
+        data = msg.get("data")
+        if data and isinstance(data[0], dict) and "sCode" in data[0]:
+            msg_status = data[0]["sCode"]
+        else:
+            msg_status = msg.get("code", "0")
         if msg_status != "0":
             raise OKXHttpError(msg_status, msg, headers)
         elif 400 <= http_status < 500:
@@ -53,6 +65,28 @@ class OkxApiClient(ApiClient):
         elif http_status >= 500:
             raise OKXHttpError(http_status, msg, headers)
 
+    async def get_v5_public_time(self) -> OKXServerTimeResponse:
+        """
+        Retrieve API server time
+        https://www.okx.com/docs-v5/en/#public-data-rest-api-get-system-time
+        """
+        endpoint = "/api/v5/public/time"
+        raw = await self._fetch("GET", endpoint)
+        return self._server_time_decoder.decode(raw)
+
+    async def get_server_time(self) -> int:
+        res = await self.get_v5_public_time()
+        return int(res.data[0].ts)
+
+    async def get_v5_account_positions(self, **kwargs) -> OKXPositionResponse:
+        """
+        Retrieve the open positions of the account
+        https://www.okx.com/docs-v5/en/#trading-account-rest-api-get-positions
+        """
+        endpoint = "/api/v5/account/positions"
+        raw = await self._fetch("GET", endpoint, params=kwargs, signed=True)
+        return self._position_decoder.decode(raw)
+
     async def post_v5_order_create(
         self,
         instId: str,
@@ -97,6 +131,33 @@ class OkxApiClient(ApiClient):
         raw = await self._fetch("POST", endpoint, payload=payload, signed=True)
         return self._cancel_order_decoder.decode(raw)
 
+    async def post_v5_order_amend(
+        self,
+        instId: str,
+        ordId: str = None,
+        clOrdId: str = None,
+        newSz: Decimal = None,
+        newPx: Decimal = None,
+        **kwargs,
+    ) -> OKXAmendOrderResponse:
+        """
+        Amend an incomplete order
+        https://www.okx.com/docs-v5/en/#order-book-trading-trade-post-amend-order
+        """
+        endpoint = "/api/v5/trade/amend-order"
+        payload = {"instId": instId, **kwargs}
+        if ordId:
+            payload["ordId"] = ordId
+        if clOrdId:
+            payload["clOrdId"] = clOrdId
+        if newSz is not None:
+            payload["newSz"] = str(newSz)
+        if newPx is not None:
+            payload["newPx"] = str(newPx)
+
+        raw = await self._fetch("POST", endpoint, payload=payload, signed=True)
+        return self._amend_order_decoder.decode(raw)
+
     def _generate_signature(self, message: str) -> str:
         mac = hmac.new(
             bytes(self._secret, encoding="utf8"),
@@ -118,7 +179,7 @@ class OkxApiClient(ApiClient):
 
     def _get_timestamp(self) -> str:
         return (
-            datetime.now(timezone.utc)
+            datetime.fromtimestamp(self._timestamp_ms() / 1000, timezone.utc)
             .isoformat(timespec="milliseconds")
             .replace("+00:00", "Z")
         )
@@ -151,6 +212,7 @@ class OkxApiClient(ApiClient):
         url = f"{self._base_url}{endpoint}"
         request_path = endpoint
         headers = self._headers
+        await self._acquire(method, endpoint)
         timestamp = self._get_timestamp()
 
         if params:
@@ -1,5 +1,11 @@
 import msgspec
 from tradebot.types import BaseMarket
+from tradebot.exchange.okx.constants import (
+    OkxOrderSide,
+    OkxOrderStatus,
+    OkxOrderType,
+    OkxPositionSide,
+)
 
 ################################################################################
 # Place Order: POST /api/v5/trade/order
@@ -42,6 +48,94 @@ class OKXCancelOrderResponse(msgspec.Struct):
     outTime: str  # milliseconds when response leaves REST gateway
 
 
+################################################################################
+# Amend order: POST /api/v5/trade/amend-order
+################################################################################
+class OKXAmendOrderData(msgspec.Struct):
+    ordId: str
+    clOrdId: str
+    ts: str  # milliseconds when OKX finished order request processing
+    reqId: str  # client request ID as assigned by the client for order amendment
+    sCode: str  # event code, "0" means success
+    sMsg: str  # rejection or success message of event execution
+
+
+class OKXAmendOrderResponse(msgspec.Struct):
+    code: str
+    msg: str
+    data: list[OKXAmendOrderData]
+    inTime: str  # milliseconds when request hit REST gateway
+    outTime: str  # milliseconds when response leaves REST gateway
+
+
+################################################################################
+# Server time: GET /api/v5/public/time
+################################################################################
+class OKXServerTimeData(msgspec.Struct):
+    ts: str  # system time, Unix timestamp in milliseconds
+
+
+class OKXServerTimeResponse(msgspec.Struct):
+    code: str
+    msg: str
+    data: list[OKXServerTimeData]
+
+
+################################################################################
+# Positions: GET /api/v5/account/positions
+################################################################################
+class OKXPositionData(msgspec.Struct):
+    instType: str
+    instId: str
+    mgnMode: str
+    posSide: str  # net, long or short
+    pos: str  # in contracts, signed in net mode
+    avgPx: str
+    upl: str
+    uTime: str
+
+
+class OKXPositionResponse(msgspec.Struct):
+    code: str
+    msg: str
+    data: list[OKXPositionData]
+
+
+################################################################################
+# Orders channel: wss://ws.okx.com:8443/ws/v5/private
+################################################################################
+class OKXWsOrderData(msgspec.Struct, kw_only=True):
+    instType: str
+    instId: str
+    ordId: str
+    clOrdId: str = ""
+    px: str
+    sz: str
+    ordType: OkxOrderType
+    side: OkxOrderSide
+    posSide: OkxPositionSide
+    state: OkxOrderStatus
+    accFillSz: str  # cumulative filled
+    avgPx: str
+    fillPx: str = ""
+    fillSz: str = ""
+    fee: str = ""
+    feeCcy: str = ""
+    reduceOnly: str = "false"
+    uTime: str
+
+
+class OKXWsOrdersArg(msgspec.Struct, kw_only=True):
+    channel: str
+    instType: str
+    uid: str = ""
+
+
+class OKXWsOrdersPushDataMsg(msgspec.Struct):
+    arg: OKXWsOrdersArg
+    data: list[OKXWsOrderData]
+
+
 class OkxMarketInfo(msgspec.Struct):
     """
     {
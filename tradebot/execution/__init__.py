@@ -0,0 +1,20 @@
+from tradebot.execution.algorithm import (
+    ParentOrder,
+    ExecAlgorithm,
+    TWAPAlgorithm,
+    VWAPAlgorithm,
+    POVAlgorithm,
+)
+from tradebot.execution.engine import ExecutionEngine
+from tradebot.execution.rebalance import Rebalancer, RebalancePlan
+
+__all__ = [
+    "ParentOrder",
+    "ExecAlgorithm",
+    "TWAPAlgorithm",
+    "VWAPAlgorithm",
+    "POVAlgorithm",
+    "ExecutionEngine",
+    "Rebalancer",
+    "RebalancePlan",
+]
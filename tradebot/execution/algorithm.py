@@ -0,0 +1,444 @@
+import uuid
+import asyncio
+
+from abc import ABC, abstractmethod
+from decimal import Decimal
+from typing import Callable, Dict, Sequence
+
+from msgspec import Struct
+
+from tradebot.log import SpdLog
+from tradebot.base import PrivateConnector
+from tradebot.types import Order, BookL1, Trade, MarketData
+from tradebot.constants import (
+    OrderSide,
+    OrderType,
+    OrderStatus,
+    TimeInForce,
+    ExecutionStatus,
+)
+
+
+class ParentOrder(Struct, kw_only=True):
+    """
+    State and metrics of one algorithmic parent order. Slippage is measured against the
+    mid price at arrival, positive means the execution was worse than arrival.
+    """
+
+    id: str
+    algorithm: str
+    exchange: str
+    symbol: str
+    side: OrderSide
+    amount: Decimal
+    start_ts: int
+    end_ts: int | None = None
+    status: ExecutionStatus = ExecutionStatus.RUNNING
+    filled: Decimal = Decimal(0)
+    notional: float = 0.0
+    arrival_price: float | None = None
+    children: int = 0
+    amends: int = 0
+    cancels: int = 0
+    rejects: int = 0
+
+    @property
+    def remaining(self) -> Decimal:
+        return self.amount - self.filled
+
+    @property
+    def fill_rate(self) -> float:
+        return float(self.filled / self.amount) if self.amount else 0.0
+
+    @property
+    def average(self) -> float | None:
+        return self.notional / float(self.filled) if self.filled else None
+
+    @property
+    def slippage_bps(self) -> float | None:
+        if not self.filled or not self.arrival_price:
+            return None
+        sign = 1 if self.side == OrderSide.BUY else -1
+        return sign * (self.average - self.arrival_price) / self.arrival_price * 10_000
+
+
+class ChildOrder(Struct):
+    id: str
+    price: float
+    amount: Decimal
+    filled: Decimal = Decimal(0)
+    cum_cost: float = 0.0
+    canceling: bool = False
+    done: bool = False
+
+
+class ExecAlgorithm(ABC):
+    """
+    Base class of execution algorithms.
+
+    A parent order is worked with at most one passive child limit order quoted at the
+    touch. On every `Clock` tick the algorithm compares what is done with its schedule
+    (`target_quantity`): a behind-schedule parent gets a new child for the shortfall,
+    and a working child whose price left the touch is amended in place. Fills are taken
+    from OMS order events, nothing is polled. Once `end_ts` has passed the remainder is
+    quoted at the opposite touch to finish.
+    """
+
+    name: str = "ALGO"
+
+    def __init__(
+        self,
+        symbol: str,
+        side: OrderSide,
+        amount: Decimal,
+        duration: float,
+        reduce_only: bool = False,
+        limit_price: float = None,
+        min_slice: Decimal = None,
+        **kwargs,
+    ):
+        """
+        :param symbol: Symbol in ccxt format, e.g. BTC/USDT:USDT
+        :param duration: Seconds over which the parent order is scheduled
+        :param limit_price: Never buy above / sell below this price
+        :param min_slice: Smallest child order, defaults to the market minimum amount
+        :param kwargs: Passed to every child `create_order`
+        """
+        self._symbol = symbol
+        self._side = side
+        self._amount = Decimal(str(amount))
+        self._duration = duration
+        self._reduce_only = reduce_only
+        self._limit_price = limit_price
+        self._min_slice = min_slice
+        self._kwargs = kwargs
+
+        self._connector: PrivateConnector | None = None
+        self._market_data: MarketData | None = None
+        self._parent: ParentOrder | None = None
+        self._children: Dict[str, ChildOrder] = {}
+        self._working: ChildOrder | None = None
+        self._done: asyncio.Future | None = None
+        self._busy = False
+        self._on_child: Callable[["ExecAlgorithm", str], None] | None = None
+        self._on_finish: Callable[["ExecAlgorithm"], None] | None = None
+        self._log = SpdLog.get_logger(name=type(self).__name__)
+
+    @property
+    def parent(self) -> ParentOrder:
+        return self._parent
+
+    @property
+    def children(self) -> Dict[str, ChildOrder]:
+        return self._children
+
+    @property
+    def symbol(self) -> str:
+        return self._symbol
+
+    @property
+    def exchange(self) -> str:
+        return self._parent.exchange
+
+    @property
+    def active(self) -> bool:
+        return self._parent is not None and self._parent.status == ExecutionStatus.RUNNING
+
+    @property
+    def busy(self) -> bool:
+        return self._busy
+
+    def start(
+        self,
+        connector: PrivateConnector,
+        market_data: MarketData,
+        timestamp: int,
+        on_child: Callable[["ExecAlgorithm", str], None] = None,
+        on_finish: Callable[["ExecAlgorithm"], None] = None,
+    ) -> ParentOrder:
+        """
+        :param on_child: Called with the id of every child order placed
+        :param on_finish: Called once the parent order is finished or canceled
+        """
+        self._connector = connector
+        self._market_data = market_data
+        self._on_child = on_child
+        self._on_finish = on_finish
+        self._done = asyncio.get_running_loop().create_future()
+
+        exchange = connector._exchange_id
+        book = market_data.bookl1.get(exchange, {}).get(self._symbol)
+        self._parent = ParentOrder(
+            id=f"{self.name}-{uuid.uuid4().hex[:16]}",
+            algorithm=self.name,
+            exchange=exchange,
+            symbol=self._symbol,
+            side=self._side,
+            amount=self._amount,
+            start_ts=timestamp,
+            end_ts=timestamp + int(self._duration * 1000),
+            arrival_price=(book.bid + book.ask) / 2 if book else None,
+        )
+        if self._min_slice is None:
+            self._min_slice = Decimal(
+                str(connector._market[self._symbol].limits.amount.min or 0)
+            )
+        return self._parent
+
+    async def wait(self) -> ParentOrder:
+        """Wait until the parent order is finished or canceled."""
+        return await asyncio.shield(self._done)
+
+    def owns(self, order_id: str) -> bool:
+        return order_id in self._children
+
+    @abstractmethod
+    def target_quantity(self, timestamp: int) -> Decimal:
+        """Cumulative quantity that should be filled at `timestamp` (ms)."""
+        pass
+
+    def on_trade(self, trade: Trade):
+        pass
+
+    def on_order(self, order: Order):
+        child = self._children.get(order.id)
+        if child is None or child.done:
+            return
+
+        if order.filled is not None and order.filled > child.filled:
+            delta = order.filled - child.filled
+            if order.cum_cost is not None:
+                cost = order.cum_cost - child.cum_cost
+                child.cum_cost = order.cum_cost
+            else:
+                cost = float(delta) * (order.average or order.price or child.price)
+                child.cum_cost += cost
+            child.filled = order.filled
+            self._parent.filled += delta
+            self._parent.notional += cost
+
+        if order.status in (
+            OrderStatus.FILLED,
+            OrderStatus.CANCELED,
+            OrderStatus.EXPIRED,
+            OrderStatus.FAILED,
+        ):
+            child.done = True
+            if self._working is child:
+                self._working = None
+            if self._parent.remaining <= 0:
+                self._finish(ExecutionStatus.FINISHED)
+
+    async def on_tick(self, timestamp: int):
+        if not self.active or self._busy:
+            return
+        self._busy = True
+        try:
+            await self._work(timestamp)
+        except Exception as e:
+            self._log.error(f"{self._parent.id} error on tick: {e}")
+        finally:
+            self._busy = False
+
+    async def cancel(self):
+        """Stop scheduling and cancel the working child order."""
+        if not self.active:
+            return
+        if self._working:
+            await self._cancel_working()
+        self._finish(ExecutionStatus.CANCELED)
+
+    async def _work(self, timestamp: int):
+        if self._parent.remaining <= 0:
+            self._finish(ExecutionStatus.FINISHED)
+            return
+
+        book = self._market_data.bookl1.get(self._parent.exchange, {}).get(self._symbol)
+        if not book:
+            return
+        if self._parent.arrival_price is None:
+            self._parent.arrival_price = (book.bid + book.ask) / 2
+
+        urgent = timestamp >= self._parent.end_ts
+        price = self._quote_price(book, urgent)
+        if price is None:
+            return
+
+        if self._working:
+            # a canceling child keeps the slot until the exchange confirms, so its late
+            # fills can not overfill the parent
+            if not self._working.canceling and self._working.price != price:
+                await self._amend_working(price)
+            return
+
+        if urgent:
+            target = self._parent.amount
+        else:
+            target = min(self.target_quantity(timestamp), self._parent.amount)
+        qty = self._connector.amount_to_precision(
+            self._symbol, float(target - self._parent.filled), mode="floor"
+        )
+        qty = min(qty, self._parent.remaining)
+        if qty <= 0 or qty < self._min_slice:
+            if urgent and 0 < self._parent.remaining < self._min_slice:
+                # dust below the exchange minimum can not be executed
+                self._finish(ExecutionStatus.FINISHED)
+            return
+        await self._place_child(qty, price)
+
+    def _quote_price(self, book: BookL1, urgent: bool) -> float | None:
+        if self._side == OrderSide.BUY:
+            price = book.ask if urgent else book.bid
+            if self._limit_price is not None:
+                price = min(price, self._limit_price)
+        else:
+            price = book.bid if urgent else book.ask
+            if self._limit_price is not None:
+                price = max(price, self._limit_price)
+        if not price:
+            return None
+        return float(self._connector.price_to_precision(self._symbol, price))
+
+    async def _place_child(self, qty: Decimal, price: float):
+        order = await self._connector.create_order(
+            symbol=self._symbol,
+            side=self._side,
+            type=OrderType.LIMIT,
+            amount=qty,
+            price=Decimal(str(price)),
+            time_in_force=TimeInForce.GTC,
+            reduceOnly=self._reduce_only,
+            **self._kwargs,
+        )
+        if not order.success or not order.id:
+            self._parent.rejects += 1
+            self._log.error(f"{self._parent.id} failed to place child order")
+            return
+
+        child = ChildOrder(id=order.id, price=price, amount=qty)
+        self._children[order.id] = child
+        self._working = child
+        self._parent.children += 1
+        if self._on_child:
+            self._on_child(self, order.id)
+
+        # updates may have reached the OMS before the child was registered
+        cached = await self._connector._cache.get_order(order.id)
+        if cached:
+            self.on_order(cached)
+
+    async def _amend_working(self, price: float):
+        child = self._working
+        order = await self._connector.amend_order(
+            symbol=self._symbol, order_id=child.id, price=Decimal(str(price))
+        )
+        if order.success:
+            child.price = price
+            self._parent.amends += 1
+        else:
+            # the exchange refused the amend, most likely the child is already done
+            await self._cancel_working()
+
+    async def _cancel_working(self):
+        child = self._working
+        order = await self._connector.cancel_order(symbol=self._symbol, order_id=child.id)
+        if order.success:
+            self._parent.cancels += 1
+            child.canceling = True
+        else:
+            # neither amendable nor cancelable: the child is already closed
+            child.done = True
+            self._working = None
+
+    def _finish(self, status: ExecutionStatus):
+        if not self.active:
+            return
+        self._parent.status = status
+        self._parent.end_ts = self._connector._clock.timestamp_ms()
+        self._log.info(
+            f"{self._parent.id} {status.value} {self._symbol} filled {self._parent.filled}/{self._parent.amount} "
+            f"avg {self._parent.average} slippage {self._parent.slippage_bps} bps"
+        )
+        if not self._done.done():
+            self._done.set_result(self._parent)
+        if self._on_finish:
+            self._on_finish(self)
+
+
+class TWAPAlgorithm(ExecAlgorithm):
+    """Fill linearly over `duration` seconds."""
+
+    name = "TWAP"
+
+    def target_quantity(self, timestamp: int) -> Decimal:
+        elapsed = (timestamp - self._parent.start_ts) / 1000
+        frac = min(max(elapsed / self._duration, 0.0), 1.0)
+        return self._amount * Decimal(str(frac))
+
+
+class VWAPAlgorithm(ExecAlgorithm):
+    """
+    Follow a volume profile: `duration` is split into `len(volume_profile)` equal buckets
+    and the parent is filled in proportion to the expected volume of each bucket.
+    """
+
+    name = "VWAP"
+
+    def __init__(
+        self,
+        symbol: str,
+        side: OrderSide,
+        amount: Decimal,
+        duration: float,
+        volume_profile: Sequence[float],
+        **kwargs,
+    ):
+        super().__init__(symbol, side, amount, duration, **kwargs)
+        total = sum(volume_profile)
+        if total <= 0:
+            raise ValueError("volume_profile must contain positive volumes")
+        self._profile = [v / total for v in volume_profile]
+
+    def target_quantity(self, timestamp: int) -> Decimal:
+        elapsed = (timestamp - self._parent.start_ts) / 1000
+        position = min(max(elapsed / self._duration, 0.0), 1.0) * len(self._profile)
+        full = int(position)
+        frac = sum(self._profile[:full])
+        if full < len(self._profile):
+            frac += self._profile[full] * (position - full)
+        return self._amount * Decimal(str(min(frac, 1.0)))
+
+
+class POVAlgorithm(ExecAlgorithm):
+    """
+    Participate in `participation_rate` of the market volume traded on the symbol since
+    the start, capped at the parent amount. `duration` bounds the execution time.
+    """
+
+    name = "POV"
+
+    def __init__(
+        self,
+        symbol: str,
+        side: OrderSide,
+        amount: Decimal,
+        duration: float,
+        participation_rate: float,
+        **kwargs,
+    ):
+        if not 0 < participation_rate <= 1:
+            raise ValueError("participation_rate must be in (0, 1]")
+        super().__init__(symbol, side, amount, duration, **kwargs)
+        self._participation_rate = participation_rate
+        self._market_volume = 0.0
+
+    @property
+    def market_volume(self) -> float:
+        return self._market_volume
+
+    def on_trade(self, trade: Trade):
+        if trade.timestamp >= self._parent.start_ts:
+            self._market_volume += trade.size
+
+    def target_quantity(self, timestamp: int) -> Decimal:
+        return Decimal(str(self._market_volume * self._participation_rate))
@@ -0,0 +1,120 @@
+import asyncio
+
+from typing import Dict, List
+
+from tradebot.log import SpdLog
+from tradebot.base import Clock, PrivateConnector
+from tradebot.entity import EventSystem
+from tradebot.types import Order, Trade, MarketData
+from tradebot.constants import EventType, OrderStatus
+from tradebot.execution.algorithm import ExecAlgorithm, ParentOrder
+
+
+_CLOSED = (
+    OrderStatus.FILLED,
+    OrderStatus.CANCELED,
+    OrderStatus.EXPIRED,
+    OrderStatus.FAILED,
+)
+
+
+class ExecutionEngine:
+    """
+    Runs any number of parent orders side by side. All of them are driven by the ticks of
+    one `Clock` and by OMS order events, so there is no polling loop per parent order;
+    child requests go through the `RequestScheduler` of their connector.
+
+    Only running parent orders are kept, a finished one is dropped and its result comes
+    from `ExecAlgorithm.wait`. Order events reach their algorithm by child order id.
+    """
+
+    def __init__(self, clock: Clock, market_data: MarketData):
+        self._log = SpdLog.get_logger(name=type(self).__name__)
+        self._clock = clock
+        self._market_data = market_data
+        self._algorithms: Dict[str, ExecAlgorithm] = {}
+        # child order id -> algorithm, until the child is closed
+        self._children: Dict[str, ExecAlgorithm] = {}
+
+        clock.add_tick_callback(self._on_tick)
+        EventSystem.on(EventType.TRADE_BATCH, self._on_trades)
+        for status in (
+            OrderStatus.ACCEPTED,
+            OrderStatus.PARTIALLY_FILLED,
+            OrderStatus.FILLED,
+            OrderStatus.CANCELED,
+            OrderStatus.EXPIRED,
+            OrderStatus.FAILED,
+        ):
+            EventSystem.on(status, self._on_order)
+
+    @property
+    def parents(self) -> List[ParentOrder]:
+        return [algo.parent for algo in self._algorithms.values()]
+
+    @property
+    def children(self) -> Dict[str, ExecAlgorithm]:
+        """The algorithm of every child order not closed yet, by order id."""
+        return dict(self._children)
+
+    def get(self, parent_id: str) -> ExecAlgorithm | None:
+        return self._algorithms.get(parent_id)
+
+    def submit(
+        self, algorithm: ExecAlgorithm, connector: PrivateConnector
+    ) -> ParentOrder:
+        parent = algorithm.start(
+            connector,
+            self._market_data,
+            connector._clock.timestamp_ms(),
+            on_child=self._on_child,
+            on_finish=self._on_finish,
+        )
+        self._algorithms[parent.id] = algorithm
+        self._log.info(
+            f"{parent.id} started {parent.side.value} {parent.amount} {parent.symbol} arrival {parent.arrival_price}"
+        )
+        return parent
+
+    async def cancel(self, parent_id: str):
+        algorithm = self._algorithms.get(parent_id)
+        if algorithm:
+            await algorithm.cancel()
+
+    async def cancel_all(self):
+        await asyncio.gather(*(algo.cancel() for algo in list(self._algorithms.values())))
+
+    def _on_child(self, algorithm: ExecAlgorithm, order_id: str):
+        self._children[order_id] = algorithm
+
+    def _on_finish(self, algorithm: ExecAlgorithm):
+        self._algorithms.pop(algorithm.parent.id, None)
+        # a child still being canceled keeps routing its late fills until it is closed
+        for order_id, child in algorithm.children.items():
+            if child.done:
+                self._children.pop(order_id, None)
+
+    async def _on_tick(self, timestamp: float):
+        if not self._algorithms:
+            return
+        ts = int(timestamp * 1000)
+        await asyncio.gather(
+            *(algo.on_tick(ts) for algo in list(self._algorithms.values()) if not algo.busy)
+        )
+
+    def _on_trades(self, trades: List[Trade]):
+        if not self._algorithms:
+            return
+        algorithms = list(self._algorithms.values())
+        for trade in trades:
+            for algo in algorithms:
+                if algo.symbol == trade.symbol and algo.exchange == trade.exchange:
+                    algo.on_trade(trade)
+
+    def _on_order(self, order: Order):
+        algo = self._children.get(order.id)
+        if algo is None:
+            return
+        algo.on_order(order)
+        if order.status in _CLOSED:
+            self._children.pop(order.id, None)
@@ -0,0 +1,118 @@
+import numpy as np
+
+from decimal import Decimal
+from typing import Dict, List, Sequence, Tuple
+
+from tradebot.constants import OrderSide
+
+
+class RebalancePlan:
+    """
+    Orders that move the current positions towards the targets, as arrays aligned with
+    the symbol index of the `Rebalancer`. `mask` selects the symbols with an order.
+    """
+
+    def __init__(
+        self,
+        symbols: List[str],
+        lots: np.ndarray,
+        reduce_only: np.ndarray,
+        mask: np.ndarray,
+        steps: List[Decimal],
+    ):
+        self.symbols = symbols
+        self.lots = lots  # signed, in amount steps
+        self.reduce_only = reduce_only
+        self.mask = mask
+        self._steps = steps
+
+    def __len__(self) -> int:
+        return int(self.mask.sum())
+
+    def orders(self) -> List[Tuple[str, OrderSide, Decimal, bool]]:
+        """
+        (symbol, side, amount, reduce_only) per order, amounts are exact multiples of the
+        amount step of the symbol.
+        """
+        return [
+            (
+                self.symbols[i],
+                OrderSide.BUY if self.lots[i] > 0 else OrderSide.SELL,
+                abs(int(self.lots[i])) * self._steps[i],
+                bool(self.reduce_only[i]),
+            )
+            for i in np.flatnonzero(self.mask)
+        ]
+
+
+class Rebalancer:
+    """
+    Computes the orders of a portfolio rebalance in one vectorized pass over a fixed
+    symbol index.
+
+    A position that has to cross zero is first closed with a reduce only order, the new
+    side is opened by the next rebalance (-5 -> 10 gives BUY 5 reduce only). Orders
+    trading against the current position are reduce only, orders below the minimum
+    amount or notional, or of symbols without a price, are filtered out.
+    """
+
+    def __init__(
+        self,
+        symbols: Sequence[str],
+        amount_step: Sequence[float],
+        min_amount: Sequence[float] | None = None,
+        min_notional: float = 0.0,
+    ):
+        self.symbols = list(symbols)
+        self.index: Dict[str, int] = {s: i for i, s in enumerate(self.symbols)}
+        self._steps = [Decimal(str(step)) for step in amount_step]
+        self._step = np.asarray(amount_step, dtype=np.float64)
+        self._min_amount = (
+            np.zeros(len(self.symbols))
+            if min_amount is None
+            else np.asarray(min_amount, dtype=np.float64)
+        )
+        self._min_notional = min_notional
+
+    def align(self, values: Dict[str, float | Decimal], default: float = 0.0) -> np.ndarray:
+        """
+        Array over the symbol index, symbols missing from `values` get `default`,
+        symbols outside the index are ignored.
+        """
+        array = np.full(len(self.symbols), default, dtype=np.float64)
+        index = self.index
+        for symbol, value in values.items():
+            i = index.get(symbol)
+            if i is not None:
+                array[i] = value
+        return array
+
+    def plan(
+        self,
+        target: np.ndarray,
+        current: np.ndarray,
+        price: np.ndarray,
+        active: np.ndarray | None = None,
+    ) -> RebalancePlan:
+        """
+        :param target: Target positions, signed
+        :param current: Current positions, signed
+        :param price: Reference price for the notional filter, NaN if unknown
+        :param active: Symbols that may trade, e.g. False while an order is working
+        """
+        # crossing zero closes the position first
+        cross = target * current < 0
+        step_target = np.where(cross, 0.0, target)
+        lots = np.rint((step_target - current) / self._step)
+        amount = np.abs(lots) * self._step
+        reduce_only = (current != 0) & (np.sign(lots) == -np.sign(current))
+
+        with np.errstate(invalid="ignore"):
+            mask = (
+                (lots != 0)
+                & (amount >= self._min_amount)
+                & (amount * price >= self._min_notional)
+            )
+        if active is not None:
+            mask &= active
+        return RebalancePlan(self.symbols, lots, reduce_only, mask, self._steps)
@@ -1,11 +1,94 @@
 from pathlib import Path
-from typing import Literal
+from typing import Any, Dict, Literal, Mapping
 import sys
 import traceback
 import asyncio
 import spdlog as spd
 
 
+LogLevel = Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
+
+
+def _disabled(msg: str, *args):
+    pass
+
+
+class Logger:
+    """
+    Facade of a `spdlog.Logger` whose level checks are resolved when the level is set.
+
+    Methods of disabled levels are a no-op, and messages take `%` style arguments that
+    are only formatted when the level is enabled:
+
+        log.debug("order %s filled %s", order.id, order.filled)
+
+    On hot paths guard the message with the cached flag, a disabled level then costs a
+    single attribute check whatever the message:
+
+        if log.debug_enabled:
+            log.debug(f"{bookl1}")
+    """
+
+    _METHODS = (
+        ("debug", spd.LogLevel.DEBUG),
+        ("info", spd.LogLevel.INFO),
+        ("warn", spd.LogLevel.WARN),
+        ("error", spd.LogLevel.ERR),
+        ("critical", spd.LogLevel.CRITICAL),
+    )
+
+    def __init__(self, logger: spd.Logger, level: LogLevel, flush: bool):
+        self.name = logger.name()
+        self._logger = logger
+        self.configure(level, flush)
+
+    def configure(self, level: LogLevel, flush: bool):
+        self.level = SpdLog.normalize_level(level)
+        self.flush_enabled = flush
+        spd_level = SpdLog.parse_level(self.level)
+        self._logger.set_level(spd_level)
+        # flushing on a level above the logger level disables per message flushing
+        self._logger.flush_on(spd_level if flush else spd.LogLevel.OFF)
+        binary_log = SpdLog.binary_log
+        for method, method_level in self._METHODS:
+            enabled = self._logger.should_log(method_level)
+            setattr(self, f"{method}_enabled", enabled)
+            if not enabled:
+                emit = _disabled
+            elif binary_log is not None:
+                label = "WARNING" if method == "warn" else method.upper()
+                emit = self._binary_emitter(binary_log, label, self.name)
+            else:
+                emit = self._emitter(getattr(self._logger, method))
+            setattr(self, method, emit)
+        self.warning = self.warn
+
+    @staticmethod
+    def _emitter(log):
+        def emit(msg: str, *args):
+            log(msg % args if args else msg)
+
+        return emit
+
+    @staticmethod
+    def _binary_emitter(binary_log, level: str, name: str):
+        write = binary_log.write
+
+        # formatting is left to the shipping thread
+        def emit(msg: str, *args):
+            write(level, name, msg, args)
+
+        return emit
+
+    def flush(self):
+        if SpdLog.binary_log is not None:
+            SpdLog.binary_log.flush()
+        self._logger.flush()
+
+    def __getattr__(self, name: str):
+        return getattr(self._logger, name)
+
+
 class SpdLog:
     """
     Log registration class responsible for creating and managing loggers.
@@ -20,9 +103,13 @@ class SpdLog:
 
     log_dir = Path(".log")
     log_dir_created = False
-    loggers = {}
+    loggers: Dict[str, Logger] = {}
     async_mode = True
     error_logger = None
+    # "*" holds the defaults, other keys are logger names
+    overrides: Dict[str, Dict[str, Any]] = {}
+    # a `tradebot.binlog.BinaryLog` replacing the text files when set
+    binary_log = None
 
     @classmethod
     def setup_error_handling(cls):
@@ -60,16 +147,17 @@ class SpdLog:
     def get_logger(
         cls,
         name: str,
-        level: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"] = "INFO",
+        level: LogLevel = "INFO",
         flush: bool = False,
-    ) -> spd.Logger:
+    ) -> Logger:
         """
         Get the logger with the specified name. If it doesn't exist, create a new logger.
+        A level or flush set for the logger with `configure` wins over the arguments.
 
         :param name: Logger name
         :param level: Log level
         :param flush: Whether to flush after each log entry
-        :return: spdlog.Logger instance
+        :return: Logger instance
         """
         if name not in cls.loggers:
             if not cls.log_dir_created:
@@ -82,30 +170,100 @@ class SpdLog:
                 minute=0,
                 async_mode=cls.async_mode,
             )
-            logger_instance.set_level(cls.parse_level(level))
-            if flush:
-                logger_instance.flush_on(cls.parse_level(level))
-            cls.loggers[name] = logger_instance
+            cls.loggers[name] = Logger(logger_instance, *cls._settings(name, level, flush))
         return cls.loggers[name]
 
     @classmethod
-    def parse_level(
-        cls, level: Literal["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
-    ) -> spd.LogLevel:
+    def _settings(cls, name: str, level: LogLevel, flush: bool):
+        settings = {"level": level, "flush": flush}
+        settings.update(cls.overrides.get("*", {}))
+        settings.update(cls.overrides.get(name, {}))
+        return settings["level"], settings["flush"]
+
+    @classmethod
+    def configure(cls, config: Mapping[str, Mapping[str, str]]):
+        """
+        Set log levels and flushing per logger, e.g. from the `ConfigParser` of
+        `.keys/config.cfg`. Section `log` sets the defaults, `log.<name>` the logger
+        `name`; loggers that already exist are reconfigured.
+
+            [log]
+            level = INFO
+            flush = false
+
+            [log.BybitPrivateConnector]
+            level = DEBUG
+            flush = true
+        """
+        for section in config.keys():
+            if section == "log":
+                name = "*"
+            elif section.startswith("log."):
+                name = section[4:]
+            else:
+                continue
+            settings = {}
+            if "level" in config[section]:
+                level = config[section]["level"]
+                try:
+                    settings["level"] = cls.normalize_level(level)
+                except ValueError as e:
+                    raise ValueError(f"[{section}] {e}") from None
+            if "flush" in config[section]:
+                settings["flush"] = str(config[section]["flush"]).lower() in (
+                    "1",
+                    "true",
+                    "yes",
+                    "on",
+                )
+            cls.overrides[name] = settings
+
+        for name, logger in cls.loggers.items():
+            logger.configure(*cls._settings(name, logger.level, logger.flush_enabled))
+
+    @classmethod
+    def enable_binary_log(cls, binary_log):
+        """
+        Send the records of all loggers to a `tradebot.binlog.BinaryLog` instead of the
+        text files, `None` switches back to text.
+        """
+        cls.binary_log = binary_log
+        for logger in cls.loggers.values():
+            logger.configure(logger.level, logger.flush_enabled)
+
+    _LEVELS = {
+        "DEBUG": spd.LogLevel.DEBUG,
+        "INFO": spd.LogLevel.INFO,
+        "WARNING": spd.LogLevel.WARN,
+        "ERROR": spd.LogLevel.ERR,
+        "CRITICAL": spd.LogLevel.CRITICAL,
+    }
+    _LEVEL_ALIASES = {"WARN": "WARNING", "ERR": "ERROR", "FATAL": "CRITICAL"}
+
+    @classmethod
+    def normalize_level(cls, level: str) -> LogLevel:
+        """
+        Map a level name in any case, or an alias such as `warn`, to a `LogLevel`.
+
+        :raises ValueError: if the level is unknown
+        """
+        name = str(level).strip().upper()
+        name = cls._LEVEL_ALIASES.get(name, name)
+        if name not in cls._LEVELS:
+            raise ValueError(
+                f"unknown log level {level!r}, expected one of {', '.join(cls._LEVELS)}"
+            )
+        return name
+
+    @classmethod
+    def parse_level(cls, level: LogLevel) -> spd.LogLevel:
         """
         Parse the log level string to spdlog.LogLevel.
 
-        :param level: Log level string
+        :param level: Log level string, see `normalize_level`
         :return: spdlog.LogLevel
         """
-        levels = {
-            "DEBUG": spd.LogLevel.DEBUG,
-            "INFO": spd.LogLevel.INFO,
-            "WARNING": spd.LogLevel.WARN,
-            "ERROR": spd.LogLevel.ERR,
-            "CRITICAL": spd.LogLevel.CRITICAL,
-        }
-        return levels[level]
+        return cls._LEVELS[cls.normalize_level(level)]
 
     @classmethod
     def close_all_loggers(cls):
@@ -114,19 +272,28 @@ class SpdLog:
         """
         for logger in cls.loggers.values():
             logger.flush()
-            logger.drop()
+            logger.close()
 
     @classmethod
-    def initialize(cls, log_dir: str = ".logs", async_mode: bool = True, setup_error_handlers: bool = True):
+    def initialize(
+        cls,
+        log_dir: str = ".logs",
+        async_mode: bool = True,
+        setup_error_handlers: bool = True,
+        config: Mapping[str, Mapping[str, str]] = None,
+    ):
         """
         Initialize the log registry.
 
         :param setup_error_handlers: Whether to set up global exception handlers
         :param log_dir: Log directory
         :param async_mode: Whether to enable asynchronous mode
+        :param config: Per logger levels and flushing, see `configure`
         """
         cls.log_dir = Path(log_dir)
         cls.async_mode = async_mode
+        if config is not None:
+            cls.configure(config)
         if setup_error_handlers:
             cls.setup_error_handling()
 
@@ -0,0 +1,224 @@
+import time
+import asyncio
+import heapq
+import itertools
+import msgspec
+
+from typing import Dict, List, Tuple, Mapping
+
+from tradebot.constants import RequestPriority
+
+
+class TokenBucket:
+    """
+    Token bucket holding `capacity` tokens, refilled continuously at `capacity / period`
+    tokens per second.
+
+    Waiters are served strictly by `RequestPriority` and then FIFO, so a queued cancel is
+    granted before any queued new order. `wait()` keeps the `asynciolimiter.Limiter`
+    interface, so a bucket can be passed anywhere a `Limiter` was used.
+    """
+
+    def __init__(self, capacity: float, period: float = 1, name: str = None):
+        """
+        :param capacity: Maximum number of tokens, i.e. the allowed burst
+        :param period: Seconds it takes to refill an empty bucket
+        :param name: Used in logs and reprs only
+        """
+        self._capacity = capacity
+        self._period = period
+        self._rate = capacity / period
+        self._tokens = float(capacity)
+        self._name = name
+        self._last = time.monotonic()
+        self._waiters: List[Tuple[int, int, float, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._wakeup_handle: asyncio.TimerHandle | None = None
+
+    def __repr__(self) -> str:
+        return (
+            f"TokenBucket(name={self._name}, capacity={self._capacity}, "
+            f"period={self._period}, tokens={self.available:.2f})"
+        )
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def capacity(self) -> float:
+        return self._capacity
+
+    @property
+    def period(self) -> float:
+        return self._period
+
+    @property
+    def rate(self) -> float:
+        return self._rate
+
+    @property
+    def available(self) -> float:
+        self._refill()
+        return self._tokens
+
+    @property
+    def waiting(self) -> int:
+        return len(self._waiters)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._last) * self._rate
+        )
+        self._last = now
+
+    def set_limit(self, capacity: float, period: float = None):
+        """Resize the bucket, e.g. when the exchange reports a different limit."""
+        self._refill()
+        period = period or self._period
+        self._tokens = max(min(self._tokens + capacity - self._capacity, capacity), 0.0)
+        self._capacity = capacity
+        self._period = period
+        self._rate = capacity / period
+        self._schedule()
+
+    def set_remaining(self, remaining: float):
+        """
+        Align with the server-side count. Only ever lowers the local tokens: the header
+        lags behind requests still in flight, so it can not be used to grant more.
+        """
+        self._refill()
+        self._tokens = min(self._tokens, max(remaining, 0.0))
+
+    def set_used(self, used: float):
+        self.set_remaining(self._capacity - used)
+
+    def try_acquire(self, weight: float = 1) -> bool:
+        self._refill()
+        if not self._waiters and self._tokens >= weight:
+            self._tokens -= weight
+            return True
+        return False
+
+    async def acquire(
+        self, weight: float = 1, priority: RequestPriority = RequestPriority.NEW
+    ):
+        if weight > self._capacity:
+            raise ValueError(
+                f"Weight {weight} exceeds capacity {self._capacity} of bucket {self._name}"
+            )
+        if self.try_acquire(weight):
+            return
+
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), weight, fut))
+        self._schedule()
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # granted in the same tick the waiter got cancelled, give tokens back
+                self._tokens = min(self._capacity, self._tokens + weight)
+            self._schedule()
+            raise
+
+    async def wait(self):
+        await self.acquire(1)
+
+    def _schedule(self):
+        if self._wakeup_handle is not None:
+            self._wakeup_handle.cancel()
+            self._wakeup_handle = None
+        self._release()
+        if not self._waiters:
+            return
+        _, _, weight, _ = self._waiters[0]
+        delay = (weight - self._tokens) / self._rate
+        self._wakeup_handle = asyncio.get_running_loop().call_later(
+            max(delay, 0), self._wakeup
+        )
+
+    def _wakeup(self):
+        self._wakeup_handle = None
+        self._schedule()
+
+    def _release(self):
+        self._refill()
+        while self._waiters:
+            _, _, weight, fut = self._waiters[0]
+            if fut.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self._tokens < weight:
+                break
+            heapq.heappop(self._waiters)
+            self._tokens -= weight
+            fut.set_result(None)
+
+
+class EndpointRule(msgspec.Struct, frozen=True):
+    """
+    Tokens an endpoint consumes from each bucket, and the default priority of its requests.
+    """
+
+    costs: Tuple[Tuple[str, float], ...] = ()
+    priority: RequestPriority = RequestPriority.NEW
+
+
+class RateLimiter:
+    """
+    A set of named `TokenBucket`s plus a table mapping `(method, endpoint)` to the
+    buckets a request consumes.
+
+    Exchange subclasses declare the real limits (per-IP weight, per-UID endpoint limits,
+    order-count windows) and override `update_from_headers` to follow the usage the
+    exchange reports back.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._rules: Dict[Tuple[str, str], EndpointRule] = {}
+        self._default_rule = EndpointRule()
+
+    @property
+    def buckets(self) -> Dict[str, TokenBucket]:
+        return self._buckets
+
+    def add_bucket(self, name: str, capacity: float, period: float = 1) -> TokenBucket:
+        bucket = TokenBucket(capacity, period, name=name)
+        self._buckets[name] = bucket
+        return bucket
+
+    def get_bucket(self, name: str) -> TokenBucket | None:
+        return self._buckets.get(name)
+
+    def set_default_rule(self, costs: Mapping[str, float]):
+        self._default_rule = EndpointRule(costs=tuple(costs.items()))
+
+    def add_rule(
+        self,
+        method: str,
+        endpoint: str,
+        costs: Mapping[str, float],
+        priority: RequestPriority = RequestPriority.NEW,
+    ):
+        self._rules[(method, endpoint)] = EndpointRule(
+            costs=tuple(costs.items()), priority=priority
+        )
+
+    def get_rule(self, method: str, endpoint: str) -> EndpointRule:
+        return self._rules.get((method, endpoint), self._default_rule)
+
+    async def acquire(
+        self, method: str, endpoint: str, priority: RequestPriority = None
+    ):
+        rule = self.get_rule(method, endpoint)
+        if priority is None:
+            priority = rule.priority
+        for name, weight in rule.costs:
+            if weight:
+                await self._buckets[name].acquire(weight, priority)
+
+    def update_from_headers(self, method: str, endpoint: str, headers: Mapping[str, str]):
+        pass
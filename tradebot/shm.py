@@ -0,0 +1,610 @@
+import asyncio
+import os
+import struct
+import time
+import zlib
+import orjson
+import multiprocessing as mp
+
+from abc import ABC, abstractmethod
+from collections import defaultdict
+from collections.abc import Mapping
+from multiprocessing import resource_tracker
+from multiprocessing.connection import Connection
+from multiprocessing.shared_memory import SharedMemory
+from typing import Callable, Dict, List, Tuple
+
+from tradebot.log import SpdLog
+from tradebot.constants import EventType
+from tradebot.types import BookL1, Trade, MarkPrice, MarketData
+
+
+class ByteRing:
+    """
+    Single producer, single consumer ring buffer of variable sized messages in shared
+    memory.
+
+    Layout: [head u64][tail u64][capacity u64] padded to 64 bytes, then the data. Each
+    message is a u32 length followed by the payload. The producer only writes `head`, the
+    consumer only writes `tail`, both are absolute byte counts. A message never wraps: if
+    it does not fit before the end, the rest of the buffer is skipped.
+    """
+
+    _POS = struct.Struct("<Q")
+    _LEN = struct.Struct("<I")
+    _DATA = 64
+    _WRAP = 0xFFFFFFFF
+
+    def __init__(self, capacity: int = 1 << 22, name: str = None):
+        if name is None:
+            self._shm = SharedMemory(create=True, size=self._DATA + capacity)
+            self._owner = True
+            self._POS.pack_into(self._shm.buf, 0, 0)
+            self._POS.pack_into(self._shm.buf, 8, 0)
+            self._POS.pack_into(self._shm.buf, 16, capacity)
+        else:
+            self._shm = SharedMemory(name=name)
+            self._owner = False
+            # only the creating process may unlink the segment
+            resource_tracker.unregister(self._shm._name, "shared_memory")
+        self._buf = self._shm.buf
+        # the segment may be larger than requested, rounded up to whole pages
+        self._capacity = self._POS.unpack_from(self._buf, 16)[0]
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    @property
+    def capacity(self) -> int:
+        return self._capacity
+
+    def __len__(self) -> int:
+        """Bytes in use, headers included."""
+        return self._POS.unpack_from(self._buf, 0)[0] - self._POS.unpack_from(self._buf, 8)[0]
+
+    def put(self, data: bytes) -> bool:
+        """
+        Append a message, returns False if the ring is full.
+        """
+        size = 4 + len(data)
+        head = self._POS.unpack_from(self._buf, 0)[0]
+        tail = self._POS.unpack_from(self._buf, 8)[0]
+        free = self._capacity - (head - tail)
+        offset = head % self._capacity
+        contiguous = self._capacity - offset
+        if contiguous < size:
+            if free < contiguous + size:
+                return False
+            if contiguous >= 4:
+                self._LEN.pack_into(self._buf, self._DATA + offset, self._WRAP)
+            head += contiguous
+            offset = 0
+        elif free < size:
+            return False
+        start = self._DATA + offset
+        self._LEN.pack_into(self._buf, start, len(data))
+        self._buf[start + 4 : start + size] = data
+        self._POS.pack_into(self._buf, 0, head + size)
+        return True
+
+    def get(self) -> bytes | None:
+        """
+        Pop the oldest message, None if the ring is empty.
+        """
+        head = self._POS.unpack_from(self._buf, 0)[0]
+        tail = self._POS.unpack_from(self._buf, 8)[0]
+        while tail != head:
+            offset = tail % self._capacity
+            contiguous = self._capacity - offset
+            if contiguous < 4:
+                tail += contiguous
+                continue
+            start = self._DATA + offset
+            size = self._LEN.unpack_from(self._buf, start)[0]
+            if size == self._WRAP:
+                tail += contiguous
+                continue
+            data = bytes(self._buf[start + 4 : start + 4 + size])
+            self._POS.pack_into(self._buf, 8, tail + 4 + size)
+            return data
+        self._POS.pack_into(self._buf, 8, tail)
+        return None
+
+    def drain(self) -> List[bytes]:
+        messages = []
+        while (data := self.get()) is not None:
+            messages.append(data)
+        return messages
+
+    def close(self):
+        self._buf = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+BOOKL1_RECORD = 1
+TRADE_RECORD = 2
+
+# kind, source, symbol index, timestamp, then bid, bid_size, ask, ask_size for a BookL1
+# or price, size, 0, 0 for a Trade
+RECORD = struct.Struct("<BBIq4d")
+
+
+class FrameDecoder(ABC):
+    """
+    Turns raw ws frames into fixed layout records inside a decode worker. Instances are
+    pickled into the worker, heavy state such as msgspec decoders belongs in `setup`,
+    which runs in the worker process.
+    """
+
+    def setup(self):
+        pass
+
+    @abstractmethod
+    def decode(self, raw: bytes) -> List[Tuple[int, int, int, float, float, float, float]]:
+        """
+        Return (kind, symbol index, timestamp, a, b, c, d) tuples, see `RECORD`.
+        """
+
+
+def _notify(conn: Connection):
+    try:
+        conn.send_bytes(b"\0")
+    except BlockingIOError:
+        # the pipe is full, the other side has a wakeup pending anyway
+        pass
+
+
+def _decode_worker(
+    decoders: List[FrameDecoder],
+    in_name: str,
+    in_conn: Connection,
+    out_name: str,
+    out_conn: Connection,
+):
+    in_ring = ByteRing(name=in_name)
+    out_ring = ByteRing(name=out_name)
+    log = SpdLog.get_logger(name="DecodeWorker", level="INFO", flush=True)
+    for decoder in decoders:
+        decoder.setup()
+    os.set_blocking(out_conn.fileno(), False)
+
+    while True:
+        try:
+            in_conn.recv_bytes()
+        except EOFError:
+            break
+        while in_conn.poll():
+            in_conn.recv_bytes()
+        produced = False
+        while (item := in_ring.get()) is not None:
+            source = item[0]
+            try:
+                records = decoders[source].decode(memoryview(item)[1:])
+            except Exception as e:
+                log.error(f"Error decoding frame: {e}")
+                continue
+            for kind, index, ts, a, b, c, d in records:
+                while not out_ring.put(RECORD.pack(kind, source, index, ts, a, b, c, d)):
+                    # the event loop is behind, wake it and wait for room
+                    _notify(out_conn)
+                    time.sleep(0.0001)
+                produced = True
+        if produced:
+            _notify(out_conn)
+
+    in_ring.close()
+    out_ring.close()
+
+
+class DecodePool:
+    """
+    Offloads JSON decoding of market data frames to worker processes.
+
+    Connectors register a `FrameDecoder` and a record handler, then hand raw frames to
+    `submit`. Frames travel through a shared memory `ByteRing` per worker, all frames of a
+    topic go to the same worker so stateful decoders (order books) stay consistent. The
+    workers write fixed layout records back through a second ring and the event loop only
+    unpacks records, waking up through a pipe instead of polling.
+
+        pool = DecodePool(workers=4)
+        public_conn = BybitPublicConnector(account_type, exchange, decode_pool=pool)
+        await pool.start()
+    """
+
+    def __init__(self, workers: int = 2, ring_size: int = 1 << 24):
+        self._log = SpdLog.get_logger(
+            name=type(self).__name__, level="INFO", flush=True
+        )
+        self._workers = workers
+        self._ring_size = ring_size
+        self._decoders: List[FrameDecoder] = []
+        self._handlers: List[Callable[[List[tuple]], None]] = []
+        self._in_rings: List[ByteRing] = []
+        self._out_rings: List[ByteRing] = []
+        self._in_conns: List[Connection] = []
+        self._out_conns: List[Connection] = []
+        self._processes: List[mp.Process] = []
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self.submitted = 0
+        self.dropped = 0
+
+    @property
+    def started(self) -> bool:
+        return bool(self._processes)
+
+    def register(
+        self, decoder: FrameDecoder, handler: Callable[[List[tuple]], None]
+    ) -> int:
+        """
+        Add a frame source, returns its id for `submit`. `handler` gets the decoded
+        records of the source as (kind, source, index, timestamp, a, b, c, d) tuples.
+        """
+        if self.started:
+            raise RuntimeError("Register decoders before starting the DecodePool")
+        if len(self._decoders) >= 255:
+            raise ValueError("Too many decoders")
+        self._decoders.append(decoder)
+        self._handlers.append(handler)
+        return len(self._decoders) - 1
+
+    async def start(self):
+        if self.started:
+            return
+        self._loop = asyncio.get_running_loop()
+        ctx = mp.get_context("spawn")
+        for i in range(self._workers):
+            in_ring = ByteRing(self._ring_size)
+            out_ring = ByteRing(self._ring_size)
+            in_recv, in_send = ctx.Pipe(duplex=False)
+            out_recv, out_send = ctx.Pipe(duplex=False)
+            process = ctx.Process(
+                target=_decode_worker,
+                args=(self._decoders, in_ring.name, in_recv, out_ring.name, out_send),
+                name=f"DecodeWorker-{i}",
+                daemon=True,
+            )
+            process.start()
+            in_recv.close()
+            out_send.close()
+            os.set_blocking(in_send.fileno(), False)
+            self._loop.add_reader(out_recv.fileno(), self._drain, i)
+            self._in_rings.append(in_ring)
+            self._out_rings.append(out_ring)
+            self._in_conns.append(in_send)
+            self._out_conns.append(out_recv)
+            self._processes.append(process)
+        self._log.info(f"Started {self._workers} decode workers")
+
+    def _route(self, raw: bytes) -> int:
+        start = raw.find(b'"topic":"')
+        if start < 0:
+            return 0
+        start += 9
+        return zlib.crc32(raw[start : raw.find(b'"', start)]) % self._workers
+
+    def submit(self, source: int, raw: bytes) -> bool:
+        """
+        Queue a raw frame for decoding, returns False if the worker is too far behind.
+        """
+        worker = self._route(raw)
+        self.submitted += 1
+        if not self._in_rings[worker].put(bytes((source,)) + raw):
+            self.dropped += 1
+            if self.dropped % 1000 == 1:
+                self._log.warn(f"Decode worker {worker} is lagging, dropped {self.dropped} frames")
+            return False
+        _notify(self._in_conns[worker])
+        return True
+
+    def _drain(self, worker: int):
+        conn = self._out_conns[worker]
+        try:
+            while conn.poll():
+                conn.recv_bytes()
+        except EOFError:
+            self._loop.remove_reader(conn.fileno())
+            self._log.error(f"Decode worker {worker} exited")
+            return
+        records: Dict[int, List[tuple]] = defaultdict(list)
+        for item in self._out_rings[worker].drain():
+            record = RECORD.unpack(item)
+            records[record[1]].append(record)
+        for source, batch in records.items():
+            try:
+                self._handlers[source](batch)
+            except Exception as e:
+                self._log.error(f"Error handling decoded records: {e}")
+
+    async def close(self):
+        for conn in self._out_conns:
+            self._loop.remove_reader(conn.fileno())
+        for conn in self._in_conns:
+            conn.close()
+        for process in self._processes:
+            await asyncio.to_thread(process.join, 1)
+            if process.is_alive():
+                process.terminate()
+        for ring in self._in_rings + self._out_rings:
+            ring.close()
+        for conn in self._out_conns:
+            conn.close()
+        self._processes.clear()
+
+
+class SharedMarketTable:
+    """
+    Latest BookL1, Trade and MarkPrice of every symbol of one exchange in shared memory.
+
+    One process writes, any number of processes read. Every symbol owns a 64 byte slot
+    per data type, each slot is a seqlock: the writer makes the sequence odd, writes the
+    values and makes it even again, a reader retries until it sees the same even sequence
+    before and after reading. A lookup is a few struct reads on the mapped memory, no
+    syscall and no lock.
+
+    The header keeps the exchange and the symbol list, so readers attach by name only.
+    """
+
+    _MAGIC = 0x54424D44  # TBMD
+    _HEADER = struct.Struct("<IIII")  # magic, symbol count, slot offset, meta length
+    _SEQ = struct.Struct("<Q")
+    _SLOT = 64
+    _BOOKL1 = struct.Struct("<q4d")  # timestamp, bid, bid_size, ask, ask_size
+    _TRADE = struct.Struct("<q2d")  # timestamp, price, size
+    _MARK_PRICE = struct.Struct("<qd")  # timestamp, price
+    _KINDS = 3
+    _SPINS = 100_000
+
+    def __init__(self, shm: SharedMemory, owner: bool):
+        self._shm = shm
+        self._owner = owner
+        self._buf = shm.buf
+        magic, count, offset, size = self._HEADER.unpack_from(self._buf, 0)
+        if magic != self._MAGIC:
+            raise ValueError(f"{shm.name} is not a SharedMarketTable")
+        meta = orjson.loads(bytes(self._buf[self._HEADER.size : self._HEADER.size + size]))
+        self.exchange: str = meta["exchange"]
+        self.symbols: List[str] = meta["symbols"]
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        self._offset = offset
+
+    @classmethod
+    def create(cls, exchange: str, symbols: List[str], name: str = None) -> "SharedMarketTable":
+        meta = orjson.dumps({"exchange": exchange, "symbols": list(symbols)})
+        offset = -(-(cls._HEADER.size + len(meta)) // cls._SLOT) * cls._SLOT
+        size = offset + len(symbols) * cls._KINDS * cls._SLOT
+        try:
+            shm = SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            # left over by a publisher that did not shut down cleanly
+            stale = SharedMemory(name=name)
+            stale.close()
+            stale.unlink()
+            shm = SharedMemory(name=name, create=True, size=size)
+        shm.buf[:size] = bytes(size)
+        shm.buf[cls._HEADER.size : cls._HEADER.size + len(meta)] = meta
+        cls._HEADER.pack_into(shm.buf, 0, cls._MAGIC, len(symbols), offset, len(meta))
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedMarketTable":
+        shm = SharedMemory(name=name)
+        resource_tracker.unregister(shm._name, "shared_memory")
+        return cls(shm, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def index(self, symbol: str) -> int:
+        return self._index[symbol]
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._index
+
+    def _slot(self, index: int, kind: int) -> int:
+        return self._offset + (index * self._KINDS + kind) * self._SLOT
+
+    def _write(self, offset: int, layout: struct.Struct, *values):
+        seq = self._SEQ.unpack_from(self._buf, offset)[0]
+        self._SEQ.pack_into(self._buf, offset, seq + 1)
+        layout.pack_into(self._buf, offset + 8, *values)
+        self._SEQ.pack_into(self._buf, offset, seq + 2)
+
+    def _read(self, offset: int, layout: struct.Struct) -> tuple | None:
+        buf = self._buf
+        for _ in range(self._SPINS):
+            seq = self._SEQ.unpack_from(buf, offset)[0]
+            if not seq:
+                return None
+            if seq & 1:
+                continue
+            values = layout.unpack_from(buf, offset + 8)
+            if self._SEQ.unpack_from(buf, offset)[0] == seq:
+                return values
+        raise RuntimeError(f"{self.name} slot {offset} is stuck in a write")
+
+    def write_bookl1(self, bookl1: BookL1):
+        self._write(
+            self._slot(self._index[bookl1.symbol], 0),
+            self._BOOKL1,
+            bookl1.timestamp,
+            bookl1.bid,
+            bookl1.bid_size,
+            bookl1.ask,
+            bookl1.ask_size,
+        )
+
+    def write_trade(self, trade: Trade):
+        self._write(
+            self._slot(self._index[trade.symbol], 1),
+            self._TRADE,
+            trade.timestamp,
+            trade.price,
+            trade.size,
+        )
+
+    def write_mark_price(self, mark_price: MarkPrice):
+        self._write(
+            self._slot(self._index[mark_price.symbol], 2),
+            self._MARK_PRICE,
+            mark_price.timestamp,
+            mark_price.price,
+        )
+
+    def read_bookl1(self, symbol: str) -> BookL1 | None:
+        values = self._read(self._slot(self._index[symbol], 0), self._BOOKL1)
+        if values is None:
+            return None
+        ts, bid, bid_size, ask, ask_size = values
+        return BookL1(
+            exchange=self.exchange,
+            symbol=symbol,
+            bid=bid,
+            ask=ask,
+            bid_size=bid_size,
+            ask_size=ask_size,
+            timestamp=ts,
+        )
+
+    def read_trade(self, symbol: str) -> Trade | None:
+        values = self._read(self._slot(self._index[symbol], 1), self._TRADE)
+        if values is None:
+            return None
+        ts, price, size = values
+        return Trade(
+            exchange=self.exchange, symbol=symbol, price=price, size=size, timestamp=ts
+        )
+
+    def read_mark_price(self, symbol: str) -> MarkPrice | None:
+        values = self._read(self._slot(self._index[symbol], 2), self._MARK_PRICE)
+        if values is None:
+            return None
+        ts, price = values
+        return MarkPrice(exchange=self.exchange, symbol=symbol, price=price, timestamp=ts)
+
+    def close(self):
+        self._buf = None
+        self._shm.close()
+        if self._owner:
+            self._shm.unlink()
+
+
+class MarketDataPublisher:
+    """
+    Market data daemon side: writes every BookL1, Trade and MarkPrice event of the
+    connectors in this process into the `SharedMarketTable` of its exchange.
+
+        table = SharedMarketTable.create("bybit", exchange.linear, name="bybit_linear")
+        MarketDataPublisher([table])
+        await public_conn.subscribe_bookl1(...)
+    """
+
+    def __init__(self, tables: List[SharedMarketTable]):
+        # imported here, decode workers import this module and must not pull in the engine
+        from tradebot.entity import EventSystem
+
+        self._tables = {table.exchange: table for table in tables}
+        EventSystem.on(EventType.BOOKL1, self._on_bookl1)
+        EventSystem.on(EventType.TRADE_BATCH, self._on_trades)
+        EventSystem.on(EventType.MARK_PRICE, self._on_mark_price)
+
+    def _table(self, exchange: str, symbol: str) -> SharedMarketTable | None:
+        table = self._tables.get(exchange)
+        if table and symbol in table:
+            return table
+        return None
+
+    def _on_bookl1(self, bookl1: BookL1):
+        if table := self._table(bookl1.exchange, bookl1.symbol):
+            table.write_bookl1(bookl1)
+
+    def _on_trades(self, trades: List[Trade]):
+        # only the latest trade of a symbol is kept
+        latest = {(trade.exchange, trade.symbol): trade for trade in trades}
+        for (exchange, symbol), trade in latest.items():
+            if table := self._table(exchange, symbol):
+                table.write_trade(trade)
+
+    def _on_mark_price(self, mark_price: MarkPrice):
+        if table := self._table(mark_price.exchange, mark_price.symbol):
+            table.write_mark_price(mark_price)
+
+    def close(self):
+        for table in self._tables.values():
+            table.close()
+
+
+class _TableView(Mapping):
+    def __init__(self, read: Callable[[str], object], table: SharedMarketTable):
+        self._read = read
+        self._table = table
+
+    def __getitem__(self, symbol: str):
+        if symbol not in self._table:
+            raise KeyError(symbol)
+        value = self._read(symbol)
+        if value is None:
+            raise KeyError(symbol)
+        return value
+
+    def __iter__(self):
+        return (symbol for symbol in self._table.symbols if symbol in self)
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __contains__(self, symbol: object) -> bool:
+        return symbol in self._table and self._read(symbol) is not None
+
+
+class SharedMarketData:
+    """
+    `MarketData` for strategy processes that read a market data daemon instead of running
+    connectors. `bookl1`, `trade` and `mark_price` read the shared tables on every lookup,
+    the other data types are kept locally as in `MarketData`.
+
+        market_data = SharedMarketData(["bybit_linear"])
+        strategy = MyStrategy(market_data=market_data)
+    """
+
+    def __init__(self, names: List[str]):
+        self._tables = [SharedMarketTable.attach(name) for name in names]
+        self._local = MarketData()
+        self.bookl1 = {t.exchange: _TableView(t.read_bookl1, t) for t in self._tables}
+        self.trade = {t.exchange: _TableView(t.read_trade, t) for t in self._tables}
+        self.mark_price = {
+            t.exchange: _TableView(t.read_mark_price, t) for t in self._tables
+        }
+        self.bookl2 = self._local.bookl2
+        self.kline = self._local.kline
+        self.funding_rate = self._local.funding_rate
+        self.index_price = self._local.index_price
+
+    def update_bookl1(self, bookl1: BookL1):
+        # the daemon owns these, nothing to do
+        pass
+
+    def update_trade(self, trade: Trade):
+        pass
+
+    def update_mark_price(self, mark_price: MarkPrice):
+        pass
+
+    def update_bookl2(self, bookl2):
+        self._local.update_bookl2(bookl2)
+
+    def update_kline(self, kline):
+        self._local.update_kline(kline)
+
+    def update_funding_rate(self, funding_rate):
+        self._local.update_funding_rate(funding_rate)
+
+    def update_index_price(self, index_price):
+        self._local.update_index_price(index_price)
+
+    def close(self):
+        for table in self._tables:
+            table.close()
@@ -0,0 +1,161 @@
+import asyncio
+import zmq
+import zmq.asyncio
+import msgspec
+
+from decimal import Decimal
+from typing import Awaitable, Callable, Dict, List, Set, Tuple
+
+from tradebot.log import SpdLog
+from tradebot.types import BaseMarket
+
+
+class PositionSignal(msgspec.Struct):
+    """
+    One element of a position signal, e.g. {"instrumentID": "BTCUSDT.BBP", "position": 12}.
+    `position` is in lots of the instrument's amount precision.
+    """
+
+    instrumentID: str
+    position: Decimal
+
+
+class InstrumentMap:
+    """
+    Resolves signal instrument ids to ccxt symbols and the factor turning a signal
+    position into an order amount. Every id is resolved once, unknown ids are remembered
+    as such.
+    """
+
+    def __init__(
+        self,
+        market: Dict[str, BaseMarket],
+        to_symbol: Callable[[str], str],
+        multiplier: Decimal = Decimal("1"),
+    ):
+        self._market = market
+        self._to_symbol = to_symbol
+        self._multiplier = Decimal(str(multiplier))
+        self._instruments: Dict[str, Tuple[str, Decimal] | None] = {}
+
+    def resolve(self, instrument_id: str) -> Tuple[str, Decimal] | None:
+        try:
+            return self._instruments[instrument_id]
+        except KeyError:
+            pass
+        symbol = self._to_symbol(instrument_id)
+        market = self._market.get(symbol)
+        if market is None:
+            resolved = None
+        else:
+            resolved = (
+                symbol,
+                Decimal(str(market.precision.amount)) * self._multiplier,
+            )
+        self._instruments[instrument_id] = resolved
+        return resolved
+
+    def positions(self, signals: List[PositionSignal]) -> Dict[str, Decimal]:
+        positions = {}
+        for signal in signals:
+            resolved = self.resolve(signal.instrumentID)
+            if resolved:
+                symbol, factor = resolved
+                positions[symbol] = signal.position * factor
+        return positions
+
+
+def bybit_linear_symbol(instrument_id: str) -> str:
+    """BTCUSDT.BBP -> BTC/USDT:USDT"""
+    return instrument_id.replace("USDT.BBP", "/USDT:USDT")
+
+
+class SignalReceiver:
+    """
+    Receives target position snapshots from a ZMQ SUB socket.
+
+    Payloads are decoded straight into `PositionSignal` and mapped through an
+    `InstrumentMap`. Symbols seen for the first time are subscribed concurrently before
+    their positions are handed on. Snapshots replace each other, so when the handler
+    falls behind every snapshot but the latest one is dropped (conflated).
+
+        receiver = SignalReceiver(
+            "ipc:///tmp/zmq_data",
+            InstrumentMap(exchange.market, bybit_linear_symbol, Decimal("0.6")),
+            handler=strategy.on_signal,
+            subscribe=lambda symbol: strategy.subscribe_bookl1(account_type, symbol),
+        )
+        await receiver.run()
+    """
+
+    def __init__(
+        self,
+        address: str,
+        instruments: InstrumentMap,
+        handler: Callable[[Dict[str, Decimal]], Awaitable | None],
+        subscribe: Callable[[str], Awaitable] | None = None,
+        topic: bytes = b"",
+    ):
+        self._log = SpdLog.get_logger(
+            name=type(self).__name__, level="INFO", flush=True
+        )
+        self._address = address
+        self._topic = topic
+        self._instruments = instruments
+        self._handler = handler
+        self._subscribe = subscribe
+        self._decoder = msgspec.json.Decoder(List[PositionSignal])
+        self._subscribed: Set[str] = set()
+        self._context: zmq.asyncio.Context | None = None
+        self._socket: zmq.asyncio.Socket | None = None
+        self.received = 0
+        self.conflated = 0
+        self.errors = 0
+
+    def connect(self):
+        self._context = zmq.asyncio.Context.instance()
+        self._socket = self._context.socket(zmq.SUB)
+        self._socket.connect(self._address)
+        self._socket.setsockopt(zmq.SUBSCRIBE, self._topic)
+
+    def decode(self, payload: bytes) -> Dict[str, Decimal]:
+        return self._instruments.positions(self._decoder.decode(payload))
+
+    async def _latest(self) -> bytes:
+        payload = await self._socket.recv()
+        while True:
+            try:
+                payload = await self._socket.recv(flags=zmq.NOBLOCK)
+            except zmq.Again:
+                return payload
+            self.conflated += 1
+
+    async def on_payload(self, payload: bytes):
+        self.received += 1
+        try:
+            positions = self.decode(payload)
+        except msgspec.DecodeError as e:
+            self.errors += 1
+            self._log.error(f"Invalid signal payload: {e}")
+            return
+
+        new = [symbol for symbol in positions if symbol not in self._subscribed]
+        if new:
+            if self._subscribe:
+                await asyncio.gather(*(self._subscribe(symbol) for symbol in new))
+            self._subscribed.update(new)
+            self._log.info(f"Subscribed {len(new)} new signal symbols")
+
+        res = self._handler(positions)
+        if asyncio.iscoroutine(res):
+            await res
+
+    async def run(self):
+        if self._socket is None:
+            self.connect()
+        try:
+            while True:
+                await self.on_payload(await self._latest())
+        finally:
+            self._socket.close(linger=0)
+            self._socket = None
@@ -0,0 +1,196 @@
+"""
+Order and position updates shared across processes over a Redis stream.
+
+The `OrderManagerSystem` of a strategy pushes every applied order update, and the
+position it moved, with XADD onto a capped stream. Monitoring or hedging processes
+follow it with a `CacheView`, an in-memory read-only copy of the strategy's
+`AsyncCache`, instead of polling the Redis keys that are only synced periodically.
+
+    connector = BybitPrivateConnector(..., stream_maxlen=100_000)
+
+    view = CacheView(BybitAccountType.LINEAR, strategy_id="strategy", user_id="user")
+    await view.start()
+    await view.get_position("BTC/USDT:USDT")
+"""
+
+import asyncio
+import time
+
+from typing import Any, Callable, Dict, Iterable, List, Set, Tuple
+
+from tradebot import codec
+from tradebot.constants import OrderStatus
+from tradebot.entity import AsyncCache, RedisClient
+from tradebot.log import SpdLog
+from tradebot.types import Order, Position
+
+_ORDER = b"o"
+_POSITION = b"p"
+
+
+def stream_key(account_type, strategy_id: str, user_id: str) -> str:
+    return f"strategy:{strategy_id}:user_id:{user_id}:account_type:{account_type}:stream"
+
+
+class StreamPublisher:
+    """
+    Buffers the updates and writes them in one pipelined round trip per batch, so
+    publishing never waits on Redis. The stream is trimmed to about `maxlen` entries.
+    """
+
+    def __init__(self, key: str, maxlen: int = 100_000):
+        self._log = SpdLog.get_logger(name=type(self).__name__)
+        self._r = RedisClient.get_async_client()
+        self._key = key
+        self._maxlen = maxlen
+        self._pending: List[Tuple[bytes, bytes]] = []
+        self._wakeup = asyncio.Event()
+        self.published = 0
+        self.dropped = 0
+
+    @classmethod
+    def for_cache(cls, cache: AsyncCache, maxlen: int = 100_000) -> "StreamPublisher":
+        return cls(stream_key(cache.account_type, cache.strategy_id, cache.user_id), maxlen)
+
+    def publish(self, obj: Order | Position):
+        self._pending.append((_ORDER if isinstance(obj, Order) else _POSITION, codec.encode(obj)))
+        self._wakeup.set()
+
+    async def flush(self):
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        try:
+            async with self._r.pipeline(transaction=False) as pipe:
+                for kind, data in batch:
+                    pipe.xadd(
+                        self._key,
+                        {"t": kind, "d": data},
+                        maxlen=self._maxlen,
+                        approximate=True,
+                    )
+                await pipe.execute()
+            self.published += len(batch)
+        except Exception as e:
+            self.dropped += len(batch)
+            self._log.error(f"Error publishing {len(batch)} updates: {e}")
+
+    async def run(self):
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            await self.flush()
+
+    async def close(self):
+        await self.flush()
+        await self._r.aclose()
+
+
+class CacheView:
+    """
+    Read-only copy of the `AsyncCache` of another process. `start` loads the synced
+    state from Redis and then follows the stream. The synced state can be up to
+    `sync_interval` seconds old, so the stream is replayed from that long before its
+    last entry and no update is missed in between. Replays are harmless, order updates
+    merge idempotently and positions are full snapshots.
+
+    `handler` is called with every `Order` and `Position` received.
+    """
+
+    def __init__(
+        self,
+        account_type,
+        strategy_id: str,
+        user_id: str,
+        handler: Callable[[Order | Position], Any] = None,
+        block_ms: int = 1000,
+        batch_size: int = 500,
+        sync_interval: int = 60,
+    ):
+        """
+        :param sync_interval: The `sync_interval` of the publishing strategy's cache
+        """
+        self._log = SpdLog.get_logger(name=type(self).__name__)
+        self._cache = AsyncCache(account_type, strategy_id, user_id)
+        self._r = self._cache._r
+        self._key = stream_key(account_type, strategy_id, user_id)
+        self._handler = handler
+        self._block_ms = block_ms
+        self._batch_size = batch_size
+        self._sync_interval = sync_interval
+        self._last_id = b"0-0"
+        self._task: asyncio.Task = None
+        self.received = 0
+
+    async def start(self, warm_up: bool = True):
+        if warm_up:
+            last = await self._r.xrevrange(self._key, count=1)
+            if last:
+                # entry ids start with the ms time of the Redis server
+                last_ms = int(last[0][0].split(b"-")[0])
+                since_ms = min(last_ms, int(time.time() * 1000)) - self._sync_interval * 1000
+                self._last_id = f"{max(since_ms, 0)}-0".encode()
+            await self._cache.warm_up(self._batch_size)
+        self._task = asyncio.create_task(self.run())
+
+    async def poll(self, block_ms: int = None) -> int:
+        """Apply the next batch of stream entries, return how many there were."""
+        response = await self._r.xread(
+            {self._key: self._last_id},
+            count=self._batch_size,
+            block=self._block_ms if block_ms is None else block_ms,
+        )
+        applied = 0
+        for _, entries in response or ():
+            for entry_id, fields in entries:
+                self._last_id = entry_id
+                self._apply(fields[b"t"], fields[b"d"])
+                applied += 1
+        self.received += applied
+        return applied
+
+    def _apply(self, kind: bytes, data: bytes):
+        if kind == _ORDER:
+            obj = codec.decode(data, Order)
+            if obj.status == OrderStatus.PENDING:
+                self._cache.order_initialized(obj)
+            else:
+                self._cache.order_status_update(obj)
+        else:
+            obj = codec.decode(data, Position)
+            self._cache.position_updated(obj)
+        if self._handler:
+            self._handler(obj)
+
+    async def run(self):
+        while True:
+            try:
+                await self.poll()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._log.error(f"Error reading {self._key}: {e}")
+                await asyncio.sleep(1)
+
+    async def get_order(self, order_id: str) -> Order:
+        return self._cache.get_mem_order(order_id)
+
+    def get_order_by_client_id(self, client_order_id: str) -> Order:
+        return self._cache.get_order_by_client_id(client_order_id)
+
+    async def get_open_orders(self, symbol: str = None) -> Set[str]:
+        return set(await self._cache.get_open_orders(symbol))
+
+    async def get_symbol_orders(self, symbol: str) -> Set[str]:
+        return set(await self._cache.get_symbol_orders(symbol))
+
+    async def get_position(self, symbol: str) -> Position:
+        return self._cache.get_mem_position(symbol)
+
+    async def get_positions(self, symbols: Iterable[str] = ()) -> Dict[str, Position]:
+        return await self._cache.get_positions()
+
+    async def close(self):
+        if self._task:
+            self._task.cancel()
+        await self._r.aclose()
@@ -0,0 +1,337 @@
+import asyncio
+import math
+import time
+
+from typing import Callable, List, Set
+
+from tradebot.log import SpdLog
+
+
+class Timer:
+    """
+    A one-shot or periodic timer scheduled on a `TimerWheel`.
+
+    Besides the schedule it keeps per timer statistics, all in seconds:
+    - drift: how late the callback was dispatched after its deadline
+    - duration: how long the callback ran
+    - overruns: periodic runs skipped because the previous run was still in flight
+      or the wheel fell behind by more than one interval
+    """
+
+    __slots__ = (
+        "name",
+        "callback",
+        "deadline",
+        "interval",
+        "cancelled",
+        "runs",
+        "overruns",
+        "drift",
+        "max_drift",
+        "duration",
+        "max_duration",
+        "_expire",
+        "_scheduled",
+        "_running",
+        "_total_drift",
+    )
+
+    def __init__(
+        self,
+        callback: Callable[[float], None],
+        deadline: float,
+        interval: float | None = None,
+        name: str | None = None,
+    ):
+        self.name = name or getattr(callback, "__qualname__", repr(callback))
+        self.callback = callback
+        self.deadline = deadline
+        self.interval = interval
+        self.cancelled = False
+        self.runs = 0
+        self.overruns = 0
+        self.drift = 0.0
+        self.max_drift = 0.0
+        self.duration = 0.0
+        self.max_duration = 0.0
+        self._expire = 0
+        self._scheduled = False
+        self._running = False
+        self._total_drift = 0.0
+
+    def __repr__(self) -> str:
+        return f"Timer({self.name}, deadline={self.deadline}, interval={self.interval})"
+
+    @property
+    def periodic(self) -> bool:
+        return self.interval is not None
+
+    @property
+    def mean_drift(self) -> float:
+        return self._total_drift / self.runs if self.runs else 0.0
+
+    def cancel(self):
+        self.cancelled = True
+
+    def _record_drift(self, drift: float):
+        self.runs += 1
+        self.drift = drift
+        self._total_drift += drift
+        if drift > self.max_drift:
+            self.max_drift = drift
+
+    def _record_duration(self, duration: float):
+        self.duration = duration
+        if duration > self.max_duration:
+            self.max_duration = duration
+
+
+class TimerWheel:
+    """
+    Hierarchical timing wheel, scheduling and cancelling are O(1) whatever the number
+    of timers.
+
+    Level 0 has `wheel_size` slots of `resolution` seconds, every next level has
+    `wheel_size` slots each covering a full turn of the level below. When a level
+    wraps, the timers of the next level's current slot cascade down, so a timer is
+    touched at most once per level. Timers beyond the last level wait in an overflow
+    list that is re-checked when the last level turns.
+
+    Callbacks receive the dispatch timestamp. Coroutine callbacks run as their own
+    task, so a slow callback never delays the others; a periodic coroutine that is
+    still running when it is due again is skipped and counted as an overrun.
+    """
+
+    def __init__(
+        self,
+        resolution: float = 0.01,
+        wheel_size: int = 64,
+        levels: int = 4,
+    ):
+        if wheel_size & (wheel_size - 1):
+            raise ValueError("wheel_size must be a power of two")
+        self._log = SpdLog.get_logger(
+            name=type(self).__name__, level="INFO", flush=True
+        )
+        self._resolution = resolution
+        self._bits = wheel_size.bit_length() - 1
+        self._mask = wheel_size - 1
+        self._wheels: List[List[List[Timer]]] = [
+            [[] for _ in range(wheel_size)] for _ in range(levels)
+        ]
+        self._overflow: List[Timer] = []
+        self._due: List[Timer] = []
+        self._tick = int(time.time() / resolution)
+        self._count = 0
+
+        self._tasks: Set[asyncio.Task] = set()
+        self._waiter: asyncio.Future | None = None
+        self._wake_tick: int | None = None
+        self._running = False
+
+    @property
+    def resolution(self) -> float:
+        return self._resolution
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def timers(self) -> List[Timer]:
+        timers = [t for t in self._due if not t.cancelled]
+        timers.extend(t for t in self._overflow if not t.cancelled)
+        for wheel in self._wheels:
+            for slot in wheel:
+                timers.extend(t for t in slot if not t.cancelled)
+        return timers
+
+    def call_at(
+        self, deadline: float, callback: Callable[[float], None], name: str = None
+    ) -> Timer:
+        """
+        Run `callback` once at the unix timestamp `deadline`.
+        """
+        return self._schedule(Timer(callback, deadline, name=name))
+
+    def call_later(
+        self, delay: float, callback: Callable[[float], None], name: str = None
+    ) -> Timer:
+        """
+        Run `callback` once in `delay` seconds.
+        """
+        return self.call_at(time.time() + delay, callback, name)
+
+    def call_every(
+        self,
+        interval: float,
+        callback: Callable[[float], None],
+        name: str = None,
+        align: bool = False,
+        start: float = None,
+    ) -> Timer:
+        """
+        Run `callback` every `interval` seconds.
+
+        :param align: Fire on multiples of `interval`, e.g. on the full second
+        :param start: Timestamp of the first run, by default one interval from now
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        if start is None:
+            now = time.time()
+            start = (now // interval + 1) * interval if align else now + interval
+        return self._schedule(Timer(callback, start, interval, name))
+
+    def _schedule(self, timer: Timer) -> Timer:
+        timer._expire = math.ceil(timer.deadline / self._resolution)
+        self._count += 1
+        self._insert(timer)
+        if self._waiter and self._wake_tick is not None and timer._expire < self._wake_tick:
+            self._wake()
+        return timer
+
+    def _insert(self, timer: Timer):
+        timer._scheduled = True
+        delta = timer._expire - self._tick
+        if delta <= 0:
+            self._due.append(timer)
+            return
+        for level, wheel in enumerate(self._wheels):
+            if delta < 1 << (self._bits * (level + 1)):
+                wheel[(timer._expire >> (self._bits * level)) & self._mask].append(timer)
+                return
+        self._overflow.append(timer)
+
+    def _cascade(self, level: int) -> int:
+        index = (self._tick >> (self._bits * level)) & self._mask
+        timers = self._wheels[level][index]
+        self._wheels[level][index] = []
+        for timer in timers:
+            if timer.cancelled:
+                self._discard(timer)
+            else:
+                self._insert(timer)
+        return index
+
+    def _discard(self, timer: Timer):
+        timer._scheduled = False
+        self._count -= 1
+
+    def advance(self, now: float = None) -> int:
+        """
+        Move the wheel to `now` and dispatch every expired timer, returns how many fired.
+        """
+        now = time.time() if now is None else now
+        target = int(now / self._resolution)
+        expired = self._due
+        self._due = []
+
+        if not self._count:
+            self._tick = max(self._tick, target)
+        while self._tick < target:
+            self._tick += 1
+            if not self._tick & self._mask:
+                level = 1
+                while level < len(self._wheels) and not self._cascade(level):
+                    level += 1
+                if level == len(self._wheels):
+                    overflow, self._overflow = self._overflow, []
+                    for timer in overflow:
+                        self._insert(timer)
+            slot = self._wheels[0][self._tick & self._mask]
+            if slot:
+                expired.extend(slot)
+                slot.clear()
+            if self._due:
+                expired.extend(self._due)
+                self._due = []
+
+        fired = 0
+        for timer in expired:
+            self._discard(timer)
+            if not timer.cancelled:
+                self._fire(timer, now)
+                fired += 1
+        return fired
+
+    def _fire(self, timer: Timer, now: float):
+        timer._record_drift(max(now - timer.deadline, 0.0))
+        if timer.interval:
+            deadline = timer.deadline + timer.interval
+            if deadline <= now:
+                missed = int((now - deadline) // timer.interval) + 1
+                timer.overruns += missed
+                deadline += missed * timer.interval
+            timer.deadline = deadline
+            self._schedule(timer)
+
+        if timer._running:
+            timer.overruns += 1
+            return
+
+        if asyncio.iscoroutinefunction(timer.callback):
+            timer._running = True
+            task = asyncio.create_task(self._run_async(timer, now))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        else:
+            start = time.perf_counter()
+            try:
+                timer.callback(now)
+            except Exception as e:
+                self._log.error(f"Error in timer {timer.name}: {e}")
+            timer._record_duration(time.perf_counter() - start)
+
+    async def _run_async(self, timer: Timer, now: float):
+        start = time.perf_counter()
+        try:
+            await timer.callback(now)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self._log.error(f"Error in timer {timer.name}: {e}")
+        finally:
+            timer._running = False
+            timer._record_duration(time.perf_counter() - start)
+
+    def _next_expire(self) -> int:
+        if self._due:
+            return self._tick
+        tick = self._tick + 1
+        wheel = self._wheels[0]
+        while tick & self._mask:
+            if any(not t.cancelled for t in wheel[tick & self._mask]):
+                return tick
+            tick += 1
+        # nothing left on level 0 before the next cascade
+        return tick
+
+    def _wake(self):
+        if self._waiter and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def run(self):
+        if self._running:
+            raise RuntimeError("TimerWheel is already running.")
+        self._running = True
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                self.advance()
+                self._wake_tick = self._next_expire()
+                delay = self._wake_tick * self._resolution - time.time()
+                if delay <= 0:
+                    await asyncio.sleep(0)
+                    continue
+                self._waiter = loop.create_future()
+                handle = loop.call_later(delay, self._wake)
+                try:
+                    await self._waiter
+                finally:
+                    handle.cancel()
+                    self._waiter = None
+                    self._wake_tick = None
+        finally:
+            self._running = False
+            for task in list(self._tasks):
+                task.cancel()
@@ -437,3 +437,20 @@ class Position(Struct):
             self.signed_amount = tmp_amount
             
         self.unrealized_pnl = self._calculate_pnl(price, self.amount)
+
+
+class PositionDrift(Struct):
+    """
+    A cached position that disagrees with the exchange, see
+    `PrivateConnector.reconcile_positions`. Amounts are signed.
+    """
+
+    exchange: str
+    symbol: str
+    cached: Decimal
+    actual: Decimal
+    timestamp: int
+
+    @property
+    def drift(self) -> Decimal:
+        return self.actual - self.cached